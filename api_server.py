@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Content Fact-Checker HTTP API — submit jobs, poll them, or stream verdicts over SSE.
+
+Endpoints:
+  POST /v1/jobs               {"text": ...} or {"url": ...}, plus optional
+                              max_claims, batch_judge, batch_search, tiered,
+                              priority -> 202 + job
+  POST /v1/jobs/bulk          {"items": [{"id": ..., "text"|"url": ...}, ...]}, plus optional
+                              priority -> 202 + jobs
+  GET  /v1/jobs/<id>          status and verdicts so far (?since=N skips the first N)
+  GET  /v1/jobs/<id>/events   server-sent events: one "claim" event per verdict, then "done"
+  GET  /healthz               job queue, scheduler and circuit breaker state
+  GET  /metrics               Prometheus metrics
+
+Jobs run on the shared job queue (see fact_checker/jobs.py). When it is full,
+submissions get 503 with a Retry-After estimate; so do new connections once
+API_MAX_CONNECTIONS are open.
+
+A job's API requests are scheduled (see fact_checker/scheduler.py) with its
+"priority": "interactive" by default for single jobs, "batch" for bulk ones.
+The tenant that requests are shared fairly between is the X-Tenant header,
+or the client's address without it.
+"""
+
+import argparse
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Add src to path so the fact_checker package is importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from fact_checker.config import (
+    API_AUTH_TOKEN,
+    API_BULK_MAX_ITEMS,
+    API_MAX_CONNECTIONS,
+    JOB_MAX_QUEUED,
+    JOB_WORKERS,
+)
+from fact_checker.clients import get_cerebras_pool, get_parallel_pool
+from fact_checker.jobs import JobManager, QueueFullError, update_to_dict
+from fact_checker.metrics import metrics
+from fact_checker.resilience import get_circuit_breaker
+from fact_checker.scheduler import PRIORITY_CLASSES
+
+MAX_BODY_BYTES = 5_000_000
+# Seconds between SSE keep-alive comments while a job has nothing new
+KEEPALIVE_SECONDS = 15
+
+_JOB_PATH_RE = re.compile(r"^/v1/jobs/([0-9a-f]{32})(/events)?$")
+
+
+class RequestError(Exception):
+    """A client error, sent back as JSON with the given HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_job_request(data: dict) -> tuple[str, str, dict]:
+    """Validate one job payload; returns (kind, value, options) for JobManager.submit_many."""
+    if not isinstance(data, dict):
+        raise RequestError(400, "Each job must be a JSON object")
+    text, url = data.get("text"), data.get("url")
+    if bool(text) == bool(url):
+        raise RequestError(400, 'Give exactly one of "text" or "url"')
+    value = text or url
+    if not isinstance(value, str) or not value.strip():
+        raise RequestError(400, '"text" and "url" must be non-empty strings')
+    if url and not url.startswith(("http://", "https://")):
+        raise RequestError(400, '"url" must start with http:// or https://')
+
+    options = {}
+    if "max_claims" in data:
+        max_claims = data["max_claims"]
+        if not isinstance(max_claims, int) or isinstance(max_claims, bool) or not 1 <= max_claims <= 50:
+            raise RequestError(400, '"max_claims" must be an integer from 1 to 50')
+        options["max_claims"] = max_claims
+    for flag in ("batch_judge", "batch_search", "tiered"):
+        if flag in data:
+            if not isinstance(data[flag], bool):
+                raise RequestError(400, f'"{flag}" must be true or false')
+            options[flag] = data[flag]
+    if url:
+        return "url", url.strip(), options
+    return "text", text, options
+
+
+def parse_priority(data, default: str) -> str:
+    priority = data.get("priority", default) if isinstance(data, dict) else default
+    if priority not in PRIORITY_CLASSES:
+        raise RequestError(400, f'"priority" must be one of {", ".join(PRIORITY_CLASSES)}')
+    return priority
+
+
+class FactCheckServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, jobs: JobManager, max_connections: int, auth_token: str | None):
+        super().__init__(address, FactCheckHandler)
+        self.jobs = jobs
+        self.auth_token = auth_token
+        self.connections = threading.BoundedSemaphore(max(1, max_connections))
+
+
+class FactCheckHandler(BaseHTTPRequestHandler):
+    server: FactCheckServer
+    server_version = "FactChecker/1.0"
+    protocol_version = "HTTP/1.1"
+
+    # --- plumbing ---
+
+    def log_message(self, format, *args):
+        # One line per request on stderr, like the default, but without reverse DNS
+        sys.stderr.write(f"{self.client_address[0]} - {format % args}\n")
+
+    def _route(self) -> str:
+        path = urlparse(self.path).path
+        match = _JOB_PATH_RE.match(path)
+        if match:
+            return "/v1/jobs/{id}/events" if match.group(2) else "/v1/jobs/{id}"
+        return path
+
+    def send_json(self, status: int, payload, headers: dict | None = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        metrics.incr("fact_checker_api_requests_total", route=self._route(), status=str(status))
+
+    def send_busy(self, message: str) -> None:
+        retry_after = max(1, round(self.server.jobs.estimated_wait()))
+        self.send_json(503, {"error": message, "retry_after": retry_after}, {"Retry-After": str(retry_after)})
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, f"Request body is over {MAX_BODY_BYTES} bytes")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            raise RequestError(400, "Request body must be JSON")
+
+    def tenant(self) -> str:
+        return self.headers.get("X-Tenant") or self.client_address[0]
+
+    def authorized(self) -> bool:
+        # Constant-time, so response timing doesn't leak how much of the token matched
+        given = self.headers.get("Authorization", "").encode()
+        return hmac.compare_digest(given, f"Bearer {self.server.auth_token}".encode())
+
+    def _handle(self, routes: dict) -> None:
+        if not self.server.connections.acquire(blocking=False):
+            self.close_connection = True
+            self.send_busy("Too many open connections")
+            return
+        try:
+            if self.server.auth_token and not self.authorized():
+                raise RequestError(401, "Missing or wrong bearer token")
+            url = urlparse(self.path)
+            match = _JOB_PATH_RE.match(url.path)
+            if match:
+                handler = routes.get("events" if match.group(2) else "job")
+                args = (match.group(1), parse_qs(url.query))
+            else:
+                handler = routes.get(url.path)
+                args = ()
+            if handler is None:
+                raise RequestError(404, f"No route for {self.command} {url.path}")
+            handler(self, *args)
+        except RequestError as e:
+            # The request body may not have been read, so don't reuse the connection
+            self.close_connection = True
+            self.send_json(e.status, {"error": str(e)})
+        except QueueFullError as e:
+            self.send_busy(str(e))
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            self.server.connections.release()
+
+    def do_GET(self):
+        self._handle(_GET_ROUTES)
+
+    def do_POST(self):
+        self._handle(_POST_ROUTES)
+
+    # --- endpoints ---
+
+    def submit_job(self):
+        data = self.read_json()
+        kind, value, options = parse_job_request(data)
+        priority = parse_priority(data, "interactive")
+        job = self.server.jobs.submit(kind, value, priority=priority, tenant=self.tenant(), **options)
+        self.send_json(202, job.to_dict(), {"Location": f"/v1/jobs/{job.id}"})
+
+    def submit_bulk(self):
+        data = self.read_json()
+        items = data.get("items") if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise RequestError(400, 'Body must be {"items": [...]} with at least one item')
+        if len(items) > API_BULK_MAX_ITEMS:
+            raise RequestError(413, f"At most {API_BULK_MAX_ITEMS} items per bulk request")
+        requests = []
+        for n, item in enumerate(items):
+            try:
+                requests.append(parse_job_request(item))
+            except RequestError as e:
+                raise RequestError(e.status, f"Item {n}: {e}")
+        priority = parse_priority(data, "batch")
+        jobs = self.server.jobs.submit_many(requests, priority=priority, tenant=self.tenant())
+        self.send_json(202, {
+            "jobs": [
+                {"item_id": item.get("id", n), "job_id": job.id, "status": job.status}
+                for n, (item, job) in enumerate(zip(items, jobs))
+            ],
+        })
+
+    def _job(self, job_id: str):
+        job = self.server.jobs.get(job_id)
+        if job is None:
+            raise RequestError(404, "Unknown or expired job")
+        return job
+
+    def get_job(self, job_id: str, query: dict):
+        try:
+            since = int(query.get("since", ["0"])[0])
+        except ValueError:
+            raise RequestError(400, '"since" must be an integer')
+        self.send_json(200, self._job(job_id).to_dict(since=max(0, since)))
+
+    def stream_events(self, job_id: str, query: dict):
+        job = self._job(job_id)
+        try:
+            position = int(self.headers.get("Last-Event-ID") or query.get("since", ["0"])[0])
+        except ValueError:
+            raise RequestError(400, "Last-Event-ID / since must be an integer")
+
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        metrics.incr("fact_checker_api_requests_total", route=self._route(), status="200")
+
+        while True:
+            if not job.wait(position, timeout=KEEPALIVE_SECONDS):
+                self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+                continue
+            new = job.updates_since(position)
+            for update in new:
+                position += 1
+                data = json.dumps(update_to_dict(update), ensure_ascii=False)
+                self.wfile.write(f"id: {position}\nevent: claim\ndata: {data}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if job.finished and not new:
+                summary = job.to_dict(since=position)
+                del summary["updates"]
+                self.wfile.write(f"event: done\ndata: {json.dumps(summary)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                return
+
+    def health(self):
+        breakers = {name: get_circuit_breaker(name).state for name in ("cerebras", "parallel")}
+        stats = self.server.jobs.stats()
+        # Requests waiting for their turn, per backend and priority class
+        scheduler = {}
+        for get_pool in (get_cerebras_pool, get_parallel_pool):
+            try:
+                pool = get_pool()
+            except RuntimeError:  # no keys configured
+                continue
+            scheduler[pool.backend] = pool.scheduler.stats()
+        status = "ok" if "open" not in breakers.values() else "degraded"
+        self.send_json(200, {"status": status, "jobs": stats, "scheduler": scheduler, "circuits": breakers})
+
+    def prometheus(self):
+        body = metrics.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_GET_ROUTES = {
+    "job": FactCheckHandler.get_job,
+    "events": FactCheckHandler.stream_events,
+    "/healthz": FactCheckHandler.health,
+    "/metrics": FactCheckHandler.prometheus,
+}
+_POST_ROUTES = {
+    "/v1/jobs": FactCheckHandler.submit_job,
+    "/v1/jobs/bulk": FactCheckHandler.submit_bulk,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Content Fact-Checker HTTP API server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python api_server.py --port 8000
+  curl -X POST localhost:8000/v1/jobs -d '{"text": "Albert Einstein was born in Germany in 1879."}'
+  curl -N localhost:8000/v1/jobs/<id>/events
+        """,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--job-workers", type=int, default=JOB_WORKERS,
+        help=f"Documents checked at the same time (default: {JOB_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-queued", type=int, default=JOB_MAX_QUEUED,
+        help=f"Jobs allowed to wait before submissions get 503 (default: {JOB_MAX_QUEUED})",
+    )
+    parser.add_argument(
+        "--max-connections", type=int, default=API_MAX_CONNECTIONS,
+        help=f"Open connections, SSE streams included (default: {API_MAX_CONNECTIONS})",
+    )
+    args = parser.parse_args()
+
+    jobs = JobManager(workers=args.job_workers, max_queued=args.max_queued)
+    server = FactCheckServer((args.host, args.port), jobs, args.max_connections, API_AUTH_TOKEN)
+    print(f"Fact-checker API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""Local stand-ins for the Cerebras and Parallel clients, plus a canned HTML site.
+
+The fakes implement just the parts of the SDK surface the pipeline uses
+(`chat.completions.create` and `beta.search`) and simulate latency, errors
+and response sizes so benchmarks run offline and reproducibly.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+
+class FakeAPIError(Exception):
+    """Raised by the fakes to simulate a failed API call (an HTTP 503)."""
+
+    status_code = 503
+
+
+class FakeTimeoutError(TimeoutError):
+    """Raised when a fake call's simulated latency exceeds the request timeout."""
+
+
+@dataclass
+class LatencyModel:
+    """Latency distribution in seconds: "fixed", "uniform" (mean ± jitter) or "lognormal"."""
+
+    mean: float = 0.2
+    jitter: float = 0.1
+    distribution: str = "lognormal"
+
+    def sample(self, rng: random.Random) -> float:
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "fixed":
+            return self.mean
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.jitter, self.mean + self.jitter))
+        # Lognormal with the requested mean; jitter/mean is the spread parameter
+        sigma = max(self.jitter / self.mean, 1e-6)
+        mu = math.log(self.mean) - sigma ** 2 / 2
+        return rng.lognormvariate(mu, sigma)
+
+
+class Recorder:
+    """Thread-safe collection of per-stage durations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples.clear()
+
+
+def _stable_choice(text: str, options: list[str]) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return options[digest[0] % len(options)]
+
+
+def _chunk(content: str = "", finish_reason: str | None = None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)])
+
+
+class FakeStream:
+    """Streamed completion: the text arrives in small pieces spread over `seconds`."""
+
+    chunk_chars = 16
+
+    def __init__(self, text: str, seconds: float, stage: str, recorder: Recorder):
+        self.pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        self.delay = seconds / max(1, len(self.pieces))
+        self.stage = stage
+        self.recorder = recorder
+        self.closed = False
+        self._elapsed = 0.0
+
+    def _finish(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.recorder.record(self.stage, self._elapsed)
+
+    def __iter__(self):
+        for piece in self.pieces:
+            if self.closed:
+                return
+            time.sleep(self.delay)
+            self._elapsed += self.delay
+            yield _chunk(piece)
+        yield _chunk(finish_reason="stop")
+        self._finish()
+
+    def close(self) -> None:
+        self._finish()
+
+
+class AsyncFakeStream(FakeStream):
+    async def __aiter__(self):
+        for piece in self.pieces:
+            if self.closed:
+                return
+            await asyncio.sleep(self.delay)
+            self._elapsed += self.delay
+            yield _chunk(piece)
+        yield _chunk(finish_reason="stop")
+        self._finish()
+
+    async def close(self) -> None:
+        self._finish()
+
+
+class FakeCerebras:
+    """Fake Cerebras client: answers extraction, judge and batch-judge prompts.
+
+    tail_chars of whitespace follow each JSON answer, like a model that keeps
+    generating after it is done; streamed calls can stop before the tail.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyModel | None = None,
+        error_rate: float = 0.0,
+        reason_chars: int = 200,
+        tail_chars: int = 0,
+        recorder: Recorder | None = None,
+        seed: int = 0,
+    ):
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.reason_chars = reason_chars
+        self.tail_chars = tail_chars
+        self.recorder = recorder or Recorder()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._rng_lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def _answer(self, messages: list[dict]) -> tuple[str, str]:
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user = messages[-1]["content"]
+        reason = ("The evidence is consistent with this. " * 20)[: self.reason_chars]
+
+        if "extraction" in system:
+            max_claims = int(re.search(r"up to (\d+)", system).group(1))
+            text = user.split("Text:", 1)[-1]
+            sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if len(s.strip()) > 20]
+            return "llm.extract", json.dumps({"claims": sentences[:max_claims]})
+
+        if "JSON array" in system:
+            claims = re.findall(r"=== Claim (\d+) ===\n(.*)", user)
+            verdicts = [
+                {
+                    "id": int(n),
+                    "verdict": _stable_choice(claim, ["true", "false", "uncertain"]),
+                    "reason": reason,
+                    "top_sources": [f"https://example.org/source/{n}"],
+                }
+                for n, claim in claims
+            ]
+            return "llm.judge_batch", json.dumps(verdicts)
+
+        claim = user.split("Claim:", 1)[-1].split("Evidence", 1)[0].strip()
+        verdict = _stable_choice(claim, ["true", "false", "uncertain"])
+        if verdict == "uncertain" and user.count("https://example.org/") > 6:
+            # More sources settle some of the claims that thinner evidence left open
+            verdict = _stable_choice(claim + " (more sources)", ["true", "false", "uncertain"])
+        return "llm.judge", json.dumps({
+            "verdict": verdict,
+            "reason": reason,
+            "top_sources": ["https://example.org/source/1"],
+        })
+
+    @staticmethod
+    def _response(content: str):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def _generate(self, messages: list[dict]) -> tuple[str, str, float, bool]:
+        """(stage, full text, seconds to generate all of it, fail)."""
+        delay, fail = self._draw()
+        stage, content = self._answer(messages)
+        # The tail takes as long per character as the answer itself
+        delay *= 1 + self.tail_chars / max(1, len(content))
+        return stage, content + "\n" * self.tail_chars, delay, fail
+
+    def _create(self, messages: list[dict], timeout: float | None = None, stream: bool = False, **kwargs):
+        stage, content, delay, fail = self._generate(messages)
+        if stream:
+            if fail:
+                raise FakeAPIError(f"simulated {stage} failure")
+            return FakeStream(content, delay, stage, self.recorder)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeTimeoutError(f"simulated {stage} timeout")
+        time.sleep(delay)
+        self.recorder.record(stage, delay)
+        if fail:
+            raise FakeAPIError(f"simulated {stage} failure")
+        return self._response(content)
+
+
+class AsyncFakeCerebras(FakeCerebras):
+    """Async flavour of FakeCerebras for the a* pipeline functions."""
+
+    async def _create(self, messages: list[dict], timeout: float | None = None, stream: bool = False, **kwargs):
+        stage, content, delay, fail = self._generate(messages)
+        if stream:
+            if fail:
+                raise FakeAPIError(f"simulated {stage} failure")
+            return AsyncFakeStream(content, delay, stage, self.recorder)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeTimeoutError(f"simulated {stage} timeout")
+        await asyncio.sleep(delay)
+        self.recorder.record(stage, delay)
+        if fail:
+            raise FakeAPIError(f"simulated {stage} failure")
+        return self._response(content)
+
+
+class FakeParallel:
+    """Fake Parallel client: returns max_results synthetic results per search."""
+
+    def __init__(
+        self,
+        latency: LatencyModel | None = None,
+        error_rate: float = 0.0,
+        excerpt_chars: int = 1500,
+        recorder: Recorder | None = None,
+        seed: int = 1,
+    ):
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.excerpt_chars = excerpt_chars
+        self.recorder = recorder or Recorder()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.beta = SimpleNamespace(search=self._search)
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._rng_lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def _results(self, search_queries: list[str], max_results: int, excerpts: dict | None):
+        limit = (excerpts or {}).get("max_chars_per_result", self.excerpt_chars)
+        size = min(limit, self.excerpt_chars)
+        # Like the real API, max_results caps the total across all queries
+        per_query = -(-max_results // len(search_queries))
+        results = []
+        for q, query in enumerate(search_queries):
+            for i in range(per_query):
+                body = (f"{query} Reported by source {i}. " * 50)[:size]
+                results.append(SimpleNamespace(
+                    url=f"https://example.org/{q}/{i}",
+                    title=f"Source {i} for query {q}",
+                    publish_date="2024-01-01",
+                    excerpts=[body[: size // 2], body[size // 2:]],
+                ))
+        return SimpleNamespace(results=results[:max_results])
+
+    def _search(
+        self,
+        search_queries: list[str],
+        max_results: int = 5,
+        excerpts: dict | None = None,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        delay, fail = self._draw()
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeTimeoutError("simulated search timeout")
+        time.sleep(delay)
+        self.recorder.record("search", delay)
+        if fail:
+            raise FakeAPIError("simulated search failure")
+        return self._results(search_queries, max_results, excerpts)
+
+
+class AsyncFakeParallel(FakeParallel):
+    async def _search(
+        self,
+        search_queries: list[str],
+        max_results: int = 5,
+        excerpts: dict | None = None,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        delay, fail = self._draw()
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeTimeoutError("simulated search timeout")
+        await asyncio.sleep(delay)
+        self.recorder.record("search", delay)
+        if fail:
+            raise FakeAPIError("simulated search failure")
+        return self._results(search_queries, max_results, excerpts)
+
+
+def canned_article(n: int, paragraphs: int = 12) -> str:
+    """A synthetic news article with checkable sentences and some boilerplate."""
+    body = "\n".join(
+        f"<p>In {1990 + (n + i) % 30}, the city of Example{n} recorded {1000 + 37 * i} "
+        f"visitors at event number {i}. Officials said attendance rose by {i + 3} percent.</p>"
+        for i in range(paragraphs)
+    )
+    return (
+        "<html><head><title>Article</title><script>var tracking = true;</script></head>"
+        "<body><nav><p>Home | World | Sports</p></nav>"
+        f"<article><h1>Article {n}</h1>{body}</article>"
+        "<footer><p>Copyright Example News</p></footer></body></html>"
+    )
+
+
+class CannedSite:
+    """Serve canned_article pages at http://127.0.0.1:<port>/article/<n> in a background thread."""
+
+    def __init__(self, paragraphs: int = 12, latency: LatencyModel | None = None):
+        paragraphs_per_page = paragraphs
+        page_latency = latency or LatencyModel(mean=0.0)
+        rng = random.Random(2)
+        rng_lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                match = re.fullmatch(r"/article/(\d+)", self.path)
+                if not match:
+                    self.send_error(404)
+                    return
+                with rng_lock:
+                    delay = page_latency.sample(rng)
+                time.sleep(delay)
+                body = canned_article(int(match.group(1)), paragraphs_per_page).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, n: int) -> str:
+        return f"{self.base_url}/article/{n}"
+
+    def __enter__(self) -> "CannedSite":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Import-time check: `import fact_checker` must stay fast and free of heavy dependencies.
+
+Each run imports the package in a fresh interpreter with -X importtime. The
+check fails (exit code 1) if any SDK, HTTP or HTML module, or streamlit, is
+loaded by the import, or if the best run is slower than --max-ms.
+
+Examples:
+  python benchmarks/import_time.py
+  python benchmarks/import_time.py --runs 10 --max-ms 100 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load when first used
+HEAVY_MODULES = ("cerebras", "parallel", "streamlit", "requests", "httpx", "bs4", "lxml", "asyncio")
+
+_PROBE = (
+    "import sys\n"
+    f"sys.path.insert(0, {os.path.join(ROOT, 'src')!r})\n"
+    "import fact_checker, fact_checker.batch, fact_checker.metrics\n"
+    "print(','.join(sorted({name.split('.')[0] for name in sys.modules})))\n"
+)
+
+
+def run_once() -> tuple[dict[str, tuple[int, int]], set[str]]:
+    """Import the package in a fresh interpreter.
+
+    Returns ({module: (self_us, cumulative_us)}, top-level modules loaded).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings, set(proc.stdout.strip().split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure and check the import time of the fact_checker package",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to try; the best run counts")
+    parser.add_argument("--max-ms", type=float, default=150.0, help="Fail if the best import takes longer")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (self time)")
+    args = parser.parse_args()
+
+    best_ms, best_timings, loaded = None, {}, set()
+    for _ in range(max(1, args.runs)):
+        timings, loaded = run_once()
+        ms = sum(timings[m][1] for m in ("fact_checker", "fact_checker.batch") if m in timings) / 1000
+        if best_ms is None or ms < best_ms:
+            best_ms, best_timings = ms, timings
+
+    print(f"import fact_checker: {best_ms:.1f} ms (best of {args.runs})")
+    print(f"  {'module':<44}{'self':>10}{'cumulative':>12}")
+    slowest = sorted(best_timings.items(), key=lambda item: -item[1][0])[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {name:<44}{self_us / 1000:>8.1f}ms{cumulative_us / 1000:>10.1f}ms")
+
+    heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+    failed = False
+    if heavy:
+        print(f"FAIL: importing the package loaded {', '.join(heavy)}")
+        failed = True
+    if best_ms > args.max_ms:
+        print(f"FAIL: import took {best_ms:.1f} ms (limit {args.max_ms:.0f} ms)")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Offline pipeline benchmarks using local fakes for Cerebras, Parallel and web pages.
+
+Examples:
+  python benchmarks/run_benchmarks.py
+  python benchmarks/run_benchmarks.py --workloads text,url --runs 20 --llm-latency 0.5
+  python benchmarks/run_benchmarks.py --rpm 10 --workloads text --runs 2   # free-tier limiter
+  python benchmarks/run_benchmarks.py --rpm 30 --keys 3 --workloads text    # three keys, 3x the budget
+  python benchmarks/run_benchmarks.py --json results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import (  # noqa: E402
+    AsyncFakeCerebras,
+    AsyncFakeParallel,
+    CannedSite,
+    FakeCerebras,
+    FakeParallel,
+    LatencyModel,
+    Recorder,
+    canned_article,
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: dict[str, list[float]]) -> dict:
+    return {
+        stage: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "total": sum(values),
+        }
+        for stage, values in sorted(samples.items())
+    }
+
+
+def configure_environment(args) -> str:
+    """Point the package at fakes-friendly settings. Must run before importing fact_checker."""
+    cache_dir = tempfile.mkdtemp(prefix="fact-checker-bench-")
+    os.environ.update({
+        "CEREBRAS_API_KEYS": ",".join(f"benchmark-{n}" for n in range(max(1, args.keys))),
+        "PARALLEL_API_KEYS": "benchmark",
+        "CEREBRAS_REQUESTS_PER_MIN": str(args.rpm),
+        "FACT_CHECKER_CACHE_DIR": cache_dir,
+        "SEARCH_CACHE_ENABLED": "1" if args.caches else "0",
+        "VERDICT_CACHE_ENABLED": "1" if args.caches else "0",
+        "PAGE_CACHE_ENABLED": "1" if args.caches else "0",
+        "LLM_HEDGE_AFTER_SECONDS": str(args.hedge_after),
+        "SEARCH_HEDGE_AFTER_SECONDS": str(args.hedge_after),
+        "RETRY_MAX_ATTEMPTS": str(args.max_attempts),
+        "RETRY_BASE_DELAY_SECONDS": str(args.retry_delay),
+        "LLM_STREAMING_ENABLED": "0" if args.no_stream else "1",
+    })
+    os.environ.pop("RATE_LIMIT_DB_PATH", None)
+    return cache_dir
+
+
+def install_fakes(args, recorder: Recorder):
+    """Swap the SDK clients for fakes and wrap the stages we time ourselves."""
+    from fact_checker import claims, clients
+
+    llm = dict(
+        latency=LatencyModel(args.llm_latency, args.llm_jitter, args.distribution),
+        error_rate=args.error_rate,
+        reason_chars=args.reason_chars,
+        tail_chars=args.tail_chars,
+        recorder=recorder,
+    )
+    search = dict(
+        latency=LatencyModel(args.search_latency, args.search_jitter, args.distribution),
+        error_rate=args.error_rate,
+        excerpt_chars=args.excerpt_chars,
+        recorder=recorder,
+    )
+    cerebras_pool = clients.get_cerebras_pool()
+    cerebras_pool.use_clients(FakeCerebras(**llm), AsyncFakeCerebras(**llm))
+    clients.get_parallel_pool().use_clients(FakeParallel(**search), AsyncFakeParallel(**search))
+
+    def timed(stage, fn):
+        def wrapper(*a, **kw):
+            start = time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                recorder.record(stage, time.perf_counter() - start)
+        return wrapper
+
+    claims.fetch_page = timed("fetch", claims.fetch_page)
+    claims.extract_main_text = timed("parse", claims.extract_main_text)
+
+    acquire = cerebras_pool.scheduler.acquire
+
+    def recorded_acquire(*a, **kw):
+        # Time queued for a turn plus the key's remaining wait, which lease() sleeps off
+        start = time.perf_counter()
+        key, wait = acquire(*a, **kw)
+        recorder.record("rate_limit_wait", time.perf_counter() - start + wait)
+        return key, wait
+
+    cerebras_pool.scheduler.acquire = recorded_acquire
+
+
+def sample_text(n: int, paragraphs: int) -> str:
+    from fact_checker.fetch import extract_main_text
+    return extract_main_text(canned_article(n, paragraphs))
+
+
+def run_documents(label: str, check, inputs: list, recorder: Recorder) -> dict:
+    recorder.reset()
+    claims = errors = 0
+    start = time.perf_counter()
+    for value in inputs:
+        doc_start = time.perf_counter()
+        try:
+            results = check(value)
+            claims += len(results)
+            errors += sum(1 for r in results if r.error)
+        except Exception:
+            errors += 1
+        recorder.record("document", time.perf_counter() - doc_start)
+    wall = time.perf_counter() - start
+    return report(label, len(inputs), claims, errors, wall, recorder)
+
+
+def run_batch_workload(args, site, recorder: Recorder, workdir: str) -> dict:
+    from fact_checker.batch import BatchItem, run_batch
+
+    items = []
+    for n in range(args.batch_items):
+        if n % 2:
+            items.append(BatchItem(id=str(n), url=site.url(n)))
+        else:
+            items.append(BatchItem(id=str(n), text=sample_text(n, args.paragraphs)))
+
+    recorder.reset()
+    output = os.path.join(workdir, "batch.jsonl")
+    start = time.perf_counter()
+    progress = run_batch(
+        items,
+        output_path=output,
+        checkpoint_path=output + ".checkpoint",
+        concurrency=args.batch_concurrency,
+        max_claims=args.max_claims,
+        max_workers=args.workers,
+        batch_judge=args.batch_judge,
+        batch_search=args.batch_search,
+        tiered=args.tiered,
+    )
+    wall = time.perf_counter() - start
+    return report("batch", progress.done, progress.claims, progress.failed, wall, recorder)
+
+
+def run_corpus_workload(args, recorder: Recorder) -> dict:
+    """batch_items documents retelling corpus_stories stories, each with one sentence of its own."""
+    from fact_checker.batch import BatchItem
+    from fact_checker.corpus import fact_check_corpus
+
+    items = [
+        BatchItem(
+            id=str(n),
+            text=f"Reporter number {n} filed this story from the scene today.\n\n"
+            + sample_text(n % args.corpus_stories, args.paragraphs),
+        )
+        for n in range(args.batch_items)
+    ]
+    recorder.reset()
+    start = time.perf_counter()
+    result = fact_check_corpus(
+        items,
+        max_claims=args.max_claims,
+        concurrency=args.batch_concurrency,
+        max_workers=args.workers,
+        batch_judge=args.batch_judge,
+        batch_search=args.batch_search,
+        tiered=args.tiered,
+    )
+    wall = time.perf_counter() - start
+    errors = len(result.errors) + sum(1 for c in result.clusters if c.result is None or c.result.error)
+    print(f"\ncorpus: {result.claims_extracted} claims extracted, {result.claims_checked} checked")
+    return report("corpus", len(items), result.claims_extracted, errors, wall, recorder)
+
+
+def report(label: str, documents: int, claims: int, errors: int, wall: float, recorder: Recorder) -> dict:
+    stages = summarize(recorder.samples)
+    return {
+        "workload": label,
+        "documents": documents,
+        "claims": claims,
+        "errors": errors,
+        "wall_seconds": wall,
+        "documents_per_min": documents / wall * 60 if wall else 0.0,
+        "claims_per_sec": claims / wall if wall else 0.0,
+        "rate_limit_wait_seconds": stages.get("rate_limit_wait", {}).get("total", 0.0),
+        "stages": stages,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"\n== {result['workload']} ==")
+    print(
+        f"{result['documents']} documents, {result['claims']} claims, {result['errors']} errors "
+        f"in {result['wall_seconds']:.2f}s | {result['documents_per_min']:.1f} docs/min, "
+        f"{result['claims_per_sec']:.2f} claims/s | rate-limit wait "
+        f"{result['rate_limit_wait_seconds']:.2f}s"
+    )
+    print(f"  {'stage':<18}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'total':>10}")
+    for stage, s in result["stages"].items():
+        print(
+            f"  {stage:<18}{s['count']:>7}{s['p50'] * 1000:>8.1f}ms{s['p95'] * 1000:>8.1f}ms"
+            f"{s['p99'] * 1000:>8.1f}ms{s['total']:>9.2f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fact-check pipeline offline against local fakes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--workloads", default="text,url,batch", help="Comma-separated: text, url, batch, corpus")
+    parser.add_argument("--runs", type=int, default=5, help="Documents per text/url workload")
+    parser.add_argument("--max-claims", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=4, help="Claims checked concurrently per document")
+    parser.add_argument("--batch-judge", action="store_true", help="Judge several claims per LLM call")
+    parser.add_argument("--batch-search", action="store_true", help="Search for several claims per request")
+    parser.add_argument("--tiered", action="store_true", help="Fast pass first, deep pass for uncertain claims")
+    parser.add_argument("--batch-items", type=int, default=20)
+    parser.add_argument("--batch-concurrency", type=int, default=4)
+    parser.add_argument("--corpus-stories", type=int, default=4, help="Distinct stories in the corpus workload")
+    parser.add_argument("--paragraphs", type=int, default=12, help="Paragraphs per canned article")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Mean LLM latency (s)")
+    parser.add_argument("--llm-jitter", type=float, help="Latency spread (s, default: half the mean)")
+    parser.add_argument("--search-latency", type=float, default=0.5, help="Mean search latency (s)")
+    parser.add_argument("--search-jitter", type=float, help="Latency spread (s, default: half the mean)")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Mean page fetch latency (s)")
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability each API call fails")
+    parser.add_argument("--reason-chars", type=int, default=200, help="Size of each fake verdict reason")
+    parser.add_argument("--tail-chars", type=int, default=0, help="Whitespace the fake LLM emits after its JSON")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for whole LLM answers instead of streaming")
+    parser.add_argument("--excerpt-chars", type=int, default=1500, help="Size of each fake search result")
+    parser.add_argument("--hedge-after", type=float, default=0.0, help="Hedge LLM/search calls after N s (0 = off)")
+    parser.add_argument("--max-attempts", type=int, default=4, help="Attempts per API call (1 = no retries)")
+    parser.add_argument("--retry-delay", type=float, default=0.1, help="Base retry backoff (s)")
+    parser.add_argument("--rpm", type=int, default=10_000, help="Rate limit applied to LLM calls, per key")
+    parser.add_argument("--keys", type=int, default=1, help="Cerebras API keys in the pool")
+    parser.add_argument("--caches", action="store_true", help="Leave search/verdict/page caches on")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.llm_jitter is None:
+        args.llm_jitter = args.llm_latency / 2
+    if args.search_jitter is None:
+        args.search_jitter = args.search_latency / 2
+
+    workdir = configure_environment(args)
+    recorder = Recorder()
+    install_fakes(args, recorder)
+
+    from fact_checker import fact_check_text, fact_check_url
+
+    workloads = [w.strip() for w in args.workloads.split(",") if w.strip()]
+    results = []
+    with CannedSite(args.paragraphs, LatencyModel(args.page_latency, args.page_latency / 2)) as site:
+        options = dict(
+            max_claims=args.max_claims,
+            max_workers=args.workers,
+            batch_judge=args.batch_judge,
+            batch_search=args.batch_search,
+            tiered=args.tiered,
+        )
+        if "text" in workloads:
+            texts = [sample_text(n, args.paragraphs) for n in range(args.runs)]
+            results.append(run_documents("fact_check_text", lambda t: fact_check_text(t, **options), texts, recorder))
+            print_report(results[-1])
+        if "url" in workloads:
+            urls = [site.url(n) for n in range(args.runs)]
+            results.append(run_documents("fact_check_url", lambda u: fact_check_url(u, **options), urls, recorder))
+            print_report(results[-1])
+        if "batch" in workloads:
+            results.append(run_batch_workload(args, site, recorder, workdir))
+            print_report(results[-1])
+        if "corpus" in workloads:
+            results.append(run_corpus_workload(args, recorder))
+            print_report(results[-1])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
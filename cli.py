@@ -2,13 +2,25 @@
 """Content Fact-Checker CLI — check claims from text or URLs."""
 
 import argparse
+import json
 import sys
 import os
+from dataclasses import asdict
 
 # Add src to path so the fact_checker package is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
-from fact_checker import fact_check_text, fact_check_url, ClaimResult
+from fact_checker import iter_fact_check_text, iter_fact_check_url, ClaimResult
+from fact_checker.batch import BatchProgress, read_batch_items, run_batch
+from fact_checker.corpus import fact_check_corpus
+from fact_checker.recheck import recheck_url
+from fact_checker.config import (
+    BATCH_JUDGE_ENABLED,
+    DEFAULT_MAX_WORKERS,
+    SEARCH_BATCH_ENABLED,
+    TIERED_VERIFICATION_ENABLED,
+)
+from fact_checker.metrics import metrics
 
 
 # ANSI color codes for terminal output
@@ -25,32 +37,217 @@ VERDICT_COLORS = {
 }
 
 
-def print_progress(message: str, current: int, total: int):
-    print(f"\n{'=' * 60}")
-    print(f"  [{current + 1}/{total}] {message}")
-    print(f"{'=' * 60}")
+def print_result(number: int, r: ClaimResult, profile: bool = False):
+    color = VERDICT_COLORS.get(r.verdict, RESET)
+    print(f"{BOLD}Claim {number}:{RESET} {r.claim}")
+    cached = " (cached)" if r.cached else ""
+    tier = f" ({r.tier} check)" if r.tier and not r.cached else ""
+    print(f"  Verdict: {color}{BOLD}{r.verdict.upper()}{RESET}{cached}{tier}")
+    print(f"  Reason:  {r.reason}")
+    if r.cached_claim:
+        print(f"  Reused:  verdict for \"{r.cached_claim}\"")
+    if r.error:
+        print(f"  Error:   {r.error}")
+    if r.sources:
+        print(f"  Sources:")
+        for s in r.sources:
+            print(f"    - {s}")
+    if profile and r.timings:
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in r.timings.items())
+        print(f"  Timings: {stages}")
+    print()
 
 
-def print_results(results: list[ClaimResult]):
+def print_profile():
+    summary = metrics.summary()
     print(f"\n{BOLD}{'=' * 60}")
-    print(f"  FACT-CHECK RESULTS")
+    print("  PROFILE")
+    print(f"{'=' * 60}{RESET}")
+    stages = summary["histograms"].get("fact_checker_stage_seconds", {})
+    if stages:
+        print(f"  {'stage':<22}{'count':>6}{'total':>9}{'mean':>9}{'p95':>9}")
+        for series, s in sorted(stages.items(), key=lambda item: -item[1]["total"]):
+            stage = series.split("=", 1)[-1]
+            print(f"  {stage:<22}{s['count']:>6}{s['total']:>8.2f}s{s['mean']:>8.2f}s{s['p95']:>8.2f}s")
+    for name, series in summary["counters"].items():
+        for labels, value in series.items():
+            suffix = "" if labels == "all" else f" [{labels}]"
+            print(f"  {name.removeprefix('fact_checker_')}{suffix}: {value:g}")
+
+
+def write_metrics(path: str):
+    """Write collected metrics as JSON (.json) or Prometheus text (anything else)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(metrics.to_json() if path.endswith(".json") else metrics.to_prometheus())
+
+
+def run_check(
+    text: str | None = None,
+    url: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    profile: bool = False,
+) -> int:
+    """Fact-check text or a URL, printing each verdict as soon as it is ready.
+
+    Returns the number of claims checked.
+    """
+    options = dict(max_workers=max_workers, batch_judge=batch_judge, batch_search=batch_search, tiered=tiered)
+    if url:
+        updates = iter_fact_check_url(url, **options)
+    else:
+        updates = iter_fact_check_text(text, **options)
+
+    print("Extracting claims...")
+    count = 0
+    for update in updates:
+        if count == 0:
+            print(f"\n{BOLD}{'=' * 60}")
+            print(f"  FACT-CHECK RESULTS ({update.total} claims)")
+            print(f"{'=' * 60}{RESET}\n")
+        count += 1
+        print(f"[{count}/{update.total}, {update.elapsed:.1f}s]")
+        print_result(update.index + 1, update.result, profile=profile)
+    return count
+
+
+def run_recheck(
+    url: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    profile: bool = False,
+) -> int:
+    """Re-check a URL, redoing only what changed since its last check; returns the claim count."""
+
+    def on_progress(message: str, done: int, total: int):
+        print(f"  {message}", flush=True)
+
+    result = recheck_url(
+        url,
+        on_progress=on_progress,
+        max_workers=max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+    )
+    if not result.results:
+        return 0
+    print(
+        f"\n{result.changed_paragraphs} of {result.paragraphs} paragraphs changed or added, "
+        f"{result.removed_paragraphs} removed; {result.reused} verdicts reused, "
+        f"{result.checked} claims checked in {result.elapsed:.1f}s"
+    )
+    print(f"\n{BOLD}{'=' * 60}")
+    print(f"  FACT-CHECK RESULTS ({len(result.results)} claims)")
     print(f"{'=' * 60}{RESET}\n")
+    for number, r in enumerate(result.results, 1):
+        print_result(number, r, profile=profile)
+    return len(result.results)
+
 
-    for i, r in enumerate(results, 1):
-        color = VERDICT_COLORS.get(r.verdict, RESET)
-        print(f"{BOLD}Claim {i}:{RESET} {r.claim}")
-        print(f"  Verdict: {color}{BOLD}{r.verdict.upper()}{RESET}")
-        print(f"  Reason:  {r.reason}")
-        if r.sources:
-            print(f"  Sources:")
-            for s in r.sources:
-                print(f"    - {s}")
-        print()
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
 
 
-def interactive_mode():
+def print_batch_progress(progress: BatchProgress):
+    eta = progress.eta_seconds
+    eta_text = _format_duration(eta) if eta is not None else "--:--:--"
+    print(
+        f"[{progress.done}/{progress.total}] {progress.claims} claims, "
+        f"{progress.failed} failed | {progress.items_per_min:.1f} items/min | "
+        f"elapsed {_format_duration(progress.elapsed)} | ETA {eta_text}",
+        flush=True,
+    )
+
+
+def batch_mode(args):
+    items = read_batch_items(args.input)
+    checkpoint = args.checkpoint or args.output + ".checkpoint"
+    print(f"Loaded {len(items)} items from {args.input}")
+    print(f"Writing results to {args.output} (checkpoint: {checkpoint})")
+
+    progress = run_batch(
+        items,
+        output_path=args.output,
+        checkpoint_path=checkpoint,
+        concurrency=args.concurrency,
+        max_claims=args.max_claims,
+        max_workers=args.workers,
+        batch_judge=args.batch_judge,
+        batch_search=args.batch_search,
+        tiered=args.tiered,
+        on_progress=print_batch_progress,
+    )
+
+    skipped = len(items) - progress.total
+    print(
+        f"\nDone: {progress.done - progress.failed} items checked, {progress.failed} failed, "
+        f"{skipped} skipped (already checkpointed), {progress.claims} claims in "
+        f"{_format_duration(progress.elapsed)}"
+    )
+    if progress.failed:
+        print("Re-run the same command to retry failed items.")
+
+
+def corpus_mode(args):
+    items = read_batch_items(args.input)
+    print(f"Loaded {len(items)} documents from {args.input}")
+
+    def on_progress(message: str, done: int, total: int):
+        print(f"  {message}", flush=True)
+
+    result = fact_check_corpus(
+        items,
+        max_claims=args.max_claims,
+        concurrency=args.concurrency,
+        max_workers=args.workers,
+        batch_judge=args.batch_judge,
+        batch_search=args.batch_search,
+        tiered=args.tiered,
+        on_progress=on_progress,
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for doc_id, claims in result.documents.items():
+            for c in claims:
+                f.write(json.dumps({
+                    "item_id": doc_id,
+                    "claim_index": c.position,
+                    "cluster_id": c.cluster_id,
+                    "checked_claim": c.representative,
+                    "cluster_documents": result.clusters[c.cluster_id].documents,
+                    **asdict(c.result),
+                }, ensure_ascii=False) + "\n")
+        for doc_id, error in result.errors.items():
+            f.write(json.dumps({"item_id": doc_id, "error": error}) + "\n")
+
+    saved = result.claims_extracted - result.claims_checked
+    print(
+        f"\nDone: {result.claims_extracted} claims from {len(result.documents)} documents, "
+        f"{result.claims_checked} checked ({saved} duplicates skipped), "
+        f"{len(result.errors)} documents failed, in {_format_duration(result.elapsed)}"
+    )
+    print(f"Results written to {args.output}")
+
+
+def interactive_mode(
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    profile: bool = False,
+):
     print(f"{BOLD}Content Fact-Checker{RESET}")
     print("Enter text to fact-check, or type a URL starting with http.\n")
+    options = dict(
+        max_workers=max_workers, batch_judge=batch_judge, batch_search=batch_search, tiered=tiered, profile=profile
+    )
 
     while True:
         try:
@@ -67,47 +264,147 @@ def interactive_mode():
 
         if user_input.startswith("http://") or user_input.startswith("https://"):
             print(f"\nFetching and analyzing URL: {user_input}")
-            results = fact_check_url(user_input, on_progress=print_progress)
+            count = run_check(url=user_input, **options)
         else:
-            results = fact_check_text(user_input, on_progress=print_progress)
+            count = run_check(text=user_input, **options)
 
-        if results:
-            print_results(results)
-        else:
+        if not count:
             print("\nNo claims could be extracted. Try different text or a different URL.\n")
+        elif profile:
+            print_profile()
+
+
+def common_options(defaults: bool = True) -> argparse.ArgumentParser:
+    """Options shared by single checks and the batch and corpus subcommands.
+
+    Subcommands get them without defaults, so that `--workers 2 batch ...`
+    keeps the value given before the subcommand.
+    """
+
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--workers", "-w", type=int, default=default(DEFAULT_MAX_WORKERS),
+        help=f"Claims to check concurrently (default: {DEFAULT_MAX_WORKERS}, 1 = one at a time)",
+    )
+    common.add_argument(
+        "--batch-judge", action="store_true", default=default(BATCH_JUDGE_ENABLED),
+        help="Judge several claims per LLM call (fewer requests under the rate limit)",
+    )
+    common.add_argument(
+        "--batch-search", action="store_true", default=default(SEARCH_BATCH_ENABLED),
+        help="Search for several claims per Parallel request (fewer search round-trips)",
+    )
+    common.add_argument(
+        "--tiered", action="store_true", default=default(TIERED_VERIFICATION_ENABLED),
+        help="Check claims with a fast pass first and a deep one only for uncertain claims",
+    )
+    common.add_argument(
+        "--profile", action="store_true", default=default(False),
+        help="Print per-claim timings and a per-stage time/counter summary",
+    )
+    common.add_argument(
+        "--metrics-file", metavar="PATH", default=default(None),
+        help="Write metrics on exit (.json for a JSON summary, otherwise Prometheus text)",
+    )
+    return common
 
 
 def main():
     parser = argparse.ArgumentParser(
+        parents=[common_options()],
         description="Content Fact-Checker — extract and verify claims from text or URLs",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   python cli.py --text "Albert Einstein was born in Germany in 1879."
   python cli.py --url "https://www.snopes.com/fact-check/drinking-at-disney-world/"
+  python cli.py --url "https://example.com/live-blog" --incremental   # only what changed
+  python cli.py batch articles.jsonl -o results.jsonl --concurrency 8
+  python cli.py corpus articles.jsonl -o results.jsonl   # check repeated claims once
   python cli.py                   # interactive mode
         """,
     )
     parser.add_argument("--text", "-t", type=str, help="Text to fact-check")
     parser.add_argument("--url", "-u", type=str, help="URL to fact-check")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="With --url: re-extract only changed paragraphs and re-judge only stale verdicts",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    batch_parser = subparsers.add_parser(
+        "batch",
+        parents=[common_options(defaults=False)],
+        help="Fact-check many texts/URLs from a JSONL or CSV file",
+        description=(
+            "Fact-check every record of a JSONL or CSV file (fields: id, text or url). "
+            "One JSONL record per claim is appended to the output as soon as it is ready. "
+            "Completed items are checkpointed, so re-running the same command resumes."
+        ),
+    )
+    batch_parser.add_argument("input", help="Input .jsonl or .csv file")
+    batch_parser.add_argument("--output", "-o", required=True, help="Output .jsonl file (appended to)")
+    batch_parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)"
+    )
+    batch_parser.add_argument(
+        "--concurrency", "-c", type=int, default=4, help="Items to process concurrently (default: 4)"
+    )
+    batch_parser.add_argument(
+        "--max-claims", type=int, default=6, help="Claims to extract per item (default: 6)"
+    )
+
+    corpus_parser = subparsers.add_parser(
+        "corpus",
+        parents=[common_options(defaults=False)],
+        help="Fact-check a set of related documents, checking repeated claims once",
+        description=(
+            "Extract claims from every record of a JSONL or CSV file (fields: id, text or url), "
+            "cluster near-duplicate claims across documents, check one claim per cluster, and "
+            "write one JSONL record per document claim with its cluster's verdict."
+        ),
+    )
+    corpus_parser.add_argument("input", help="Input .jsonl or .csv file")
+    corpus_parser.add_argument("--output", "-o", required=True, help="Output .jsonl file (overwritten)")
+    corpus_parser.add_argument(
+        "--concurrency", "-c", type=int, default=4, help="Documents to extract concurrently (default: 4)"
+    )
+    corpus_parser.add_argument(
+        "--max-claims", type=int, default=6, help="Claims to extract per document (default: 6)"
+    )
 
     args = parser.parse_args()
 
-    if args.text:
-        results = fact_check_text(args.text, on_progress=print_progress)
-        if results:
-            print_results(results)
-        else:
+    options = dict(
+        max_workers=args.workers,
+        batch_judge=args.batch_judge,
+        batch_search=args.batch_search,
+        tiered=args.tiered,
+        profile=args.profile,
+    )
+    if args.command == "batch":
+        batch_mode(args)
+    elif args.command == "corpus":
+        corpus_mode(args)
+    elif args.text:
+        if not run_check(text=args.text, **options):
             print("No claims could be extracted from the provided text.")
     elif args.url:
         print(f"Fetching and analyzing URL: {args.url}")
-        results = fact_check_url(args.url, on_progress=print_progress)
-        if results:
-            print_results(results)
-        else:
+        check = run_recheck if args.incremental else run_check
+        if not check(url=args.url, **options):
             print("No claims could be extracted from the URL.")
     else:
-        interactive_mode()
+        interactive_mode(**options)
+
+    if args.profile and (args.command in ("batch", "corpus") or args.text or args.url):
+        print_profile()
+    if args.metrics_file:
+        write_metrics(args.metrics_file)
+        print(f"Metrics written to {args.metrics_file}")
 
 
 if __name__ == "__main__":
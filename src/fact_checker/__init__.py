@@ -1,2 +1,25 @@
-from .checker import fact_check_text, fact_check_url, fact_check_single_claim, ClaimResult
-from .claims import extract_claims_from_text, extract_claims_from_url
+from .checker import (
+    ClaimResult,
+    ClaimUpdate,
+    afact_check_claims,
+    afact_check_single_claim,
+    afact_check_text,
+    afact_check_url,
+    aiter_fact_check_claims,
+    aiter_fact_check_text,
+    aiter_fact_check_url,
+    fact_check_claims,
+    fact_check_claims_batched,
+    fact_check_single_claim,
+    fact_check_text,
+    fact_check_url,
+    iter_fact_check_claims,
+    iter_fact_check_text,
+    iter_fact_check_url,
+)
+from .claims import (
+    aextract_claims_from_text,
+    aextract_claims_from_url,
+    extract_claims_from_text,
+    extract_claims_from_url,
+)
@@ -0,0 +1,262 @@
+"""Bulk fact-checking of many texts/URLs with JSONL output and resumable checkpoints."""
+
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from .checker import iter_fact_check_claims
+from .claims import extract_claims_from_text, extract_claims_from_url
+from .config import BATCH_JUDGE_ENABLED, DEFAULT_MAX_WORKERS, SEARCH_BATCH_ENABLED, TIERED_VERIFICATION_ENABLED
+from .scheduler import request_context, with_request_context
+
+
+@dataclass
+class BatchItem:
+    id: str
+    text: Optional[str] = None
+    url: Optional[str] = None
+
+
+@dataclass
+class BatchProgress:
+    total: int  # items in this run, excluding ones already checkpointed
+    done: int = 0
+    failed: int = 0
+    claims: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def items_per_min(self) -> float:
+        return self.done / self.elapsed * 60 if self.elapsed else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        if not self.done:
+            return None
+        return (self.total - self.done) * self.elapsed / self.done
+
+
+def read_batch_items(path: str) -> list[BatchItem]:
+    """Read items from a .jsonl or .csv file.
+
+    Each record needs a "text" or a "url" field and may have an "id"
+    (defaults to its 1-based record number). IDs must be unique since they
+    are what checkpoints record.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    items = []
+    seen = set()
+    for n, record in enumerate(records, 1):
+        item = BatchItem(
+            id=str(record.get("id") or n),
+            text=(record.get("text") or "").strip() or None,
+            url=(record.get("url") or "").strip() or None,
+        )
+        if not item.text and not item.url:
+            raise ValueError(f"{path}: record {n} has neither 'text' nor 'url'")
+        if item.id in seen:
+            raise ValueError(f"{path}: duplicate id {item.id!r}")
+        seen.add(item.id)
+        items.append(item)
+    return items
+
+
+def _open_lines(path: str):
+    """Open a line-per-record file for appending."""
+    # A run killed mid-write can leave a partial last line; start on a fresh one
+    with open(path, "ab+") as f:
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    return open(path, "a", encoding="utf-8")
+
+
+class Checkpoint:
+    """Append-only file of completed item IDs, fsynced after every item.
+
+    The claims extracted for each item are kept next to it (path + ".claims",
+    one JSON record per item), so a resumed item checks the same claims
+    instead of extracting a possibly different set.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: set[str] = set()
+        self.claims: dict[str, list[str]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.completed = {line.strip() for line in f if line.strip()}
+        if os.path.exists(path + ".claims"):
+            with open(path + ".claims", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a partial line from an interrupted run
+                    self.claims[record["item_id"]] = record["claims"]
+        self._file = open(path, "a", encoding="utf-8")
+        self._claims_file = _open_lines(path + ".claims")
+        self._lock = threading.Lock()
+
+    def save_claims(self, item_id: str, claims: list[str]) -> None:
+        line = json.dumps({"item_id": item_id, "claims": claims}, ensure_ascii=False)
+        with self._lock:
+            self._claims_file.write(line + "\n")
+            self._claims_file.flush()
+            os.fsync(self._claims_file.fileno())
+            self.claims[item_id] = claims
+
+    def mark_done(self, item_id: str) -> None:
+        with self._lock:
+            self._file.write(item_id + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.completed.add(item_id)
+
+    def close(self) -> None:
+        self._file.close()
+        self._claims_file.close()
+
+
+class _JsonlWriter:
+    """Appends JSON records to a file; writes after close() are dropped."""
+
+    def __init__(self, path: str):
+        self._file = _open_lines(path)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if self._closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._file.close()
+
+
+def _written_claims(path: str, skip: set[str]) -> set[tuple[str, int]]:
+    """(item_id, claim_index) of the claim records already in an output file, except skip's items."""
+    written = set()
+    if not os.path.exists(path):
+        return written
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a partial line from an interrupted run
+            if "claim_index" in record and record.get("item_id") not in skip:
+                written.add((record["item_id"], record["claim_index"]))
+    return written
+
+
+def run_batch(
+    items: list[BatchItem],
+    output_path: str,
+    checkpoint_path: Optional[str] = None,
+    concurrency: int = 4,
+    max_claims: int = 6,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    on_progress: Optional[Callable[[BatchProgress], None]] = None,
+) -> BatchProgress:
+    """Fact-check items `concurrency` at a time, streaming one JSONL record per claim.
+
+    Records are appended to output_path as soon as each claim's verdict is
+    ready. An item's ID is written to the checkpoint file (default:
+    output_path + ".checkpoint") only after all of its claims are written, and
+    items already in the checkpoint are skipped, so an interrupted run can
+    simply be restarted. The claims extracted for an item are saved with the
+    checkpoint, so an unfinished item is resumed with the same claims, and
+    those already in the output are not checked or written again. An item that fails, including a
+    URL that cannot be fetched or an extraction answer that cannot be parsed,
+    is recorded with its error and retried on the next run. An item with no
+    factual claims is done, with no records. API requests are sent with "batch"
+    priority, so interactive checks in the same process go first.
+
+    on_progress(progress) is called from the calling thread after each item.
+    """
+    checkpoint = Checkpoint(checkpoint_path or output_path + ".checkpoint")
+    pending = [item for item in items if item.id not in checkpoint.completed]
+    progress = BatchProgress(total=len(pending))
+    written = _written_claims(output_path, skip=checkpoint.completed)
+    writer = _JsonlWriter(output_path)
+    start = time.perf_counter()
+
+    options = dict(
+        max_workers=max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+    )
+
+    @with_request_context
+    def process(item: BatchItem) -> int:
+        with request_context(priority="batch"):
+            claims = checkpoint.claims.get(item.id)
+            if claims is None:
+                if item.url:
+                    claims = extract_claims_from_url(item.url, max_claims=max_claims, raise_errors=True)
+                else:
+                    claims = extract_claims_from_text(item.text, max_claims=max_claims, raise_errors=True)
+                if not claims:
+                    return 0  # a readable answer that found no factual claims: done
+                checkpoint.save_claims(item.id, claims)
+                # Claim records from before its claims were saved can't be matched up
+                todo = list(range(len(claims)))
+            else:
+                todo = [i for i in range(len(claims)) if (item.id, i) not in written]
+            for update in iter_fact_check_claims([claims[i] for i in todo], **options):
+                writer.write({
+                    "item_id": item.id,
+                    "input_type": "url" if item.url else "text",
+                    "url": item.url,
+                    "claim_index": todo[update.index],
+                    **asdict(update.result),
+                    "duration": round(update.duration, 3),
+                })
+            return len(claims)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = {pool.submit(process, item): item for item in pending}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                progress.claims += future.result()
+                checkpoint.mark_done(item.id)
+            except Exception as e:
+                progress.failed += 1
+                writer.write({"item_id": item.id, "error": f"{type(e).__name__}: {e}"})
+            progress.done += 1
+            progress.elapsed = time.perf_counter() - start
+            if on_progress:
+                on_progress(progress)
+    finally:
+        # On Ctrl-C, don't start queued items; in-flight ones are not checkpointed,
+        # and their writes after the writer is closed are dropped
+        pool.shutdown(wait=False, cancel_futures=True)
+        writer.close()
+        checkpoint.close()
+
+    return progress
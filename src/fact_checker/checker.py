@@ -1,12 +1,53 @@
 import json
-import re
+import os
 import textwrap
-from dataclasses import dataclass, field
-from typing import Callable, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from typing import AsyncIterator, Callable, Iterator, Optional
 
-from .claims import extract_claims_from_text, extract_claims_from_url
-from .llm import call_cerebras_chat
-from .search import search_web, build_evidence_context
+from .claims import (
+    aextract_claims_from_text,
+    aextract_claims_from_url,
+    extract_claims_from_text,
+    extract_claims_from_url,
+)
+from .config import (
+    BATCH_JUDGE_ENABLED,
+    CACHE_DIR,
+    DEEP_TIER_EVIDENCE_TOKENS,
+    DEEP_TIER_EXCERPT_CHARS,
+    DEEP_TIER_MAX_CLAIMS,
+    DEEP_TIER_MAX_SECONDS,
+    DEEP_TIER_SEARCH_MODE,
+    DEEP_TIER_SEARCH_RESULTS,
+    DEFAULT_MAX_WORKERS,
+    EVIDENCE_MAX_TOKENS,
+    FAST_TIER_EVIDENCE_TOKENS,
+    FAST_TIER_EXCERPT_CHARS,
+    FAST_TIER_MAX_CLAIMS,
+    FAST_TIER_MAX_SECONDS,
+    FAST_TIER_SEARCH_MODE,
+    FAST_TIER_SEARCH_RESULTS,
+    JUDGE_BATCH_MAX_CHARS,
+    JUDGE_BATCH_MAX_CLAIMS,
+    JUDGE_BATCH_TOKENS_PER_CLAIM,
+    JUDGE_MAX_TOKENS,
+    SEARCH_BATCH_ENABLED,
+    TIERED_VERIFICATION_ENABLED,
+    VERDICT_CACHE_ENABLED,
+    VERDICT_CACHE_MAX_ENTRIES,
+    VERDICT_CACHE_NEAR_DUPLICATES,
+    VERDICT_CACHE_SIMILARITY,
+    VERDICT_CACHE_TTL_SECONDS,
+)
+from .llm import acall_cerebras_chat, call_cerebras_chat, strip_code_fences
+from .metrics import metrics, span, trace
+from .scheduler import with_request_context
+from .search import DEFAULT_EXCERPT_CHARS, asearch_web, search_web, search_web_batched, build_evidence_context
+from .similarity import normalize_claim
+from .verdict_cache import VerdictCache
 
 
 @dataclass
@@ -15,14 +56,174 @@ class ClaimResult:
     verdict: str  # "true", "false", or "uncertain"
     reason: str
     sources: list[str] = field(default_factory=list)
+    error: Optional[str] = None  # set when the check itself failed
+    cached: bool = False  # True when reused from the verdict cache or a page snapshot
+    cached_claim: Optional[str] = None  # the differently worded claim whose cached verdict was reused
+    tier: Optional[str] = None  # verification tier that gave the verdict (tiered checks only)
+    timings: dict[str, float] = field(default_factory=dict)  # seconds per pipeline stage
 
+    def to_dict(self, timings: bool = True) -> dict:
+        """Compact JSON-ready form: fields at their defaults are left out."""
+        data = {"claim": self.claim, "verdict": self.verdict, "reason": self.reason}
+        if self.sources:
+            data["sources"] = self.sources
+        if self.error is not None:
+            data["error"] = self.error
+        if self.cached:
+            data["cached"] = True
+        if self.cached_claim is not None:
+            data["cached_claim"] = self.cached_claim
+        if self.tier is not None:
+            data["tier"] = self.tier
+        if timings and self.timings:
+            data["timings"] = {stage: round(seconds, 3) for stage, seconds in self.timings.items()}
+        return data
 
-def fact_check_single_claim(claim: str) -> ClaimResult:
-    """Fact-check a single claim: search for evidence, then judge with the LLM."""
-    # Search the web for evidence
-    results = search_web(query=claim, num=6, mode="one-shot")
-    evidence_context = build_evidence_context(results)
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClaimResult":
+        """Rebuild a result from to_dict() (or asdict()) output; unknown keys are ignored."""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
 
+
+@dataclass
+class ClaimUpdate:
+    """One finished claim, as yielded by the iter_fact_check_* streaming APIs."""
+
+    index: int  # position of the claim in extraction order
+    total: int  # number of claims being checked
+    result: ClaimResult
+    duration: float  # seconds spent checking this claim
+    elapsed: float  # seconds since checking started
+
+
+@dataclass(frozen=True)
+class VerificationTier:
+    """How hard one verification pass looks: search size and mode, evidence and judge budgets.
+
+    max_claims and max_seconds bound the tier per document (0 = no limit): at
+    most max_claims claims go through it, and none starts after max_seconds.
+    """
+
+    name: str
+    search_results: int
+    search_mode: str
+    excerpt_chars: int
+    evidence_tokens: int
+    judge_profile: str  # a key of llm.CHAT_PROFILES
+    max_claims: int = 0
+    max_seconds: float = 0.0
+
+
+# The single pass every claim gets when tiered verification is off
+STANDARD_TIER = VerificationTier("standard", 6, "one-shot", DEFAULT_EXCERPT_CHARS, EVIDENCE_MAX_TOKENS, "judge")
+
+VERIFICATION_TIERS = (
+    VerificationTier(
+        "fast",
+        FAST_TIER_SEARCH_RESULTS,
+        FAST_TIER_SEARCH_MODE,
+        FAST_TIER_EXCERPT_CHARS,
+        FAST_TIER_EVIDENCE_TOKENS,
+        "judge",
+        FAST_TIER_MAX_CLAIMS,
+        FAST_TIER_MAX_SECONDS,
+    ),
+    VerificationTier(
+        "deep",
+        DEEP_TIER_SEARCH_RESULTS,
+        DEEP_TIER_SEARCH_MODE,
+        DEEP_TIER_EXCERPT_CHARS,
+        DEEP_TIER_EVIDENCE_TOKENS,
+        "judge_deep",
+        DEEP_TIER_MAX_CLAIMS,
+        DEEP_TIER_MAX_SECONDS,
+    ),
+)
+
+
+class TierBudget:
+    """Tracks what each verification tier has spent on one document's claims.
+
+    Create one per document and share it between that document's claims. A
+    budget shared by several documents gets documents times each tier's allowance.
+    """
+
+    def __init__(self, tiers: tuple[VerificationTier, ...] = VERIFICATION_TIERS, documents: int = 1):
+        self.tiers = tiers
+        self.documents = max(1, documents)
+        self.start = time.perf_counter()
+        self._used = {tier.name: 0 for tier in tiers}
+        self._lock = threading.Lock()
+
+    def spend(self, tier: VerificationTier) -> bool:
+        """Reserve one claim's pass through tier; False once the tier's budget is used up."""
+        with self._lock:
+            if tier.max_claims and self._used[tier.name] >= tier.max_claims * self.documents:
+                exhausted = True
+            elif tier.max_seconds and time.perf_counter() - self.start >= tier.max_seconds * self.documents:
+                exhausted = True
+            else:
+                self._used[tier.name] += 1
+                exhausted = False
+        if exhausted:
+            metrics.incr("fact_checker_tier_budget_exhausted_total", tier=tier.name)
+        return not exhausted
+
+
+_verdict_cache = None
+_verdict_cache_lock = threading.Lock()
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Return the shared on-disk cache of recent verdicts."""
+    global _verdict_cache
+    with _verdict_cache_lock:
+        if _verdict_cache is None:
+            _verdict_cache = VerdictCache(
+                os.path.join(CACHE_DIR, "verdicts.sqlite3"),
+                ttl_seconds=VERDICT_CACHE_TTL_SECONDS,
+                max_entries=VERDICT_CACHE_MAX_ENTRIES,
+                threshold=VERDICT_CACHE_SIMILARITY,
+                near_duplicates=VERDICT_CACHE_NEAR_DUPLICATES,
+            )
+    return _verdict_cache
+
+
+def _cached_verdict(claim: str, budget: Optional[TierBudget] = None) -> Optional[ClaimResult]:
+    data = get_verdict_cache().get(claim)
+    result = None
+    if data is not None:
+        data.pop("timings", None)
+        if normalize_claim(data["claim"]) != normalize_claim(claim):
+            # A near-duplicate match: say which claim the verdict was reached for
+            data["cached_claim"] = data["claim"]
+        data.update(claim=claim, cached=True)
+        result = ClaimResult.from_dict(data)
+        if budget is not None and _escalation_skipped(result, budget):
+            # A tiered check may have the budget to take this claim deeper
+            result = None
+    metrics.incr(
+        "fact_checker_cache_lookups_total",
+        cache="verdict",
+        result="hit" if result is not None else "miss",
+    )
+    return result
+
+
+def _remember_verdict(result: ClaimResult, budget: Optional[TierBudget] = None) -> None:
+    # Failed checks and unparseable answers are worth retrying, not reusing; so
+    # is an uncertain verdict that never reached the deepest tier
+    if result.error is None and not (budget is not None and _escalation_skipped(result, budget)):
+        get_verdict_cache().set(result.claim, result.to_dict(timings=False))
+
+
+def _finish_trace(result: ClaimResult, timings: dict[str, float]) -> ClaimResult:
+    result.timings = timings
+    metrics.incr("fact_checker_claims_total", verdict=result.verdict, cached=str(result.cached).lower())
+    return result
+
+
+def _judge_prompts(claim: str, evidence_context: str) -> tuple[str, str]:
     system_prompt = (
         "You are a careful, skeptical fact-checking assistant.\n"
         "You get a factual claim and web search excerpts.\n"
@@ -45,19 +246,10 @@ def fact_check_single_claim(claim: str) -> ClaimResult:
     Evidence (web search excerpts):
     {evidence_context}
     """)
+    return system_prompt, user_prompt
 
-    raw = call_cerebras_chat(user_content=user_prompt, system_content=system_prompt)
-    raw = raw.strip()
-
-    # Strip markdown code fences
-    raw = re.sub(r"^\s*```(?:json)?\s*", "", raw, flags=re.IGNORECASE)
-    raw = re.sub(r"\s*```\s*$", "", raw)
-
-    try:
-        data = json.loads(raw)
-    except Exception:
-        data = {"verdict": "uncertain", "reason": "Could not parse model output.", "top_sources": []}
 
+def _judgement_from_data(claim: str, data: dict, error: Optional[str] = None) -> ClaimResult:
     verdict = str(data.get("verdict", "uncertain")).lower()
     if verdict not in {"true", "false", "uncertain"}:
         verdict = "uncertain"
@@ -72,48 +264,891 @@ def fact_check_single_claim(claim: str) -> ClaimResult:
         verdict=verdict,
         reason=data.get("reason", ""),
         sources=top_sources,
+        error=error,
+    )
+
+
+def _is_judgement(data) -> bool:
+    return isinstance(data, dict) and "verdict" in data
+
+
+def _parse_judgement(claim: str, raw: str) -> ClaimResult:
+    try:
+        data = json.loads(strip_code_fences(raw))
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+    except Exception:
+        data = {"verdict": "uncertain", "reason": "Could not parse model output.", "top_sources": []}
+        return _judgement_from_data(claim, data, error="Unparseable model output")
+    return _judgement_from_data(claim, data)
+
+
+def _gather_evidence(
+    claim: str,
+    search_results: Optional[list[dict]] = None,
+    tier: VerificationTier = STANDARD_TIER,
+) -> str:
+    if search_results is None:
+        with span("search"):
+            search_results = search_web(
+                query=claim, num=tier.search_results, mode=tier.search_mode, excerpt_chars=tier.excerpt_chars
+            )
+    results = search_results
+    with span("evidence"):
+        return build_evidence_context(results, claim, max_tokens=tier.evidence_tokens)
+
+
+def _judge_claim(claim: str, evidence_context: str, profile: str = "judge") -> ClaimResult:
+    system_prompt, user_prompt = _judge_prompts(claim, evidence_context)
+    with span("judge"):
+        raw = call_cerebras_chat(
+            user_content=user_prompt,
+            system_content=system_prompt,
+            profile=profile,
+            validate_json=_is_judgement,
+        )
+    return _parse_judgement(claim, raw)
+
+
+def _needs_escalation(result: ClaimResult) -> bool:
+    return result.verdict == "uncertain" or result.error is not None
+
+
+def _escalation_skipped(result: ClaimResult, budget: TierBudget) -> bool:
+    """True for a verdict that needed escalation but comes from a tier short of the deepest.
+
+    That happens when the deeper tiers' budget was used up or their pass failed.
+    """
+    return _needs_escalation(result) and result.tier in {tier.name for tier in budget.tiers[:-1]}
+
+
+def _keep_deeper(earlier: Optional[ClaimResult], deeper: ClaimResult) -> ClaimResult:
+    # A deeper verdict wins unless it could not be parsed and the earlier one could
+    if earlier is None or deeper.error is None or earlier.error is not None:
+        return deeper
+    return earlier
+
+
+def _budget_exhausted_result(claim: str) -> ClaimResult:
+    return ClaimResult(
+        claim=claim,
+        verdict="uncertain",
+        reason="Not checked: the verification budget for this document was used up.",
+        error="Verification budget exhausted",
     )
 
 
+def _check_tiers(
+    claim: str,
+    budget: TierBudget,
+    tiers: tuple[VerificationTier, ...],
+    result: Optional[ClaimResult] = None,
+    search_results: Optional[list[dict]] = None,
+) -> ClaimResult:
+    """Run a claim through tiers in order until one gives a true/false verdict.
+
+    result is a verdict from an earlier pass, to be escalated if needed;
+    search_results, if given, were fetched for tiers[0]. Tiers whose budget
+    is used up are skipped. If a deeper pass fails, the earlier verdict stands.
+    """
+    error = None
+    for n, tier in enumerate(tiers):
+        if result is not None and not _needs_escalation(result):
+            break
+        if not budget.spend(tier):
+            continue
+        if result is not None or error is not None:
+            metrics.incr("fact_checker_tier_escalations_total", tier=tier.name)
+        try:
+            with span(f"tier_{tier.name}"):
+                evidence_context = _gather_evidence(claim, search_results if n == 0 else None, tier)
+                tier_result = _judge_claim(claim, evidence_context, tier.judge_profile)
+        except Exception as e:
+            error = e
+            continue
+        tier_result.tier = tier.name
+        metrics.incr("fact_checker_tier_checks_total", tier=tier.name, verdict=tier_result.verdict)
+        result = _keep_deeper(result, tier_result)
+    if result is not None:
+        return result
+    if error is not None:
+        raise error
+    return _budget_exhausted_result(claim)
+
+
+def fact_check_single_claim(
+    claim: str,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    search_results: Optional[list[dict]] = None,
+    budget: Optional[TierBudget] = None,
+) -> ClaimResult:
+    """Fact-check a single claim: search for evidence, then judge with the LLM.
+
+    With use_cache, a recent verdict for the same or a near-identical claim is
+    returned instead (marked cached=True), skipping both search and LLM calls.
+    Pass search_results (as returned by search_web) to skip the search.
+
+    With a budget (one TierBudget per document), the claim gets a fast pass
+    first and is escalated to the deep tier only if that leaves it uncertain
+    or unparsed; search_results are then used for the fast pass.
+
+    The result's timings hold the seconds spent in each stage for this claim.
+    """
+    with trace() as timings:
+        result = _check_claim(claim, use_cache, search_results, budget)
+    return _finish_trace(result, timings)
+
+
+def _check_claim(
+    claim: str,
+    use_cache: bool,
+    search_results: Optional[list[dict]] = None,
+    budget: Optional[TierBudget] = None,
+) -> ClaimResult:
+    if use_cache:
+        cached = _cached_verdict(claim, budget)
+        if cached is not None:
+            return cached
+
+    # Search the web for evidence, then judge it
+    if budget is None:
+        result = _judge_claim(claim, _gather_evidence(claim, search_results))
+    else:
+        result = _check_tiers(claim, budget, budget.tiers, search_results=search_results)
+    if use_cache:
+        _remember_verdict(result, budget)
+    return result
+
+
+async def afact_check_single_claim(
+    claim: str,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    budget: Optional[TierBudget] = None,
+) -> ClaimResult:
+    """Async version of fact_check_single_claim."""
+    with trace() as timings:
+        result = await _acheck_claim(claim, use_cache, budget)
+    return _finish_trace(result, timings)
+
+
+async def _ajudge_tier(claim: str, tier: VerificationTier) -> ClaimResult:
+    with span("search"):
+        results = await asearch_web(
+            query=claim, num=tier.search_results, mode=tier.search_mode, excerpt_chars=tier.excerpt_chars
+        )
+    with span("evidence"):
+        evidence_context = build_evidence_context(results, claim, max_tokens=tier.evidence_tokens)
+
+    system_prompt, user_prompt = _judge_prompts(claim, evidence_context)
+    with span("judge"):
+        raw = await acall_cerebras_chat(
+            user_content=user_prompt,
+            system_content=system_prompt,
+            profile=tier.judge_profile,
+            validate_json=_is_judgement,
+        )
+    return _parse_judgement(claim, raw)
+
+
+async def _acheck_tiers(claim: str, budget: TierBudget) -> ClaimResult:
+    """Async version of _check_tiers, starting from the first tier."""
+    result, error = None, None
+    for tier in budget.tiers:
+        if result is not None and not _needs_escalation(result):
+            break
+        if not budget.spend(tier):
+            continue
+        if result is not None or error is not None:
+            metrics.incr("fact_checker_tier_escalations_total", tier=tier.name)
+        try:
+            with span(f"tier_{tier.name}"):
+                tier_result = await _ajudge_tier(claim, tier)
+        except Exception as e:
+            error = e
+            continue
+        tier_result.tier = tier.name
+        metrics.incr("fact_checker_tier_checks_total", tier=tier.name, verdict=tier_result.verdict)
+        result = _keep_deeper(result, tier_result)
+    if result is not None:
+        return result
+    if error is not None:
+        raise error
+    return _budget_exhausted_result(claim)
+
+
+async def _acheck_claim(claim: str, use_cache: bool, budget: Optional[TierBudget] = None) -> ClaimResult:
+    import asyncio  # already loaded by whoever runs the event loop
+
+    # The verdict cache is SQLite; keep its reads and writes off the event loop
+    if use_cache:
+        cached = await asyncio.to_thread(_cached_verdict, claim, budget)
+        if cached is not None:
+            return cached
+
+    if budget is None:
+        result = await _ajudge_tier(claim, STANDARD_TIER)
+    else:
+        result = await _acheck_tiers(claim, budget)
+    if use_cache:
+        await asyncio.to_thread(_remember_verdict, result, budget)
+    return result
+
+
+_BATCH_JUDGE_SYSTEM_PROMPT = (
+    "You are a careful, skeptical fact-checking assistant.\n"
+    "You get several numbered factual claims, each with its own web search excerpts.\n"
+    "For each claim, decide if ITS evidence supports, contradicts, or does not clearly "
+    "resolve it. Never use one claim's evidence for another claim.\n\n"
+    "Respond with a STRICT JSON array containing one object per claim:\n"
+    "[\n"
+    "  {\n"
+    '    "id": <claim number>,\n'
+    '    "verdict": "true" | "false" | "uncertain",\n'
+    '    "reason": "short explanation",\n'
+    '    "top_sources": ["url1", "url2", ...]\n'
+    "  },\n"
+    "  ...\n"
+    "]\n"
+    "Use 'true' only when the evidence strongly supports the claim.\n"
+    "Use 'false' only when it clearly contradicts the claim.\n"
+    "Otherwise use 'uncertain'."
+)
+
+# Prompt characters added per claim by the batch layout, on top of claim and evidence
+_BATCH_ITEM_OVERHEAD = 100
+
+
+def _plan_judge_batches(
+    items: list[tuple[int, str, str]],
+    max_chars: int = JUDGE_BATCH_MAX_CHARS,
+    max_claims: int = JUDGE_BATCH_MAX_CLAIMS,
+) -> list[list[tuple[int, str, str]]]:
+    """Greedily group (index, claim, evidence) items into batches that fit the prompt budget.
+
+    An item that is larger than the budget on its own still gets a batch of one.
+    """
+    batches: list[list[tuple[int, str, str]]] = []
+    current: list[tuple[int, str, str]] = []
+    size = len(_BATCH_JUDGE_SYSTEM_PROMPT)
+    for item in items:
+        item_size = len(item[1]) + len(item[2]) + _BATCH_ITEM_OVERHEAD
+        if current and (size + item_size > max_chars or len(current) >= max_claims):
+            batches.append(current)
+            current, size = [], len(_BATCH_JUDGE_SYSTEM_PROMPT)
+        current.append(item)
+        size += item_size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_judge_prompt(batch: list[tuple[int, str, str]]) -> str:
+    blocks = []
+    for n, (_, claim, evidence_context) in enumerate(batch, 1):
+        blocks.append(
+            f"=== Claim {n} ===\n{claim}\n\n"
+            f"Evidence for claim {n} (web search excerpts):\n{evidence_context}"
+        )
+    blocks.append(f"Return a JSON array with exactly {len(batch)} verdicts, ids 1 to {len(batch)}.")
+    return "\n\n".join(blocks)
+
+
+def _batch_entries(data) -> list:
+    if isinstance(data, dict):
+        data = data.get("verdicts") or data.get("results") or []
+    return data if isinstance(data, list) else []
+
+
+def _parse_batch_judgements(batch: list[tuple[int, str, str]], raw: str) -> dict[int, ClaimResult]:
+    """Map claim index -> ClaimResult for every well-formed entry in a batch answer."""
+    try:
+        data = json.loads(strip_code_fences(raw))
+    except Exception:
+        return {}
+
+    parsed = {}
+    for position, entry in enumerate(_batch_entries(data)):
+        if not isinstance(entry, dict) or "verdict" not in entry:
+            continue
+        try:
+            n = int(entry.get("id", position + 1))
+        except (TypeError, ValueError):
+            continue
+        if not 1 <= n <= len(batch):
+            continue
+        index, claim, _ = batch[n - 1]
+        parsed.setdefault(index, _judgement_from_data(claim, entry))
+    return parsed
+
+
+def _judge_batch(batch: list[tuple[int, str, str]]) -> dict[int, ClaimResult]:
+    """Judge a batch of claims in one LLM call.
+
+    Claims whose entry is missing or malformed are judged again one by one.
+    """
+    results: dict[int, ClaimResult] = {}
+    if len(batch) > 1:
+        try:
+            with span("judge_batch"):
+                raw = call_cerebras_chat(
+                    user_content=_batch_judge_prompt(batch),
+                    system_content=_BATCH_JUDGE_SYSTEM_PROMPT,
+                    profile="judge_batch",
+                    max_tokens=JUDGE_MAX_TOKENS + JUDGE_BATCH_TOKENS_PER_CLAIM * len(batch),
+                    # Only stop reading early once every claim has an entry
+                    validate_json=lambda data: len(_batch_entries(data)) >= len(batch),
+                )
+            results = _parse_batch_judgements(batch, raw)
+        except Exception:
+            pass
+
+    for index, claim, evidence_context in batch:
+        if index not in results:
+            metrics.incr("fact_checker_judge_batch_fallbacks_total")
+            try:
+                results[index] = _judge_claim(claim, evidence_context)
+            except Exception as e:
+                results[index] = _failed_result(claim, e)
+    return results
+
+
+def _failed_result(claim: str, e: Exception) -> ClaimResult:
+    metrics.incr("fact_checker_claim_failures_total", error=type(e).__name__)
+    return ClaimResult(
+        claim=claim,
+        verdict="uncertain",
+        reason="Fact-check failed for this claim.",
+        error=f"{type(e).__name__}: {e}",
+    )
+
+
+def _safe_fact_check(
+    claim: str,
+    search_results: Optional[list[dict]] = None,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    budget: Optional[TierBudget] = None,
+) -> ClaimResult:
+    """Check one claim, turning any exception into an "uncertain" result."""
+    try:
+        return fact_check_single_claim(claim, use_cache=use_cache, search_results=search_results, budget=budget)
+    except Exception as e:
+        return _failed_result(claim, e)
+
+
+async def _asafe_fact_check(claim: str, budget: Optional[TierBudget] = None) -> ClaimResult:
+    try:
+        return await afact_check_single_claim(claim, budget=budget)
+    except Exception as e:
+        return _failed_result(claim, e)
+
+
+def _traced(fn: Callable, *args):
+    """Run fn(*args) in its own trace; return (value, timings)."""
+    with trace() as timings:
+        value = fn(*args)
+    return value, timings
+
+
+def _timed_fact_check(
+    claim: str,
+    search_results: Optional[list[dict]] = None,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    budget: Optional[TierBudget] = None,
+) -> tuple[ClaimResult, float]:
+    start = time.perf_counter()
+    result = _safe_fact_check(claim, search_results, use_cache, budget)
+    return result, time.perf_counter() - start
+
+
+def _merge_timings(timings: dict[str, float], shared: dict[str, float]) -> dict[str, float]:
+    """Add the stages of a step shared by several claims (a batched call) to one claim's timings."""
+    for stage, seconds in shared.items():
+        if stage != "total":
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    return timings
+
+
+def _prefetch_search(
+    claims: list[str],
+    indices: list[int],
+    tier: VerificationTier = STANDARD_TIER,
+) -> tuple[dict[int, list[dict]], dict[str, float]]:
+    """Search for claims[i] for every i in indices with batched requests, sized for tier.
+
+    Returns (claim index -> search results, timings of the shared search).
+    Claims that are missing were not covered and get searched on their own.
+    """
+    if len(indices) < 2:
+        return {}, {}
+    try:
+        with trace() as timings:
+            with span("search_batch"):
+                found = search_web_batched(
+                    [claims[i] for i in indices],
+                    num=tier.search_results,
+                    mode=tier.search_mode,
+                    excerpt_chars=tier.excerpt_chars,
+                )
+    except Exception:
+        return {}, {}
+    return {indices[n]: results for n, results in found.items()}, timings
+
+
+def _iter_prefetched(
+    claims: list[str],
+    max_workers: int,
+    use_cache: bool,
+    start: float,
+    budget: Optional[TierBudget] = None,
+) -> Iterator[ClaimUpdate]:
+    """Check claims concurrently after fetching their evidence with batched searches.
+
+    With a budget, the batched searches are sized for the first tier.
+    """
+    total = len(claims)
+    pending = []
+    for i, claim in enumerate(claims):
+        cached = _cached_verdict(claim, budget) if use_cache else None
+        if cached is not None:
+            elapsed = time.perf_counter() - start
+            yield ClaimUpdate(index=i, total=total, result=_finish_trace(cached, {}), duration=elapsed, elapsed=elapsed)
+        else:
+            pending.append(i)
+
+    prefetched, search_timings = _prefetch_search(claims, pending, budget.tiers[0] if budget else STANDARD_TIER)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))))
+    check = with_request_context(_timed_fact_check)
+    try:
+        # The verdict cache was consulted above; results are stored here as they finish
+        futures = {
+            pool.submit(check, claims[i], prefetched.get(i), False, budget): i for i in pending
+        }
+        for future in as_completed(futures):
+            result, duration = future.result()
+            if use_cache:
+                _remember_verdict(result, budget)
+            _merge_timings(result.timings, search_timings)
+            if result.timings and search_timings:
+                result.timings["total"] += search_timings["total"]
+            yield ClaimUpdate(
+                index=futures[future],
+                total=total,
+                result=result,
+                duration=duration,
+                elapsed=time.perf_counter() - start,
+            )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_batched(
+    claims: list[str],
+    max_workers: int,
+    use_cache: bool,
+    start: float,
+    batch_search: bool = False,
+    budget: Optional[TierBudget] = None,
+) -> Iterator[ClaimUpdate]:
+    """Gather evidence per claim, then judge claims in batches.
+
+    With a budget, the batched judging is the first tier's pass; claims it
+    leaves uncertain or unparsed are escalated one by one to the later tiers.
+    """
+    total = len(claims)
+
+    # Claims finish together with their judge batch, so duration is time since start
+    def update(i: int, result: ClaimResult) -> ClaimUpdate:
+        elapsed = time.perf_counter() - start
+        return ClaimUpdate(index=i, total=total, result=result, duration=elapsed, elapsed=elapsed)
+
+    pending = []
+    for i, claim in enumerate(claims):
+        cached = _cached_verdict(claim, budget) if use_cache else None
+        if cached is not None:
+            yield update(i, _finish_trace(cached, {}))
+        else:
+            pending.append(i)
+
+    first_tier = budget.tiers[0] if budget else STANDARD_TIER
+    first_pass = [i for i in pending if budget is None or budget.spend(first_tier)]
+    prefetched, search_timings = _prefetch_search(claims, first_pass, first_tier) if batch_search else ({}, {})
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    traced = with_request_context(_traced)
+    try:
+        # Claims escalated past the batched pass, checked on their own
+        escalations = {
+            pool.submit(traced, _check_tiers, claims[i], budget, budget.tiers[1:]): i
+            for i in pending
+            if i not in first_pass
+        }
+        futures = {
+            pool.submit(traced, _gather_evidence, claims[i], prefetched.get(i), first_tier): i for i in first_pass
+        }
+        evidence = []
+        evidence_timings = {}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                evidence_context, timings = future.result()
+                evidence_timings[i] = _merge_timings(timings, search_timings)
+                evidence.append((i, claims[i], evidence_context))
+            except Exception as e:
+                yield update(i, _finish_trace(_failed_result(claims[i], e), {}))
+        evidence.sort()
+
+        batch_futures = [
+            pool.submit(traced, _judge_batch, batch) for batch in _plan_judge_batches(evidence)
+        ]
+        for future in as_completed(batch_futures):
+            batch_results, batch_timings = future.result()
+            for i, result in sorted(batch_results.items()):
+                # Judge stages are shared by every claim in the batch
+                timings = _merge_timings(dict(evidence_timings[i]), batch_timings)
+                if budget is not None:
+                    result.tier = first_tier.name
+                    metrics.incr("fact_checker_tier_checks_total", tier=first_tier.name, verdict=result.verdict)
+                    if _needs_escalation(result):
+                        evidence_timings[i] = timings
+                        escalations[pool.submit(traced, _check_tiers, claims[i], budget, budget.tiers[1:], result)] = i
+                        continue
+                if use_cache:
+                    _remember_verdict(result, budget)
+                timings["total"] = time.perf_counter() - start
+                yield update(i, _finish_trace(result, timings))
+
+        for future in as_completed(escalations):
+            i = escalations[future]
+            try:
+                result, timings = future.result()
+                timings = _merge_timings(timings, evidence_timings.get(i, {}))
+            except Exception as e:
+                result, timings = _failed_result(claims[i], e), {}
+            if use_cache:
+                _remember_verdict(result, budget)
+            timings["total"] = time.perf_counter() - start
+            yield update(i, _finish_trace(result, timings))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_fact_check_claims(
+    claims: list[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    documents: int = 1,
+) -> Iterator[ClaimUpdate]:
+    """Fact-check claims concurrently, yielding each ClaimUpdate as soon as it is ready.
+
+    Updates arrive in completion order; use ClaimUpdate.index to place them.
+    Closing the generator early cancels claims that have not started yet.
+
+    With batch_search, evidence for all claims is searched up front with as
+    few search requests as possible (see search_web_batched); claims the
+    batched search does not cover well are searched individually.
+
+    With tiered, every claim gets a cheap first pass and only the ones it
+    leaves uncertain are checked again in depth, within the per-document
+    budgets of VERIFICATION_TIERS times documents, the number of documents
+    the claims come from.
+
+    With use_cache off, the verdict cache is neither read nor written.
+    """
+    start = time.perf_counter()
+    budget = TierBudget(documents=documents) if tiered else None
+    if batch_judge and len(claims) > 1:
+        yield from _iter_batched(claims, max_workers, use_cache, start, batch_search, budget)
+        return
+    if batch_search and len(claims) > 1:
+        yield from _iter_prefetched(claims, max_workers, use_cache, start, budget)
+        return
+
+    total = len(claims)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)))
+    check = with_request_context(_timed_fact_check)
+    try:
+        futures = {
+            pool.submit(check, claim, None, use_cache, budget): i
+            for i, claim in enumerate(claims)
+        }
+        for future in as_completed(futures):
+            result, duration = future.result()
+            yield ClaimUpdate(
+                index=futures[future],
+                total=total,
+                result=result,
+                duration=duration,
+                elapsed=time.perf_counter() - start,
+            )
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect(
+    updates: Iterator[ClaimUpdate],
+    claims: list[str],
+    on_progress: Optional[Callable[[str, int, int], None]],
+) -> list[ClaimResult]:
+    results: list[Optional[ClaimResult]] = [None] * len(claims)
+    for done, update in enumerate(updates):
+        results[update.index] = update.result
+        if on_progress:
+            on_progress(f"Checked claim {done + 1}/{update.total}: {update.result.claim}", done, update.total)
+    return results
+
+
+def fact_check_claims_batched(
+    claims: list[str],
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    use_cache: bool = VERDICT_CACHE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> list[ClaimResult]:
+    """Fact-check claims, judging several claims per LLM call.
+
+    Evidence is searched per claim (up to max_workers at a time), or with
+    batched searches when batch_search is set, then claims are packed into
+    as few judge prompts as the JUDGE_BATCH_MAX_CHARS budget allows. With
+    tiered, that is the fast pass, and uncertain claims are escalated one by one.
+    on_progress is called from the calling thread as each claim's verdict
+    becomes final.
+    """
+    budget = TierBudget() if tiered else None
+    updates = _iter_batched(claims, max_workers, use_cache, time.perf_counter(), batch_search, budget)
+    return _collect(updates, claims, on_progress)
+
+
+def fact_check_claims(
+    claims: list[str],
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> list[ClaimResult]:
+    """Fact-check a list of claims, up to max_workers at a time.
+
+    With batch_judge, several claims share one judge call; see
+    fact_check_claims_batched. With batch_search, several claims share one
+    search request, and with tiered only uncertain claims get a deep check;
+    see iter_fact_check_claims.
+
+    Results are returned in the same order as claims. A claim that raises is
+    reported as "uncertain" with its error set instead of aborting the batch.
+    LLM calls from all workers share the Cerebras key pool and its rate limiters.
+
+    With max_workers <= 1, on_progress(message, current_index, total_claims) is
+    called before each claim is checked. Otherwise it is called from the calling
+    thread as each claim finishes, so UI callbacks stay on the caller's thread.
+    """
+    if batch_judge and len(claims) > 1:
+        return fact_check_claims_batched(
+            claims, on_progress=on_progress, max_workers=max_workers, batch_search=batch_search, tiered=tiered
+        )
+
+    total = len(claims)
+    if (max_workers <= 1 and not batch_search) or total <= 1:
+        budget = TierBudget() if tiered else None
+        results = []
+        for i, claim in enumerate(claims):
+            if on_progress:
+                on_progress(f"Checking claim {i + 1}/{total}: {claim}", i, total)
+            results.append(_safe_fact_check(claim, budget=budget))
+        return results
+
+    updates = iter_fact_check_claims(claims, max_workers=max_workers, batch_search=batch_search, tiered=tiered)
+    return _collect(updates, claims, on_progress)
+
+
 def fact_check_text(
     text: str,
     max_claims: int = 6,
     on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
 ) -> list[ClaimResult]:
     """Full pipeline: extract claims from text, then fact-check each one.
 
-    on_progress(message, current_index, total_claims) is called before each claim
-    is checked, allowing the caller to display progress.
+    Claims are checked concurrently (see fact_check_claims for how
+    on_progress(message, current_index, total_claims) is reported).
     """
     claims = extract_claims_from_text(text, max_claims=max_claims)
     if not claims:
         return []
 
-    results = []
-    for i, claim in enumerate(claims):
-        if on_progress:
-            on_progress(f"Checking claim {i + 1}/{len(claims)}: {claim}", i, len(claims))
-        result = fact_check_single_claim(claim)
-        results.append(result)
-
-    return results
+    return fact_check_claims(
+        claims,
+        on_progress=on_progress,
+        max_workers=max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+    )
 
 
 def fact_check_url(
     url: str,
     max_claims: int = 6,
     on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
 ) -> list[ClaimResult]:
     """Full pipeline: extract claims from a URL, then fact-check each one."""
     claims = extract_claims_from_url(url, max_claims=max_claims)
     if not claims:
         return []
 
-    results = []
-    for i, claim in enumerate(claims):
-        if on_progress:
-            on_progress(f"Checking claim {i + 1}/{len(claims)}: {claim}", i, len(claims))
-        result = fact_check_single_claim(claim)
-        results.append(result)
+    return fact_check_claims(
+        claims,
+        on_progress=on_progress,
+        max_workers=max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+    )
+
+
+def iter_fact_check_text(
+    text: str,
+    max_claims: int = 6,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> Iterator[ClaimUpdate]:
+    """Streaming version of fact_check_text: yields each ClaimUpdate as it completes."""
+    claims = extract_claims_from_text(text, max_claims=max_claims)
+    yield from iter_fact_check_claims(
+        claims, max_workers=max_workers, batch_judge=batch_judge, batch_search=batch_search, tiered=tiered
+    )
+
+
+def iter_fact_check_url(
+    url: str,
+    max_claims: int = 6,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> Iterator[ClaimUpdate]:
+    """Streaming version of fact_check_url: yields each ClaimUpdate as it completes."""
+    claims = extract_claims_from_url(url, max_claims=max_claims)
+    yield from iter_fact_check_claims(
+        claims, max_workers=max_workers, batch_judge=batch_judge, batch_search=batch_search, tiered=tiered
+    )
+
+
+async def aiter_fact_check_claims(
+    claims: list[str],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> AsyncIterator[ClaimUpdate]:
+    """Async version of iter_fact_check_claims.
+
+    Up to max_workers claims are in flight at once on the running event loop.
+    """
+    import asyncio  # already loaded by whoever runs the event loop
 
+    start = time.perf_counter()
+    total = len(claims)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    budget = TierBudget() if tiered else None
+
+    async def check(i: int) -> ClaimUpdate:
+        async with semaphore:
+            claim_start = time.perf_counter()
+            result = await _asafe_fact_check(claims[i], budget)
+            now = time.perf_counter()
+            return ClaimUpdate(
+                index=i, total=total, result=result, duration=now - claim_start, elapsed=now - start
+            )
+
+    tasks = [asyncio.ensure_future(check(i)) for i in range(total)]
+    try:
+        for next_update in asyncio.as_completed(tasks):
+            yield await next_update
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def aiter_fact_check_text(
+    text: str,
+    max_claims: int = 6,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> AsyncIterator[ClaimUpdate]:
+    """Async streaming version of fact_check_text."""
+    claims = await aextract_claims_from_text(text, max_claims=max_claims)
+    async for update in aiter_fact_check_claims(claims, max_workers=max_workers, tiered=tiered):
+        yield update
+
+
+async def aiter_fact_check_url(
+    url: str,
+    max_claims: int = 6,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> AsyncIterator[ClaimUpdate]:
+    """Async streaming version of fact_check_url."""
+    claims = await aextract_claims_from_url(url, max_claims=max_claims)
+    async for update in aiter_fact_check_claims(claims, max_workers=max_workers, tiered=tiered):
+        yield update
+
+
+async def afact_check_claims(
+    claims: list[str],
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> list[ClaimResult]:
+    """Async version of fact_check_claims.
+
+    Up to max_workers claims are in flight at once on the running event loop.
+    on_progress is called as each claim finishes.
+    """
+    results: list[Optional[ClaimResult]] = [None] * len(claims)
+    done = 0
+    async for update in aiter_fact_check_claims(claims, max_workers=max_workers, tiered=tiered):
+        results[update.index] = update.result
+        if on_progress:
+            on_progress(f"Checked claim {done + 1}/{update.total}: {update.result.claim}", done, update.total)
+        done += 1
     return results
+
+
+async def afact_check_text(
+    text: str,
+    max_claims: int = 6,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> list[ClaimResult]:
+    """Async version of fact_check_text."""
+    claims = await aextract_claims_from_text(text, max_claims=max_claims)
+    if not claims:
+        return []
+
+    return await afact_check_claims(claims, on_progress=on_progress, max_workers=max_workers, tiered=tiered)
+
+
+async def afact_check_url(
+    url: str,
+    max_claims: int = 6,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+) -> list[ClaimResult]:
+    """Async version of fact_check_url."""
+    claims = await aextract_claims_from_url(url, max_claims=max_claims)
+    if not claims:
+        return []
+
+    return await afact_check_claims(claims, on_progress=on_progress, max_workers=max_workers, tiered=tiered)
@@ -1,14 +1,21 @@
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
-from bs4 import BeautifulSoup
+from .config import EXTRACTION_CHUNK_CHARS, EXTRACTION_CHUNK_OVERLAP, EXTRACTION_MAX_WORKERS
+from .fetch import afetch_page, extract_main_text, fetch_page
+from .llm import acall_cerebras_chat, call_cerebras_chat, strip_code_fences
+from .metrics import span
+from .scheduler import with_request_context
+from .similarity import claim_signature, is_near_duplicate
 
-from .llm import call_cerebras_chat
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
 
+# Claims from different chunks at least this similar are merged
+_DUPLICATE_CLAIM_SIMILARITY = 0.7
 
-def extract_claims_from_text(text: str, max_claims: int = 8) -> list[str]:
-    """Use Cerebras LLM to extract atomic factual claims from text."""
+
+def _extraction_prompts(text: str, max_claims: int) -> tuple[str, str]:
     system_prompt = (
         "You are an information extraction assistant.\n"
         f"From the user's text, extract up to {max_claims} atomic factual claims.\n"
@@ -22,40 +29,222 @@ def extract_claims_from_text(text: str, max_claims: int = 8) -> list[str]:
     )
 
     user_prompt = f"Text:\n\n{text}\n\nExtract up to {max_claims} factual claims."
+    return system_prompt, user_prompt
+
+
+def _is_claims_answer(data) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("claims"), list)
 
-    raw = call_cerebras_chat(user_content=user_prompt, system_content=system_prompt)
-    raw = raw.strip()
 
-    # Strip markdown code fences if present
-    raw = re.sub(r"^\s*```(?:json)?\s*", "", raw, flags=re.IGNORECASE)
-    raw = re.sub(r"\s*```\s*$", "", raw)
+class ClaimExtractionError(ValueError):
+    """Raised with raise_errors when the extraction answer is not a parseable claim list."""
 
+
+def _parse_claims(raw: str, max_claims: int, raise_errors: bool = False) -> list[str]:
     try:
-        data = json.loads(raw)
+        data = json.loads(strip_code_fences(raw))
         claims = data.get("claims", [])
         claims = [c.strip() for c in claims if isinstance(c, str) and c.strip()]
         return claims[:max_claims]
-    except Exception:
+    except Exception as e:
+        if raise_errors:
+            raise ClaimExtractionError(f"Could not parse extracted claims: {raw[:200]!r}") from e
         return []
 
 
-def extract_claims_from_url(url: str, max_claims: int = 8) -> list[str]:
-    """Fetch a URL's content and extract atomic factual claims from it."""
-    try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+def split_paragraphs(text: str) -> list[str]:
+    """The non-empty paragraphs of text (separated by blank lines), stripped."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def chunk_text(
+    text: str,
+    max_chars: int = EXTRACTION_CHUNK_CHARS,
+    overlap_chars: int = EXTRACTION_CHUNK_OVERLAP,
+) -> list[str]:
+    """Split text into chunks of at most max_chars at paragraph or sentence boundaries.
+
+    Each chunk after the first starts with up to overlap_chars of trailing text
+    from the previous chunk, so claims that straddle a boundary are not lost.
+    """
+    units = []
+    for paragraph in split_paragraphs(text):
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END_RE.split(paragraph):
+            # A single sentence longer than a chunk is hard-split as a last resort
+            units.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for unit in units:
+        if current and size + len(unit) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            overlap: list[str] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                if overlap_size + len(previous) > overlap_chars:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += len(previous) + 2
+            current, size = overlap, overlap_size
+        current.append(unit)
+        size += len(unit) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _claim_specificity(claim: str) -> int:
+    """Rough checkability score: numbers and named entities make a claim easier to verify."""
+    digits = len(re.findall(r"\d+", claim))
+    names = len(re.findall(r"(?<!^)(?<![.!?] )\b[A-Z][a-z]+", claim))
+    return 2 * digits + names
+
+
+def merge_claims(chunk_claims: list[list[str]], max_claims: int) -> list[str]:
+    """Merge claim lists (one per chunk or paragraph): drop near-duplicates, rank, keep max_claims.
+
+    Claims found in more lists rank first, then more specific claims; the
+    chosen claims are returned in document order.
+    """
+    merged: list[dict] = []
+    for claims in chunk_claims:
+        for claim in claims:
+            normalized, signature, terms = claim_signature(claim)
+            for existing in merged:
+                if is_near_duplicate(
+                    normalized, signature, terms,
+                    existing["normalized"], existing["signature"], existing["terms"],
+                    _DUPLICATE_CLAIM_SIMILARITY,
+                ):
+                    existing["count"] += 1
+                    break
+            else:
+                merged.append({
+                    "claim": claim,
+                    "normalized": normalized,
+                    "signature": signature,
+                    "terms": terms,
+                    "count": 1,
+                    "position": len(merged),
+                })
+
+    ranked = sorted(merged, key=lambda m: (-m["count"], -_claim_specificity(m["claim"]), m["position"]))
+    chosen = sorted(ranked[:max_claims], key=lambda m: m["position"])
+    return [m["claim"] for m in chosen]
+
+
+def _extract_from_chunk(text: str, max_claims: int, raise_errors: bool = False) -> list[str]:
+    system_prompt, user_prompt = _extraction_prompts(text, max_claims)
+    with span("extract"):
+        raw = call_cerebras_chat(
+            user_content=user_prompt,
+            system_content=system_prompt,
+            profile="extract",
+            validate_json=_is_claims_answer,
+        )
+    return _parse_claims(raw, max_claims, raise_errors)
+
+
+async def _aextract_from_chunk(text: str, max_claims: int, raise_errors: bool = False) -> list[str]:
+    system_prompt, user_prompt = _extraction_prompts(text, max_claims)
+    with span("extract"):
+        raw = await acall_cerebras_chat(
+            user_content=user_prompt,
+            system_content=system_prompt,
+            profile="extract",
+            validate_json=_is_claims_answer,
+        )
+    return _parse_claims(raw, max_claims, raise_errors)
+
+
+def extract_claims_from_text(
+    text: str,
+    max_claims: int = 8,
+    max_workers: int = EXTRACTION_MAX_WORKERS,
+    raise_errors: bool = False,
+) -> list[str]:
+    """Use Cerebras LLM to extract atomic factual claims from text.
 
-        main_content = soup.find("article") or soup.find("main")
-        if main_content:
-            main_text = " ".join(p.get_text() for p in main_content.find_all("p"))
-        else:
-            elements = soup.find_all(["p", "h1", "h2", "h3"])
-            main_text = " ".join(elem.get_text() for elem in elements)
+    Text longer than EXTRACTION_CHUNK_CHARS is split into overlapping chunks
+    that are extracted concurrently (up to max_workers at a time), then the
+    candidates are deduplicated and ranked down to max_claims. A chunk whose
+    answer cannot be parsed (malformed or truncated) gives no claims, or with
+    raise_errors raises ClaimExtractionError, for callers that store what
+    was extracted.
+    """
+    chunks = chunk_text(text)
+    if len(chunks) <= 1:
+        return _extract_from_chunk(text, max_claims, raise_errors)
 
-        if not main_text or len(main_text.strip()) < 100:
-            return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        extract = with_request_context(lambda chunk: _extract_from_chunk(chunk, max_claims, raise_errors))
+        chunk_claims = list(pool.map(extract, chunks))
+    return merge_claims(chunk_claims, max_claims)
 
-        return extract_claims_from_text(main_text, max_claims=max_claims)
+
+async def aextract_claims_from_text(
+    text: str,
+    max_claims: int = 8,
+    max_workers: int = EXTRACTION_MAX_WORKERS,
+    raise_errors: bool = False,
+) -> list[str]:
+    """Async version of extract_claims_from_text."""
+    import asyncio  # already loaded by whoever runs the event loop
+
+    chunks = chunk_text(text)
+    if len(chunks) <= 1:
+        return await _aextract_from_chunk(text, max_claims, raise_errors)
+
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def extract(chunk: str) -> list[str]:
+        async with semaphore:
+            return await _aextract_from_chunk(chunk, max_claims, raise_errors)
+
+    chunk_claims = await asyncio.gather(*(extract(chunk) for chunk in chunks))
+    return merge_claims(list(chunk_claims), max_claims)
+
+
+def extract_claims_from_url(url: str, max_claims: int = 8, raise_errors: bool = False) -> list[str]:
+    """Fetch a URL's content and extract atomic factual claims from it.
+
+    A page that cannot be fetched gives no claims, and so does an extraction
+    answer that cannot be parsed. With raise_errors they raise instead (the
+    requests exception, or ClaimExtractionError), for callers that report
+    failures.
+    """
+    import requests
+
+    try:
+        main_text = extract_main_text(fetch_page(url))
     except requests.exceptions.RequestException:
+        if raise_errors:
+            raise
         return []
+
+    if not main_text or len(main_text.strip()) < 100:
+        return []
+
+    return extract_claims_from_text(main_text, max_claims=max_claims, raise_errors=raise_errors)
+
+
+async def aextract_claims_from_url(url: str, max_claims: int = 8, raise_errors: bool = False) -> list[str]:
+    """Async version of extract_claims_from_url, fetching the page with httpx."""
+    import httpx
+
+    try:
+        html = await afetch_page(url)
+    except httpx.HTTPError:
+        if raise_errors:
+            raise
+        return []
+
+    main_text = extract_main_text(html)
+    if not main_text or len(main_text.strip()) < 100:
+        return []
+
+    return await aextract_claims_from_text(main_text, max_claims=max_claims, raise_errors=raise_errors)
@@ -1,28 +1,92 @@
-from cerebras.cloud.sdk import Cerebras
-from parallel import Parallel
-from .config import CEREBRAS_API_KEY, PARALLEL_API_KEY
+import threading
+from typing import TYPE_CHECKING
 
-_cerebras_client = None
-_parallel_client = None
+from .config import CEREBRAS_REQUESTS_PER_MIN, PARALLEL_REQUESTS_PER_MIN, get_api_keys
+from .key_pool import ApiKey, KeyPool
 
+# The SDKs are imported on first use so importing the package stays cheap.
+# Their built-in retries are off: resilience.py retries in step with the rate limiter.
+if TYPE_CHECKING:
+    from cerebras.cloud.sdk import AsyncCerebras, Cerebras
+    from parallel import AsyncParallel, Parallel
 
-def get_cerebras_client() -> Cerebras:
-    global _cerebras_client
-    if _cerebras_client is None:
-        if not CEREBRAS_API_KEY:
-            raise RuntimeError(
-                "CEREBRAS_API_KEY not set. Copy .env.example to .env and add your key."
+_cerebras_pool = None
+_parallel_pool = None
+_pools_lock = threading.Lock()
+
+
+def _require_keys(name: str) -> list[str]:
+    keys = get_api_keys(name)
+    if not keys:
+        raise RuntimeError(
+            f"{name} not set. Copy .env.example to .env and add your key."
+        )
+    return keys
+
+
+def _make_cerebras(key: ApiKey) -> "Cerebras":
+    from cerebras.cloud.sdk import Cerebras
+    return Cerebras(api_key=key.api_key, base_url=key.base_url, max_retries=0)
+
+
+def _make_async_cerebras(key: ApiKey) -> "AsyncCerebras":
+    from cerebras.cloud.sdk import AsyncCerebras
+    return AsyncCerebras(api_key=key.api_key, base_url=key.base_url, max_retries=0)
+
+
+def _make_parallel(key: ApiKey) -> "Parallel":
+    from parallel import Parallel
+    return Parallel(api_key=key.api_key, base_url=key.base_url, max_retries=0)
+
+
+def _make_async_parallel(key: ApiKey) -> "AsyncParallel":
+    from parallel import AsyncParallel
+    return AsyncParallel(api_key=key.api_key, base_url=key.base_url, max_retries=0)
+
+
+def get_cerebras_pool() -> KeyPool:
+    """Pool of Cerebras keys (CEREBRAS_API_KEYS or CEREBRAS_API_KEY), each with its own rate limiter."""
+    global _cerebras_pool
+    with _pools_lock:
+        if _cerebras_pool is None:
+            _cerebras_pool = KeyPool.from_entries(
+                "cerebras",
+                _require_keys("CEREBRAS_API_KEY"),
+                make_client=_make_cerebras,
+                make_async_client=_make_async_cerebras,
+                requests_per_minute=CEREBRAS_REQUESTS_PER_MIN,
             )
-        _cerebras_client = Cerebras(api_key=CEREBRAS_API_KEY)
-    return _cerebras_client
+    return _cerebras_pool
 
 
-def get_parallel_client() -> Parallel:
-    global _parallel_client
-    if _parallel_client is None:
-        if not PARALLEL_API_KEY:
-            raise RuntimeError(
-                "PARALLEL_API_KEY not set. Copy .env.example to .env and add your key."
+def get_parallel_pool() -> KeyPool:
+    """Pool of Parallel keys (PARALLEL_API_KEYS or PARALLEL_API_KEY), rate-limited if PARALLEL_REQUESTS_PER_MIN is set."""
+    global _parallel_pool
+    with _pools_lock:
+        if _parallel_pool is None:
+            _parallel_pool = KeyPool.from_entries(
+                "parallel",
+                _require_keys("PARALLEL_API_KEY"),
+                make_client=_make_parallel,
+                make_async_client=_make_async_parallel,
+                requests_per_minute=PARALLEL_REQUESTS_PER_MIN,
             )
-        _parallel_client = Parallel(api_key=PARALLEL_API_KEY)
-    return _parallel_client
+    return _parallel_pool
+
+
+def get_cerebras_client() -> "Cerebras":
+    """Client for the first configured Cerebras key (pipeline calls go through the pool)."""
+    return get_cerebras_pool().keys[0].client
+
+
+def get_parallel_client() -> "Parallel":
+    """Client for the first configured Parallel key (pipeline calls go through the pool)."""
+    return get_parallel_pool().keys[0].client
+
+
+def get_async_cerebras_client() -> "AsyncCerebras":
+    return get_cerebras_pool().keys[0].async_client
+
+
+def get_async_parallel_client() -> "AsyncParallel":
+    return get_parallel_pool().keys[0].async_client
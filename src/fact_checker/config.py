@@ -1,21 +1,50 @@
+import functools
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Secrets are resolved on first use (see get_secret), not at import time
+_SECRETS = ("CEREBRAS_API_KEY", "PARALLEL_API_KEY", "CEREBRAS_API_KEYS", "PARALLEL_API_KEYS")
 
-def _get_secret(key: str) -> str | None:
-    """Read a secret from Streamlit Cloud secrets (if available), else env vars."""
-    try:
-        import streamlit as st
-        return st.secrets.get(key)
-    except Exception:
-        pass
+
+@functools.lru_cache(maxsize=None)
+def get_secret(key: str) -> str | None:
+    """Read a secret from Streamlit Cloud secrets (when running under Streamlit), else env vars.
+
+    Streamlit is only consulted if the app already imported it, so the CLI and
+    batch workers never pay for loading it.
+    """
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        try:
+            value = st.secrets.get(key)
+            if value:
+                return value
+        except Exception:
+            pass
     return os.getenv(key)
 
 
-CEREBRAS_API_KEY = _get_secret("CEREBRAS_API_KEY")
-PARALLEL_API_KEY = _get_secret("PARALLEL_API_KEY")
+def get_api_keys(name: str) -> list[str]:
+    """All keys for a backend: the comma-separated <name>S list (e.g. CEREBRAS_API_KEYS), else <name>.
+
+    An entry may be "key@base_url" to send that key's requests to another endpoint.
+    """
+    keys = get_secret(name + "S")
+    if keys:
+        return [k.strip() for k in keys.split(",") if k.strip()]
+    key = get_secret(name)
+    return [key] if key else []
+
+
+def __getattr__(name: str):
+    # Keeps `config.CEREBRAS_API_KEY` working without resolving secrets at import
+    if name in _SECRETS:
+        return get_secret(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Model configuration for zai-glm-4.7 on Cerebras
 CEREBRAS_MODEL_NAME = "zai-glm-4.7"
@@ -23,5 +52,145 @@ DEFAULT_TEMPERATURE = 1.0
 DEFAULT_TOP_P = 0.95
 DEFAULT_MAX_TOKENS = 4096
 
+# Per-call-type generation limits and sampling. Reasoning tokens count toward
+# max_tokens, so the limits leave room for them; streamed answers stop early anyway
+EXTRACT_MAX_TOKENS = int(os.getenv("EXTRACT_MAX_TOKENS", 8192))
+EXTRACT_TEMPERATURE = float(os.getenv("EXTRACT_TEMPERATURE", 0.3))
+JUDGE_MAX_TOKENS = int(os.getenv("JUDGE_MAX_TOKENS", 4096))
+JUDGE_TEMPERATURE = float(os.getenv("JUDGE_TEMPERATURE", 0.2))
+# Extra tokens a batched judge call gets for each claim in the batch
+JUDGE_BATCH_TOKENS_PER_CLAIM = int(os.getenv("JUDGE_BATCH_TOKENS_PER_CLAIM", 300))
+# Stream JSON answers and stop reading as soon as a complete, valid object has arrived
+LLM_STREAMING_ENABLED = os.getenv("LLM_STREAMING_ENABLED", "1") != "0"
+
 # Free Tier rate limits
 FREE_TIER_REQUESTS_PER_MIN = 10
+
+# Requests/min actually allowed for the configured key (set higher on a paid tier)
+CEREBRAS_REQUESTS_PER_MIN = int(os.getenv("CEREBRAS_REQUESTS_PER_MIN", FREE_TIER_REQUESTS_PER_MIN))
+
+# Optional SQLite file used to share the rate limit across processes on one box
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH")
+
+# Resilience for Cerebras/Parallel calls: per-attempt timeouts, an overall
+# deadline, jittered exponential backoff, circuit breaking and hedging
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+SEARCH_TIMEOUT_SECONDS = float(os.getenv("SEARCH_TIMEOUT_SECONDS", 30))
+CALL_DEADLINE_SECONDS = float(os.getenv("CALL_DEADLINE_SECONDS", 180))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", 4))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", 1.0))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", 30))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+# Send a duplicate request if the first has not answered after this many seconds (0 = off)
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", 0))
+SEARCH_HEDGE_AFTER_SECONDS = float(os.getenv("SEARCH_HEDGE_AFTER_SECONDS", 0))
+
+# Requests/min allowed per Parallel key (0 = no limit)
+PARALLEL_REQUESTS_PER_MIN = int(os.getenv("PARALLEL_REQUESTS_PER_MIN", 0))
+
+# Request scheduling (see scheduler.py): how long a request of each priority
+# class may wait for its turn before it is shed instead (0 = never shed)
+SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS = float(os.getenv("SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS", 60))
+SCHEDULER_DEFAULT_MAX_WAIT_SECONDS = float(os.getenv("SCHEDULER_DEFAULT_MAX_WAIT_SECONDS", 0))
+SCHEDULER_BATCH_MAX_WAIT_SECONDS = float(os.getenv("SCHEDULER_BATCH_MAX_WAIT_SECONDS", 0))
+
+# API key pools: how long a key rests after a 429 without Retry-After, or after an auth error
+KEY_COOLDOWN_SECONDS = float(os.getenv("KEY_COOLDOWN_SECONDS", 15))
+KEY_DISABLE_SECONDS = float(os.getenv("KEY_DISABLE_SECONDS", 60 * 60))
+
+# Number of claims fact-checked concurrently per document
+DEFAULT_MAX_WORKERS = 4
+
+# Shared job queue for the web app: worker threads, jobs allowed to wait, and how
+# long finished jobs stay available to pages that poll or reload
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", 32))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 60 * 60))
+
+# HTTP API server (api_server.py): open connections (SSE streams included),
+# items per bulk request, and an optional bearer token clients must send
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", 64))
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", 100))
+API_AUTH_TOKEN = os.getenv("API_AUTH_TOKEN")
+
+# Local cache directory for search results and other persisted data
+CACHE_DIR = os.getenv(
+    "FACT_CHECKER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "content-fact-checker"),
+)
+
+# Search results cache (set SEARCH_CACHE_ENABLED=0 to always hit the API)
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "1") != "0"
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", 24 * 60 * 60))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 5000))
+
+# Batched search: several claims per Parallel request, falling back to per-claim searches
+SEARCH_BATCH_ENABLED = os.getenv("SEARCH_BATCH_ENABLED", "0") == "1"
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", 5))
+SEARCH_BATCH_MAX_RESULTS = int(os.getenv("SEARCH_BATCH_MAX_RESULTS", 20))
+SEARCH_BATCH_MIN_RESULTS = int(os.getenv("SEARCH_BATCH_MIN_RESULTS", 2))
+
+# Verdict cache: reuse recent verdicts for the same claim (after normalization), and
+# with VERDICT_CACHE_NEAR_DUPLICATES=1 for near-identical claims with the same key terms
+VERDICT_CACHE_ENABLED = os.getenv("VERDICT_CACHE_ENABLED", "1") != "0"
+VERDICT_CACHE_TTL_SECONDS = int(os.getenv("VERDICT_CACHE_TTL_SECONDS", 12 * 60 * 60))
+VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", 10000))
+VERDICT_CACHE_NEAR_DUPLICATES = os.getenv("VERDICT_CACHE_NEAR_DUPLICATES", "0") == "1"
+VERDICT_CACHE_SIMILARITY = float(os.getenv("VERDICT_CACHE_SIMILARITY", 0.9))
+
+# Incremental URL re-checks: per-URL snapshots of paragraphs, claims and verdicts;
+# a verdict older than RECHECK_FRESHNESS_SECONDS is judged again
+RECHECK_FRESHNESS_SECONDS = int(os.getenv("RECHECK_FRESHNESS_SECONDS", 6 * 60 * 60))
+RECHECK_MAX_SNAPSHOTS = int(os.getenv("RECHECK_MAX_SNAPSHOTS", 1000))
+
+# Result store: past fact-checks kept for the web app's history and search. Set
+# HISTORY_SEARCH_ALL_SESSIONS=1 to let web app users search every session's claims.
+RESULT_STORE_MAX_RUNS = int(os.getenv("RESULT_STORE_MAX_RUNS", 10000))
+HISTORY_SEARCH_ALL_SESSIONS = os.getenv("HISTORY_SEARCH_ALL_SESSIONS", "0") == "1"
+
+# Corpus mode: claims from different documents at least this similar (with the same
+# key terms, see similarity.key_terms) are checked once
+CORPUS_DEDUPE_SIMILARITY = float(os.getenv("CORPUS_DEDUPE_SIMILARITY", 0.9))
+
+# Batched judging: several claims per LLM call, sized by prompt characters
+BATCH_JUDGE_ENABLED = os.getenv("BATCH_JUDGE_ENABLED", "0") == "1"
+JUDGE_BATCH_MAX_CHARS = int(os.getenv("JUDGE_BATCH_MAX_CHARS", 60000))
+JUDGE_BATCH_MAX_CLAIMS = int(os.getenv("JUDGE_BATCH_MAX_CLAIMS", 8))
+
+# Tiered verification: every claim first gets a cheap pass (few, short search
+# results and a small evidence budget); only claims it leaves uncertain or
+# unparsed are escalated to a deep pass (more results, a fuller search mode,
+# more evidence and judge tokens). Each tier's budget is per document: at most
+# MAX_CLAIMS claims (0 = no limit), and none started after MAX_SECONDS (0 = no limit).
+TIERED_VERIFICATION_ENABLED = os.getenv("TIERED_VERIFICATION_ENABLED", "0") == "1"
+FAST_TIER_SEARCH_RESULTS = int(os.getenv("FAST_TIER_SEARCH_RESULTS", 3))
+FAST_TIER_SEARCH_MODE = os.getenv("FAST_TIER_SEARCH_MODE", "agentic")
+FAST_TIER_EXCERPT_CHARS = int(os.getenv("FAST_TIER_EXCERPT_CHARS", 1500))
+FAST_TIER_EVIDENCE_TOKENS = int(os.getenv("FAST_TIER_EVIDENCE_TOKENS", 600))
+FAST_TIER_MAX_CLAIMS = int(os.getenv("FAST_TIER_MAX_CLAIMS", 0))
+FAST_TIER_MAX_SECONDS = float(os.getenv("FAST_TIER_MAX_SECONDS", 0))
+DEEP_TIER_SEARCH_RESULTS = int(os.getenv("DEEP_TIER_SEARCH_RESULTS", 10))
+DEEP_TIER_SEARCH_MODE = os.getenv("DEEP_TIER_SEARCH_MODE", "one-shot")
+DEEP_TIER_EXCERPT_CHARS = int(os.getenv("DEEP_TIER_EXCERPT_CHARS", 8000))
+DEEP_TIER_EVIDENCE_TOKENS = int(os.getenv("DEEP_TIER_EVIDENCE_TOKENS", 4000))
+DEEP_TIER_MAX_CLAIMS = int(os.getenv("DEEP_TIER_MAX_CLAIMS", 3))
+DEEP_TIER_MAX_SECONDS = float(os.getenv("DEEP_TIER_MAX_SECONDS", 90))
+JUDGE_DEEP_MAX_TOKENS = int(os.getenv("JUDGE_DEEP_MAX_TOKENS", 8192))
+
+# Long documents are split into overlapping chunks for claim extraction
+EXTRACTION_CHUNK_CHARS = int(os.getenv("EXTRACTION_CHUNK_CHARS", 12000))
+EXTRACTION_CHUNK_OVERLAP = int(os.getenv("EXTRACTION_CHUNK_OVERLAP", 500))
+EXTRACTION_MAX_WORKERS = int(os.getenv("EXTRACTION_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+
+# Page fetching: body size cap, timeout, and ETag/Last-Modified page cache
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", 2_000_000))
+FETCH_TIMEOUT_SECONDS = float(os.getenv("FETCH_TIMEOUT_SECONDS", 15))
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "1") != "0"
+PAGE_CACHE_TTL_SECONDS = int(os.getenv("PAGE_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", 500))
+
+# Evidence packing for judge prompts: token budget, passage size, cross-source dedupe
+EVIDENCE_MAX_TOKENS = int(os.getenv("EVIDENCE_MAX_TOKENS", 1500))
+EVIDENCE_PASSAGE_CHARS = int(os.getenv("EVIDENCE_PASSAGE_CHARS", 600))
+EVIDENCE_DEDUPE_SIMILARITY = float(os.getenv("EVIDENCE_DEDUPE_SIMILARITY", 0.7))
@@ -0,0 +1,173 @@
+"""Corpus mode: fact-check a set of documents, checking each distinct claim once.
+
+Claims are extracted from every document, near-duplicates across the whole
+corpus are clustered (see similarity.cluster_claims), one representative per
+cluster is searched and judged, and its verdict is mapped back to every
+document that made the claim, keeping each document's own wording.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional
+
+from .batch import BatchItem
+from .checker import ClaimResult, iter_fact_check_claims
+from .claims import extract_claims_from_text, extract_claims_from_url
+from .config import (
+    BATCH_JUDGE_ENABLED,
+    CORPUS_DEDUPE_SIMILARITY,
+    DEFAULT_MAX_WORKERS,
+    SEARCH_BATCH_ENABLED,
+    TIERED_VERIFICATION_ENABLED,
+)
+from .metrics import metrics, span
+from .scheduler import request_context, with_request_context
+from .similarity import cluster_claims
+
+
+@dataclass
+class CorpusClaim:
+    """One claim as made by one document, with the verdict of its cluster."""
+
+    document_id: str
+    position: int  # order of the claim within its document
+    claim: str  # the document's own wording
+    cluster_id: int
+    representative: str  # the claim that was actually checked
+    result: Optional[ClaimResult] = None
+
+
+@dataclass
+class ClaimCluster:
+    id: int
+    representative: str
+    members: list[CorpusClaim] = field(default_factory=list)
+    result: Optional[ClaimResult] = None
+
+    @property
+    def documents(self) -> list[str]:
+        return list(dict.fromkeys(m.document_id for m in self.members))
+
+
+@dataclass
+class CorpusResult:
+    documents: dict[str, list[CorpusClaim]]  # document id -> its claims, in order
+    clusters: list[ClaimCluster]
+    errors: dict[str, str] = field(default_factory=dict)  # document id -> extraction error
+    elapsed: float = 0.0
+
+    @property
+    def claims_extracted(self) -> int:
+        return sum(len(claims) for claims in self.documents.values())
+
+    @property
+    def claims_checked(self) -> int:
+        return len(self.clusters)
+
+
+def _extract(item: BatchItem, max_claims: int) -> list[str]:
+    if item.url:
+        return extract_claims_from_url(item.url, max_claims=max_claims, raise_errors=True)
+    return extract_claims_from_text(item.text, max_claims=max_claims, raise_errors=True)
+
+
+def fact_check_corpus(
+    items: list[BatchItem],
+    max_claims: int = 6,
+    concurrency: int = 4,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    similarity: float = CORPUS_DEDUPE_SIMILARITY,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+) -> CorpusResult:
+    """Fact-check a set of documents, checking near-duplicate claims only once.
+
+    Claims are extracted from `concurrency` documents at a time. Claims from
+    all documents are then clustered at the given MinHash similarity, and
+    only each cluster's representative (its first occurrence) is checked,
+    concurrency * max_workers at a time (the same total as run_batch).
+    Every document's claims get their cluster's verdict; the result keeps the
+    document's wording and records which claim was checked. A document whose
+    claims cannot be extracted, or whose URL cannot be fetched, is listed in
+    errors. With tiered, the tier
+    budgets apply to the corpus as a whole. API requests are sent with
+    "batch" priority.
+
+    on_progress(message, done, total) is called from the calling thread after
+    each document is extracted and each cluster is checked.
+    """
+    with request_context(priority="batch"):
+        return _check_corpus(items, max_claims, concurrency, max_workers, batch_judge, batch_search, tiered,
+                             similarity, on_progress)
+
+
+def _check_corpus(
+    items: list[BatchItem],
+    max_claims: int,
+    concurrency: int,
+    max_workers: int,
+    batch_judge: bool,
+    batch_search: bool,
+    tiered: bool,
+    similarity: float,
+    on_progress: Optional[Callable[[str, int, int], None]],
+) -> CorpusResult:
+    start = time.perf_counter()
+    extracted: dict[str, list[str]] = {}
+    errors: dict[str, str] = {}
+    extract = with_request_context(_extract)
+    with span("corpus_extract"), ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(extract, item, max_claims): item for item in items}
+        for done, future in enumerate(as_completed(futures), 1):
+            item = futures[future]
+            try:
+                extracted[item.id] = future.result()
+            except Exception as e:
+                errors[item.id] = f"{type(e).__name__}: {e}"
+            if on_progress:
+                on_progress(f"Extracted claims from {done}/{len(items)} documents", done, len(items))
+
+    # Keep input order so cluster representatives are deterministic
+    documents = {item.id: [] for item in items if item.id in extracted}
+    occurrences = [
+        (doc_id, position, claim)
+        for doc_id in documents
+        for position, claim in enumerate(extracted[doc_id])
+    ]
+    clusters = []
+    for cluster_id, members in enumerate(cluster_claims([claim for _, _, claim in occurrences], similarity)):
+        representative = occurrences[members[0]][2]
+        cluster = ClaimCluster(id=cluster_id, representative=representative)
+        for index in members:
+            doc_id, position, claim = occurrences[index]
+            cluster.members.append(CorpusClaim(doc_id, position, claim, cluster_id, representative))
+        clusters.append(cluster)
+    metrics.incr("fact_checker_corpus_claims_total", len(clusters), outcome="checked")
+    metrics.incr("fact_checker_corpus_claims_total", len(occurrences) - len(clusters), outcome="deduplicated")
+
+    updates = iter_fact_check_claims(
+        [c.representative for c in clusters],
+        max_workers=max(1, concurrency) * max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+        # The deep tier's allowance is per document, not one for the whole corpus
+        documents=len(documents),
+    )
+    for done, update in enumerate(updates, 1):
+        cluster = clusters[update.index]
+        cluster.result = update.result
+        for member in cluster.members:
+            member.result = replace(update.result, claim=member.claim)
+        if on_progress:
+            on_progress(f"Checked claim {done}/{len(clusters)}: {cluster.representative}", done, len(clusters))
+
+    for cluster in clusters:
+        for member in cluster.members:
+            documents[member.document_id].append(member)
+    for claims in documents.values():
+        claims.sort(key=lambda m: m.position)
+    return CorpusResult(documents=documents, clusters=clusters, errors=errors, elapsed=time.perf_counter() - start)
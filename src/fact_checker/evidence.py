@@ -0,0 +1,185 @@
+"""Relevance-ranked evidence selection for judge prompts.
+
+Search excerpts are split into passages, scored against the claim with BM25,
+de-duplicated across sources with MinHash, and greedily packed into a token
+budget. The judge then sees the most relevant text from every source instead
+of whatever happened to come first.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .config import EVIDENCE_DEDUPE_SIMILARITY, EVIDENCE_MAX_TOKENS, EVIDENCE_PASSAGE_CHARS
+from .metrics import metrics
+from .similarity import minhash_signature, normalize_claim, shingles, signature_similarity
+
+# BM25 parameters (the usual defaults)
+_K1 = 1.5
+_B = 0.75
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "been", "by", "for", "from", "had", "has",
+    "have", "he", "her", "his", "in", "is", "it", "its", "of", "on", "or", "she", "that",
+    "the", "their", "they", "this", "to", "was", "were", "which", "who", "with",
+}
+
+
+@dataclass
+class Passage:
+    source: int  # index into the search results
+    position: int  # order within that source
+    text: str
+    score: float = 0.0
+    # Other sources carrying a near-duplicate of this passage
+    also_in: list[int] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _terms(text: str) -> list[str]:
+    terms = []
+    for word in normalize_claim(text).split():
+        if word in _STOPWORDS or (len(word) < 2 and not word.isdigit()):
+            continue
+        # Crude plural folding so "vaccines" matches "vaccine"
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss") and word.isalpha():
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def split_passages(text: str, max_chars: int = EVIDENCE_PASSAGE_CHARS) -> list[str]:
+    """Split an excerpt into passages of about max_chars at paragraph or sentence boundaries."""
+    passages = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        current = ""
+        for sentence in _SENTENCE_END_RE.split(paragraph):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                passages.append(current)
+                current = ""
+            current = f"{current} {sentence}" if current else sentence
+            while len(current) > max_chars * 2:
+                passages.append(current[:max_chars])
+                current = current[max_chars:]
+        if current:
+            passages.append(current)
+    return passages
+
+
+def score_passages(claim: str, passages: list[Passage]) -> None:
+    """Set each passage's BM25 score against the claim's terms."""
+    query = set(_terms(claim))
+    if not query or not passages:
+        return
+    docs = [Counter(_terms(p.text)) for p in passages]
+    avg_len = sum(sum(d.values()) for d in docs) / len(docs) or 1.0
+    doc_freq = Counter(term for d in docs for term in query if term in d)
+    for passage, doc in zip(passages, docs):
+        length = sum(doc.values())
+        score = 0.0
+        for term in query:
+            tf = doc.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * length / avg_len))
+        passage.score = score
+
+
+def select_passages(
+    claim: str,
+    results: list[dict],
+    max_tokens: int = EVIDENCE_MAX_TOKENS,
+    header_tokens: int = 0,
+    dedupe_similarity: float = EVIDENCE_DEDUPE_SIMILARITY,
+) -> list[Passage]:
+    """Pick the passages that best support judging the claim, within max_tokens.
+
+    Passages are taken in score order; ties go to higher-ranked search
+    results. A near-duplicate of a selected passage is skipped but noted in
+    its also_in list, so corroboration is not lost. header_tokens is charged
+    once for each source that contributes a passage. Passages with no overlap
+    with the claim are dropped unless nothing matches; then passages are
+    taken in search order. The selection is returned in source and document
+    order.
+    """
+    passages = [
+        Passage(source=idx, position=pos, text=text)
+        for idx, r in enumerate(results)
+        for pos, text in enumerate(p for excerpt in r.get("excerpts") or [] for p in split_passages(excerpt))
+    ]
+    score_passages(claim, passages)
+    if any(p.score > 0 for p in passages):
+        candidates = [p for p in passages if p.score > 0]
+        metrics.incr("fact_checker_evidence_passages_total", len(passages) - len(candidates), outcome="irrelevant")
+    else:
+        candidates = passages
+    candidates.sort(key=lambda p: (-p.score, p.source, p.position))
+
+    selected: list[Passage] = []
+    signatures: list[list[int]] = []
+    sources: set[int] = set()
+    used = 0
+    for passage in candidates:
+        cost = estimate_tokens(passage.text) + (0 if passage.source in sources else header_tokens)
+        if used + cost > max_tokens:
+            metrics.incr("fact_checker_evidence_passages_total", outcome="over_budget")
+            continue
+        signature = minhash_signature(shingles(normalize_claim(passage.text), k=5))
+        original = next(
+            (p for p, s in zip(selected, signatures) if signature_similarity(signature, s) >= dedupe_similarity),
+            None,
+        )
+        if original is not None:
+            if passage.source != original.source and passage.source not in original.also_in:
+                original.also_in.append(passage.source)
+            metrics.incr("fact_checker_evidence_passages_total", outcome="duplicate")
+            continue
+        selected.append(passage)
+        signatures.append(signature)
+        sources.add(passage.source)
+        used += cost
+        metrics.incr("fact_checker_evidence_passages_total", outcome="selected")
+
+    selected.sort(key=lambda p: (p.source, p.position))
+    return selected
+
+
+def attribute_results(
+    queries: list[str],
+    results: list[dict],
+    per_query: int,
+    min_relative_score: float = 0.3,
+) -> list[list[dict]]:
+    """Assign the results of a multi-query search back to the queries they answer.
+
+    Each result's title and excerpts are scored against every query with BM25;
+    a query gets its best-scoring results (at most per_query) that score at
+    least min_relative_score times its top score. A result may serve several
+    queries, and a query may end up with none.
+    """
+    docs = [
+        Passage(source=idx, position=0, text=" ".join([r.get("title") or ""] + list(r.get("excerpts") or [])))
+        for idx, r in enumerate(results)
+    ]
+    attributed = []
+    for query in queries:
+        score_passages(query, docs)
+        ranked = sorted((d for d in docs if d.score > 0), key=lambda d: (-d.score, d.source))
+        if ranked:
+            cutoff = ranked[0].score * min_relative_score
+            ranked = [d for d in ranked if d.score >= cutoff]
+        attributed.append([results[d.source] for d in ranked[:per_query]])
+        for d in docs:
+            d.score = 0.0
+    return attributed
@@ -0,0 +1,225 @@
+import hashlib
+import importlib.util
+import os
+import threading
+from typing import TYPE_CHECKING, AsyncIterator
+
+from .cache import DiskCache
+from .metrics import metrics, span
+from .config import (
+    CACHE_DIR,
+    FETCH_MAX_BYTES,
+    FETCH_TIMEOUT_SECONDS,
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_MAX_ENTRIES,
+    PAGE_CACHE_TTL_SECONDS,
+)
+
+# requests, httpx and BeautifulSoup are imported on first use so importing the package stays cheap
+if TYPE_CHECKING:
+    import asyncio
+
+    import httpx
+    import requests
+
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+USER_AGENT = "Mozilla/5.0 (compatible; content-fact-checker/1.0)"
+
+# Elements that never contain article text
+_BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "header", "footer", "aside", "form",
+]
+
+_session = None
+_session_lock = threading.Lock()
+# Event loop -> its httpx client and the generator that closes the client with the loop
+_async_clients: dict["asyncio.AbstractEventLoop", tuple["httpx.AsyncClient", AsyncIterator[None]]] = {}
+_page_cache = None
+
+
+def get_http_session() -> "requests.Session":
+    """Return the shared keep-alive session used for page fetches."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers["User-Agent"] = USER_AGENT
+    return _session
+
+
+async def _close_with_loop(loop: "asyncio.AbstractEventLoop", client: "httpx.AsyncClient") -> AsyncIterator[None]:
+    """Keep client until loop shuts down its async generators, then close it on that loop.
+
+    asyncio.run (and asyncio.Runner) shut the generators down before closing the loop.
+    """
+    try:
+        yield
+    finally:
+        _async_clients.pop(loop, None)
+        await client.aclose()
+
+
+async def _get_async_http_client() -> "httpx.AsyncClient":
+    import asyncio
+
+    # httpx clients are bound to the event loop they were first used on
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        import httpx
+
+        # Loops closed without shutting down their async generators leave their client behind
+        for stale in [l for l in list(_async_clients) if l.is_closed()]:
+            _async_clients.pop(stale, None)
+        client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=32),
+        )
+        closer = _close_with_loop(loop, client)
+        entry = _async_clients[loop] = (client, closer)
+        await closer.__anext__()
+    return entry[0]
+
+
+def get_page_cache() -> DiskCache:
+    """Return the on-disk cache of fetched pages and their validators."""
+    global _page_cache
+    with _session_lock:
+        if _page_cache is None:
+            _page_cache = DiskCache(
+                os.path.join(CACHE_DIR, "pages.sqlite3"),
+                ttl_seconds=PAGE_CACHE_TTL_SECONDS,
+                max_entries=PAGE_CACHE_MAX_ENTRIES,
+            )
+    return _page_cache
+
+
+def _page_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _cached_page(url: str) -> dict | None:
+    return get_page_cache().get(_page_key(url))
+
+
+def _conditional_headers(cached: dict | None) -> dict:
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def _remember_page(url: str, headers, body: str) -> None:
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag or last_modified:
+        get_page_cache().set(_page_key(url), {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        })
+
+
+def _record_fetch(revalidated: bool, size: int) -> None:
+    metrics.incr("fact_checker_cache_lookups_total", cache="page", result="hit" if revalidated else "miss")
+    metrics.incr("fact_checker_fetched_bytes_total", 0 if revalidated else size)
+
+
+def fetch_page(url: str, max_bytes: int = FETCH_MAX_BYTES, use_cache: bool = PAGE_CACHE_ENABLED) -> str:
+    """Fetch a page's HTML over the shared session.
+
+    The body is streamed and cut off after max_bytes. Pages that carry an ETag
+    or Last-Modified header are cached on disk and revalidated with a
+    conditional GET, so an unchanged page costs a 304 instead of a download.
+
+    Raises requests.exceptions.RequestException on network or HTTP errors.
+    """
+    cached = _cached_page(url) if use_cache else None
+
+    with span("fetch"), get_http_session().get(
+        url, timeout=FETCH_TIMEOUT_SECONDS, stream=True, headers=_conditional_headers(cached)
+    ) as response:
+        if response.status_code == 304 and cached:
+            _record_fetch(True, 0)
+            return cached["body"]
+        response.raise_for_status()
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                break
+        text = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+
+    _record_fetch(False, len(body))
+    if use_cache:
+        _remember_page(url, response.headers, text)
+    return text
+
+
+async def afetch_page(url: str, max_bytes: int = FETCH_MAX_BYTES, use_cache: bool = PAGE_CACHE_ENABLED) -> str:
+    """Async version of fetch_page using a pooled httpx client.
+
+    Raises httpx.HTTPError on network or HTTP errors.
+    """
+    import asyncio  # already loaded by whoever runs the event loop
+
+    # The page cache is SQLite; keep its reads and writes off the event loop
+    cached = await asyncio.to_thread(_cached_page, url) if use_cache else None
+
+    client = await _get_async_http_client()
+    with span("fetch"):
+        async with client.stream("GET", url, headers=_conditional_headers(cached)) as response:
+            if response.status_code == 304 and cached:
+                _record_fetch(True, 0)
+                return cached["body"]
+            response.raise_for_status()
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes(64 * 1024):
+                body.extend(chunk)
+                if len(body) >= max_bytes:
+                    del body[max_bytes:]
+                    break
+            text = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+
+    _record_fetch(False, len(body))
+    if use_cache:
+        await asyncio.to_thread(_remember_page, url, response.headers, text)
+    return text
+
+
+def extract_main_text(html: str) -> str:
+    """Pull the readable article text out of an HTML page.
+
+    Scripts, navigation and other boilerplate are removed before paragraphs
+    are collected; paragraphs are separated by blank lines.
+    """
+    from bs4 import BeautifulSoup
+
+    with span("parse"):
+        soup = BeautifulSoup(html, HTML_PARSER)
+        for tag in soup.find_all(_BOILERPLATE_TAGS):
+            tag.decompose()
+
+        main_content = soup.find("article") or soup.find("main")
+        if main_content:
+            elements = main_content.find_all("p")
+        else:
+            elements = soup.find_all(["p", "h1", "h2", "h3"])
+        paragraphs = (elem.get_text(" ", strip=True) for elem in elements)
+        return "\n\n".join(p for p in paragraphs if p)
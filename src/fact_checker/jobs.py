@@ -0,0 +1,294 @@
+"""Process-wide job queue for fact-checks, shared by every web session.
+
+A JobManager runs fact_check jobs on a fixed pool of worker threads. Callers
+submit a text or URL and get a Job back right away; its ClaimUpdates can be
+read as they arrive (iter_updates) or polled by position (updates_since),
+so a page that reloads can pick the job up again by its ID. Submitting an
+input that is already queued or running returns the existing job instead of
+starting a second one (a queued job takes the more urgent of the two
+priorities), and submissions are refused with QueueFullError once
+JOB_MAX_QUEUED jobs are waiting for a worker. A job's API requests are sent
+with its priority class and tenant (see scheduler.py).
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Iterator, Optional
+
+from .checker import ClaimResult, ClaimUpdate, iter_fact_check_text, iter_fact_check_url
+from .config import JOB_MAX_QUEUED, JOB_RETENTION_SECONDS, JOB_WORKERS
+from .metrics import metrics, record_duration
+from .scheduler import PRIORITY_CLASSES, request_context
+
+JOB_KINDS = ("text", "url")
+
+
+class QueueFullError(RuntimeError):
+    """Raised by JobManager.submit when too many jobs are already waiting."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str  # "text" or "url"
+    value: str
+    options: dict = field(default_factory=dict)
+    priority: str = "default"  # scheduler priority class of its API requests
+    tenant: str = "default"
+    status: str = "queued"  # queued, running, done, failed
+    error: Optional[str] = None
+    total: Optional[int] = None  # claims being checked, once known
+    updates: list[ClaimUpdate] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _changed: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def results(self) -> list[ClaimResult]:
+        """Results received so far, in claim order."""
+        with self._changed:
+            return [u.result for u in sorted(self.updates, key=lambda u: u.index)]
+
+    def updates_since(self, position: int) -> list[ClaimUpdate]:
+        """Updates after the first `position` ones, in arrival order."""
+        with self._changed:
+            return self.updates[position:]
+
+    def wait(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Block until there are more than `position` updates or the job finished.
+
+        Returns False on timeout.
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: len(self.updates) > position or self.finished, timeout)
+
+    def iter_updates(self, position: int = 0) -> Iterator[ClaimUpdate]:
+        """Yield updates from `position` on as they arrive, until the job finishes."""
+        while True:
+            self.wait(position)
+            with self._changed:
+                new = self.updates[position:]
+                finished = self.finished
+            yield from new
+            position += len(new)
+            if finished and not new:
+                return
+
+    def to_dict(self, since: int = 0) -> dict:
+        """JSON-ready status, with the updates after the first `since` ones."""
+        with self._changed:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "priority": self.priority,
+                "status": self.status,
+                "error": self.error,
+                "total": self.total,
+                "completed": len(self.updates),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "updates": [update_to_dict(u) for u in self.updates[since:]],
+            }
+
+    def _set(self, **changes) -> None:
+        with self._changed:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self._changed.notify_all()
+
+    def _add(self, update: ClaimUpdate) -> None:
+        with self._changed:
+            self.total = update.total
+            self.updates.append(update)
+            self._changed.notify_all()
+
+
+def update_to_dict(update: ClaimUpdate) -> dict:
+    return {
+        "index": update.index,
+        "total": update.total,
+        "duration": round(update.duration, 3),
+        "result": asdict(update.result),
+    }
+
+
+def _more_urgent(priority: str, than: str) -> bool:
+    return PRIORITY_CLASSES.index(priority) < PRIORITY_CLASSES.index(than)
+
+
+def _job_key(kind: str, value: str, options: dict) -> str:
+    payload = json.dumps([kind, value.strip(), options], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobManager:
+    """Runs jobs on `workers` threads with at most `max_queued` jobs waiting."""
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        max_queued: int = JOB_MAX_QUEUED,
+        retention_seconds: float = JOB_RETENTION_SECONDS,
+    ):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fact-checker-job")
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+        self._active: dict[str, Job] = {}  # input key -> queued or running job
+        self._avg_job_seconds = 30.0  # moving average, for estimated_wait
+
+    def submit(
+        self, kind: str, value: str, priority: str = "default", tenant: str = "default", **options
+    ) -> Job:
+        """Queue a fact-check of a text or URL; options go to iter_fact_check_text/url.
+
+        Its API requests are scheduled with the given priority class and
+        tenant. Returns the already queued or running job for the same input
+        and options if there is one; a queued one is raised to this priority if
+        that is more urgent. A job already running at a less urgent priority
+        is not joined, since its requests are under way at that priority; a
+        new job is started instead. Raises QueueFullError when the queue is full.
+        """
+        return self.submit_many([(kind, value, options)], priority=priority, tenant=tenant)[0]
+
+    def submit_many(
+        self, requests: list[tuple[str, str, dict]], priority: str = "default", tenant: str = "default"
+    ) -> list[Job]:
+        """Queue several (kind, value, options) fact-checks, all or none.
+
+        Raises QueueFullError, without queuing any of them, if the new jobs
+        would not all fit in the queue.
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {PRIORITY_CLASSES}")
+        for kind, _, _ in requests:
+            if kind not in JOB_KINDS:
+                raise ValueError(f"Unknown job kind {kind!r}; expected one of {JOB_KINDS}")
+        keys = [_job_key(kind, value, options) for kind, value, options in requests]
+        with self._lock:
+            self._forget_finished()
+            new = {key for key in keys if self._joinable(key, priority) is None}
+            # Running jobs plus the ones waiting for a worker
+            if new and len(self._active) + len(new) > self.workers + self.max_queued:
+                metrics.incr("fact_checker_jobs_total", len(new), outcome="rejected")
+                raise QueueFullError(
+                    f"No room in the queue for {len(new)} more fact-check(s) "
+                    f"({self._queued()} of {self.max_queued} already waiting); try again shortly."
+                )
+            jobs, started = [], []
+            for key, (kind, value, options) in zip(keys, requests):
+                job = self._joinable(key, priority)
+                if job is not None:
+                    if _more_urgent(priority, job.priority):
+                        # Still queued: _run reads the priority when the job starts
+                        job.priority = priority
+                    metrics.incr("fact_checker_jobs_total", outcome="coalesced")
+                else:
+                    job = Job(
+                        id=uuid.uuid4().hex,
+                        kind=kind,
+                        value=value,
+                        options=options,
+                        priority=priority,
+                        tenant=tenant,
+                    )
+                    self._jobs[job.id] = job
+                    self._active[key] = job
+                    started.append((job, key))
+                    metrics.incr("fact_checker_jobs_total", outcome="submitted")
+                jobs.append(job)
+        for job, key in started:
+            self._pool.submit(self._run, job, key)
+        return jobs
+
+    def _joinable(self, key: str, priority: str) -> Optional[Job]:
+        """The active job a submission of key at priority can join, if any."""
+        job = self._active.get(key)
+        if job is not None and job.status != "queued" and _more_urgent(priority, job.priority):
+            return None
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> int:
+        """Jobs queued ahead of this one (0 once it is running)."""
+        with self._lock:
+            if job.status != "queued":
+                return 0
+            return sum(1 for j in self._active.values() if j.status == "queued" and j.created_at < job.created_at)
+
+    def estimated_wait(self) -> float:
+        """Rough seconds until a newly queued job would start."""
+        with self._lock:
+            return self._queued() / self.workers * self._avg_job_seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for j in self._active.values() if j.status == "running")
+            return {
+                "workers": self.workers,
+                "running": running,
+                "queued": self._queued(),
+                "max_queued": self.max_queued,
+                "jobs": len(self._jobs),
+            }
+
+    def _queued(self) -> int:
+        return sum(1 for j in self._active.values() if j.status == "queued")
+
+    def _forget_finished(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job, key: str) -> None:
+        with self._lock:
+            # Together with the status, so a priority raised by a coalesced submission is not lost
+            job._set(status="running", started_at=time.time())
+            priority = job.priority
+        record_duration("job_queue_wait", job.started_at - job.created_at)
+        try:
+            with request_context(priority=priority, tenant=job.tenant):
+                if job.kind == "url":
+                    updates = iter_fact_check_url(job.value, **job.options)
+                else:
+                    updates = iter_fact_check_text(job.value, **job.options)
+                for update in updates:
+                    job._add(update)
+            job._set(status="done", total=len(job.updates), finished_at=time.time())
+        except Exception as e:
+            job._set(status="failed", error=f"{type(e).__name__}: {e}", finished_at=time.time())
+        finally:
+            with self._lock:
+                if self._active.get(key) is job:
+                    del self._active[key]
+                self._avg_job_seconds += 0.2 * (job.finished_at - job.started_at - self._avg_job_seconds)
+            metrics.incr("fact_checker_jobs_finished_total", status=job.status)
+            record_duration("job", job.finished_at - job.started_at)
+
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager (sized by JOB_WORKERS / JOB_MAX_QUEUED)."""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+    return _job_manager
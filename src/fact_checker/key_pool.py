@@ -0,0 +1,245 @@
+"""Pools of API keys: one client and one rate limiter per key, least-loaded routing.
+
+Each request leases a key from its backend's pool. The pool picks the
+usable key that can send soonest (rate-limiter wait, then requests in
+flight), waits on that key's limiter, and hands the key back afterwards. A key
+that gets a 429 cools down for the Retry-After time; a key that gets a 401/403
+is taken out of rotation for KEY_DISABLE_SECONDS. When requests outnumber what
+the keys can send, the pool's RequestScheduler decides whose request goes next.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from .config import KEY_COOLDOWN_SECONDS, KEY_DISABLE_SECONDS
+from .metrics import metrics, record_duration
+from .rate_limiter import RateLimiter, make_rate_limiter
+from .scheduler import RequestScheduler
+
+_AUTH_ERRORS = {401, 403}
+
+
+class ApiKey:
+    """One API key (optionally with its own endpoint), its clients and its health."""
+
+    def __init__(
+        self,
+        backend: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        limiter: Optional[RateLimiter] = None,
+        make_client: Optional[Callable[["ApiKey"], Any]] = None,
+        make_async_client: Optional[Callable[["ApiKey"], Any]] = None,
+    ):
+        self.backend = backend
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limiter = limiter
+        # Short, stable id that is safe to log and to share across processes
+        self.fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+        self.in_flight = 0
+        self.cooldown_until = 0.0  # after a 429
+        self.disabled_until = 0.0  # after an auth error
+        self._make_client = make_client
+        self._make_async_client = make_async_client
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def label(self) -> str:
+        return f"{self.backend}:{self.fingerprint}"
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._make_client(self)
+            return self._client
+
+    @property
+    def async_client(self):
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = self._make_async_client(self)
+            return self._async_client
+
+    def wait_seconds(self, now: float) -> float:
+        """How long a request on this key would wait right now."""
+        wait = max(0.0, self.cooldown_until - now)
+        if self.limiter is not None:
+            wait = max(wait, self.limiter.current_wait())
+        return wait
+
+
+class KeyPool:
+    """Routes requests for one backend across its API keys."""
+
+    def __init__(self, backend: str, keys: list[ApiKey]):
+        if not keys:
+            raise ValueError(f"No API keys configured for {backend}")
+        self.backend = backend
+        self.keys = keys
+        self._lock = threading.Lock()
+        self.scheduler = RequestScheduler(
+            backend,
+            next_slot=self.current_wait,
+            take_slot=self._take_slot,
+            rate=self.requests_per_second,
+            abandon=lambda slot: self._release(slot[0], None),
+        )
+
+    @classmethod
+    def from_entries(
+        cls,
+        backend: str,
+        entries: list[str],
+        make_client: Callable[[ApiKey], Any],
+        make_async_client: Callable[[ApiKey], Any],
+        requests_per_minute: Optional[int] = None,
+    ) -> "KeyPool":
+        """Build a pool from "key" or "key@base_url" entries.
+
+        With requests_per_minute, each key gets its own limiter with that budget
+        (shared across processes when RATE_LIMIT_DB_PATH is set).
+        """
+        keys = []
+        for entry in entries:
+            api_key, _, base_url = entry.partition("@")
+            key = ApiKey(
+                backend,
+                api_key.strip(),
+                base_url=base_url.strip() or None,
+                make_client=make_client,
+                make_async_client=make_async_client,
+            )
+            if requests_per_minute:
+                key.limiter = make_rate_limiter(key.label, requests_per_minute)
+            keys.append(key)
+        return cls(backend, keys)
+
+    def use_clients(self, client: Any, async_client: Any = None) -> None:
+        """Make every key use the given client objects (for benchmarks and tests)."""
+        for key in self.keys:
+            key._make_client = lambda _key: client
+            key._make_async_client = lambda _key: async_client
+            key._client = key._async_client = None
+
+    def _usable(self, now: float) -> list[ApiKey]:
+        return [k for k in self.keys if k.disabled_until <= now]
+
+    def current_wait(self) -> float:
+        """Seconds until some usable key can send a request (inf if none is usable)."""
+        now = time.monotonic()
+        return min((k.wait_seconds(now) for k in self._usable(now)), default=math.inf)
+
+    def has_usable_key(self) -> bool:
+        return bool(self._usable(time.monotonic()))
+
+    def requests_per_second(self) -> float:
+        """Sustained request rate of the usable keys (inf if any of them is unlimited)."""
+        usable = self._usable(time.monotonic())
+        if any(k.limiter is None for k in usable):
+            return math.inf
+        return sum(k.limiter.rate for k in usable)
+
+    def _acquire(self) -> tuple[ApiKey, float]:
+        now = time.monotonic()
+        usable = self._usable(now)
+        if not usable:
+            raise RuntimeError(f"All {self.backend} API keys were rejected (401/403); check your keys.")
+        waits = {k.label: k.wait_seconds(now) for k in usable}
+        with self._lock:
+            key = min(usable, key=lambda k: (waits[k.label], k.in_flight))
+            key.in_flight += 1
+        return key, max(0.0, key.cooldown_until - now)
+
+    def _take_slot(self) -> tuple[ApiKey, float]:
+        """Pick a key and reserve its next rate-limit token; returns (key, seconds to wait)."""
+        key, wait = self._acquire()
+        if key.limiter is not None:
+            try:
+                wait = max(wait, key.limiter.reserve())
+            except BaseException:
+                self._release(key, None)
+                raise
+        return key, wait
+
+    def _release(self, key: ApiKey, exc: Optional[BaseException]) -> None:
+        with self._lock:
+            key.in_flight -= 1
+        if exc is not None:
+            self._report_failure(key, exc)
+
+    def _report_failure(self, key: ApiKey, exc: BaseException) -> None:
+        from .resilience import retry_after_seconds, status_code
+
+        code = status_code(exc)
+        now = time.monotonic()
+        if code == 429:
+            delay = retry_after_seconds(exc) or KEY_COOLDOWN_SECONDS
+            key.cooldown_until = max(key.cooldown_until, now + delay)
+            if key.limiter is not None:
+                key.limiter.penalize(delay)
+            metrics.incr("fact_checker_key_cooldowns_total", key=key.label)
+        elif code in _AUTH_ERRORS:
+            key.disabled_until = now + KEY_DISABLE_SECONDS
+            metrics.incr("fact_checker_key_disabled_total", key=key.label)
+
+    @contextmanager
+    def lease(self) -> Iterator[ApiKey]:
+        """Wait for this request's turn, then lease the least-loaded usable key.
+
+        The turn comes from the pool's scheduler, by the priority, tenant and
+        deadline of the current request_context(); RequestShedError is raised
+        if it cannot come before the deadline. A 429 or auth error raised
+        inside the block is recorded against the key.
+        """
+        start = time.monotonic()
+        key, wait = self.scheduler.acquire()
+        try:
+            if wait > 0:
+                time.sleep(wait)
+            record_duration("rate_limit_wait", time.monotonic() - start)
+            metrics.incr("fact_checker_key_requests_total", key=key.label)
+            yield key
+        except BaseException as exc:
+            self._release(key, exc)
+            raise
+        self._release(key, None)
+
+    @asynccontextmanager
+    async def alease(self) -> AsyncIterator[ApiKey]:
+        """Async version of lease; waits without blocking the event loop."""
+        import asyncio  # already loaded by whoever runs the event loop
+
+        start = time.monotonic()
+        key, wait = await self.scheduler.aacquire()
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            record_duration("rate_limit_wait", time.monotonic() - start)
+            metrics.incr("fact_checker_key_requests_total", key=key.label)
+            yield key
+        except BaseException as exc:
+            self._release(key, exc)
+            raise
+        self._release(key, None)
+
+    def stats(self) -> list[dict]:
+        """Per-key load and health, for status displays."""
+        now = time.monotonic()
+        return [
+            {
+                "key": k.label,
+                "base_url": k.base_url,
+                "in_flight": k.in_flight,
+                "wait_seconds": round(k.wait_seconds(now), 3),
+                "disabled": k.disabled_until > now,
+            }
+            for k in self.keys
+        ]
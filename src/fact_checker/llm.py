@@ -1,31 +1,255 @@
-from .clients import get_cerebras_client
-from .config import CEREBRAS_MODEL_NAME, DEFAULT_TEMPERATURE, DEFAULT_TOP_P, DEFAULT_MAX_TOKENS
-from .rate_limiter import cerebras_rate_limiter
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from .clients import get_cerebras_pool
+from .config import (
+    CEREBRAS_MODEL_NAME,
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_TEMPERATURE,
+    DEFAULT_TOP_P,
+    EXTRACT_MAX_TOKENS,
+    EXTRACT_TEMPERATURE,
+    JUDGE_DEEP_MAX_TOKENS,
+    JUDGE_MAX_TOKENS,
+    JUDGE_TEMPERATURE,
+    LLM_HEDGE_AFTER_SECONDS,
+    LLM_STREAMING_ENABLED,
+    LLM_TIMEOUT_SECONDS,
+)
+from .metrics import metrics, span
+from .resilience import RetryPolicy, acall_with_retries, call_with_retries
+
+# Timeouts, retries and hedging for every chat completion (see resilience.py)
+LLM_RETRY_POLICY = RetryPolicy(timeout=LLM_TIMEOUT_SECONDS, hedge_after=LLM_HEDGE_AFTER_SECONDS or None)
+
+
+@dataclass(frozen=True)
+class ChatProfile:
+    """Generation limit and sampling for one kind of call."""
+
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    temperature: float = DEFAULT_TEMPERATURE
+    top_p: float = DEFAULT_TOP_P
+
+
+CHAT_PROFILES = {
+    "default": ChatProfile(),
+    "extract": ChatProfile(max_tokens=EXTRACT_MAX_TOKENS, temperature=EXTRACT_TEMPERATURE),
+    "judge": ChatProfile(max_tokens=JUDGE_MAX_TOKENS, temperature=JUDGE_TEMPERATURE),
+    "judge_batch": ChatProfile(max_tokens=JUDGE_MAX_TOKENS, temperature=JUDGE_TEMPERATURE),
+    "judge_deep": ChatProfile(max_tokens=JUDGE_DEEP_MAX_TOKENS, temperature=JUDGE_TEMPERATURE),
+}
+
+
+class JsonStreamParser:
+    """Finds the first complete, valid top-level JSON object or array in streamed text.
+
+    Text before the JSON (prose, a code fence) is skipped. A value that does
+    not parse, or that `validate` rejects, is dropped and scanning resumes
+    after it.
+    """
+
+    def __init__(self, validate: Optional[Callable[[Any], bool]] = None):
+        self.validate = validate
+        self.text = ""
+        self.json_text: Optional[str] = None
+        self.value: Any = None
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Add streamed text; True once a complete, valid value has been seen."""
+        self.text += chunk
+        while self.json_text is None and self._pos < len(self.text):
+            ch = self.text[self._pos]
+            self._pos += 1
+            if self._start is None:
+                if ch in "{[":
+                    self._start, self._depth = self._pos - 1, 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete(self.text[self._start:self._pos])
+        return self.json_text is not None
+
+    def _complete(self, candidate: str) -> None:
+        self._start = None
+        try:
+            value = json.loads(candidate)
+        except ValueError:
+            return
+        if self.validate is None or self.validate(value):
+            self.json_text, self.value = candidate, value
+
+
+def _build_messages(user_content: str, system_content: str | None) -> list[dict]:
+    messages = []
+    if system_content:
+        messages.append({"role": "system", "content": system_content})
+    messages.append({"role": "user", "content": user_content})
+    return messages
+
+
+def _request_params(
+    profile: str,
+    temperature: Optional[float],
+    top_p: Optional[float],
+    max_tokens: Optional[int],
+) -> dict:
+    defaults = CHAT_PROFILES[profile]
+    return {
+        "model": CEREBRAS_MODEL_NAME,
+        "temperature": defaults.temperature if temperature is None else temperature,
+        "top_p": defaults.top_p if top_p is None else top_p,
+        "max_tokens": max_tokens or defaults.max_tokens,
+    }
+
+
+def _chunk_delta(chunk) -> tuple[str, Optional[str]]:
+    """(content, finish_reason) carried by one streamed chunk."""
+    if not getattr(chunk, "choices", None):
+        return "", None
+    choice = chunk.choices[0]
+    delta = getattr(choice, "delta", None)
+    return getattr(delta, "content", None) or "", getattr(choice, "finish_reason", None)
+
+
+def _read_stream(stream, validate: Optional[Callable[[Any], bool]]) -> tuple[str, Optional[str]]:
+    """Read a streamed completion; returns (text, finish_reason).
+
+    Stops and closes the stream as soon as a valid JSON value is complete, so
+    the rest of the generation is never waited for.
+    """
+    parser = JsonStreamParser(validate)
+    finish_reason = None
+    for chunk in stream:
+        content, finish_reason = _chunk_delta(chunk)
+        if content and parser.feed(content):
+            stream.close()
+            return parser.json_text, "json_complete"
+    return parser.text, finish_reason
+
+
+async def _aread_stream(stream, validate: Optional[Callable[[Any], bool]]) -> tuple[str, Optional[str]]:
+    """Async version of _read_stream."""
+    parser = JsonStreamParser(validate)
+    finish_reason = None
+    async for chunk in stream:
+        content, finish_reason = _chunk_delta(chunk)
+        if content and parser.feed(content):
+            await stream.close()
+            return parser.json_text, "json_complete"
+    return parser.text, finish_reason
+
+
+def _unpack_response(resp) -> tuple[str, Optional[str]]:
+    choice = resp.choices[0]
+    return choice.message.content, getattr(choice, "finish_reason", None)
+
+
+def _record_usage(messages: list[dict], profile: str, content: str, finish_reason: Optional[str], usage=None) -> str:
+    """Count prompt/completion sizes for a finished request and return its text."""
+    metrics.incr("fact_checker_llm_requests_total", profile=profile)
+    metrics.incr("fact_checker_llm_prompt_chars_total", sum(len(m["content"]) for m in messages))
+    metrics.incr("fact_checker_llm_completion_chars_total", len(content or ""))
+    if finish_reason == "json_complete":
+        metrics.incr("fact_checker_llm_early_stops_total", profile=profile)
+    elif finish_reason == "length":
+        metrics.incr("fact_checker_llm_truncated_total", profile=profile)
+    if usage is not None:
+        metrics.incr("fact_checker_llm_prompt_tokens_total", getattr(usage, "prompt_tokens", 0) or 0)
+        metrics.incr("fact_checker_llm_completion_tokens_total", getattr(usage, "completion_tokens", 0) or 0)
+    return content
 
 
 def call_cerebras_chat(
     user_content: str,
     system_content: str | None = None,
-    temperature: float = DEFAULT_TEMPERATURE,
-    top_p: float = DEFAULT_TOP_P,
-    max_tokens: int = DEFAULT_MAX_TOKENS,
+    temperature: Optional[float] = None,
+    top_p: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    profile: str = "default",
+    validate_json: Optional[Callable[[Any], bool]] = None,
 ) -> str:
     """Call the Cerebras chat completion API using zai-glm-4.7.
 
+    Sampling and the token limit come from CHAT_PROFILES[profile] unless
+    given explicitly. With validate_json (and LLM_STREAMING_ENABLED), the
+    answer is streamed and reading stops at the first complete JSON value
+    that validate_json accepts; that JSON text is returned.
+
+    Each request leases a key from the Cerebras key pool (waiting for that
+    key's rate limiter) and is retried on timeouts, 429s and 5xx errors per
+    LLM_RETRY_POLICY.
+
     Returns the model's response text.
     """
-    messages = []
-    if system_content:
-        messages.append({"role": "system", "content": system_content})
-    messages.append({"role": "user", "content": user_content})
+    messages = _build_messages(user_content, system_content)
+    params = _request_params(profile, temperature, top_p, max_tokens)
+    stream = LLM_STREAMING_ENABLED and validate_json is not None
+
+    pool = get_cerebras_pool()
+
+    def request(timeout: float):
+        with pool.lease() as key, span("llm_request"):
+            resp = key.client.chat.completions.create(messages=messages, timeout=timeout, stream=stream, **params)
+            if stream:
+                return (*_read_stream(resp, validate_json), None)
+            return (*_unpack_response(resp), getattr(resp, "usage", None))
+
+    content, finish_reason, usage = call_with_retries("cerebras", request, LLM_RETRY_POLICY, pool=pool)
+    return _record_usage(messages, profile, content, finish_reason, usage)
+
+
+async def acall_cerebras_chat(
+    user_content: str,
+    system_content: str | None = None,
+    temperature: Optional[float] = None,
+    top_p: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    profile: str = "default",
+    validate_json: Optional[Callable[[Any], bool]] = None,
+) -> str:
+    """Async version of call_cerebras_chat using the async Cerebras client."""
+    messages = _build_messages(user_content, system_content)
+    params = _request_params(profile, temperature, top_p, max_tokens)
+    stream = LLM_STREAMING_ENABLED and validate_json is not None
+
+    pool = get_cerebras_pool()
+
+    async def request(timeout: float):
+        async with pool.alease() as key:
+            with span("llm_request"):
+                resp = await key.async_client.chat.completions.create(
+                    messages=messages, timeout=timeout, stream=stream, **params
+                )
+                if stream:
+                    return (*await _aread_stream(resp, validate_json), None)
+                return (*_unpack_response(resp), getattr(resp, "usage", None))
+
+    content, finish_reason, usage = await acall_with_retries("cerebras", request, LLM_RETRY_POLICY, pool=pool)
+    return _record_usage(messages, profile, content, finish_reason, usage)
 
-    cerebras_rate_limiter.wait_if_needed()
 
-    resp = get_cerebras_client().chat.completions.create(
-        model=CEREBRAS_MODEL_NAME,
-        messages=messages,
-        temperature=temperature,
-        top_p=top_p,
-        max_tokens=max_tokens,
-    )
-    return resp.choices[0].message.content
+def strip_code_fences(raw: str) -> str:
+    """Strip surrounding whitespace and markdown code fences from model output."""
+    raw = raw.strip()
+    raw = re.sub(r"^\s*```(?:json)?\s*", "", raw, flags=re.IGNORECASE)
+    raw = re.sub(r"\s*```\s*$", "", raw)
+    return raw
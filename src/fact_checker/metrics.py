@@ -0,0 +1,173 @@
+"""Lightweight in-process metrics: stage spans, counters and per-claim traces.
+
+Every span records a duration histogram sample
+(fact_checker_stage_seconds{stage=...}) and, when a trace is active in the
+current context, adds its duration to that trace's timings. The checker opens
+one trace per claim, so each ClaimResult carries a per-stage breakdown.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Recent samples kept per histogram for percentile estimates in the JSON summary
+_RESERVOIR_SIZE = 2048
+
+_current_trace: ContextVar[Optional[dict[str, float]]] = ContextVar("fact_checker_trace", default=None)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.recent: deque[float] = deque(maxlen=_RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def percentile(self, pct: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class Metrics:
+    """Thread-safe registry of counters and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._histograms: dict[str, dict[tuple, _Histogram]] = {}
+
+    def incr(self, name: str, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = _Histogram()
+            series[key].observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, hist.counts):
+                        cumulative += count
+                        le = 'le="%g"' % bound
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{name}_bucket{_format_labels(key, le)} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {hist.total:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """A JSON-friendly summary: counter values and per-series duration stats."""
+        def series_name(key: tuple) -> str:
+            return ",".join(f"{k}={v}" for k, v in key) or "all"
+
+        with self._lock:
+            counters = {
+                name: {series_name(key): value for key, value in sorted(series.items())}
+                for name, series in sorted(self._counters.items())
+            }
+            histograms = {
+                name: {
+                    series_name(key): {
+                        "count": hist.count,
+                        "total": hist.total,
+                        "mean": hist.total / hist.count if hist.count else 0.0,
+                        "p50": hist.percentile(50),
+                        "p95": hist.percentile(95),
+                        "max": hist.max,
+                    }
+                    for key, hist in sorted(series.items())
+                }
+                for name, series in sorted(self._histograms.items())
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+
+# Process-wide registry used by the pipeline
+metrics = Metrics()
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage; the duration goes to metrics and the active trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_duration(stage, time.perf_counter() - start)
+
+
+def record_duration(stage: str, seconds: float) -> None:
+    """Record a stage duration that was measured elsewhere (e.g. a rate-limit wait)."""
+    metrics.observe("fact_checker_stage_seconds", seconds, stage=stage)
+    timings = _current_trace.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def trace() -> Iterator[dict[str, float]]:
+    """Collect the durations of all spans in this context into a dict of stage -> seconds.
+
+    The dict also gets a "total" entry for the time spent inside the trace.
+    """
+    timings: dict[str, float] = {}
+    token = _current_trace.set(timings)
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings["total"] = time.perf_counter() - start
+        _current_trace.reset(token)
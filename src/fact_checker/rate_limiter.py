@@ -1,33 +1,166 @@
+import math
+import os
+import sqlite3
+import threading
 import time
-from collections import deque
-from .config import FREE_TIER_REQUESTS_PER_MIN
+from .config import CEREBRAS_REQUESTS_PER_MIN, RATE_LIMIT_DB_PATH
+
+
+class MemoryBucket:
+    """Token-bucket state kept in this process only."""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: float | None = None
+        self._updated = 0.0
+
+    def update(self, capacity: float, rate: float, take: float) -> float:
+        """Refill the bucket, remove `take` tokens and return the new balance.
+
+        The balance goes negative when tokens are reserved ahead of time; each
+        token of debt is paid back after 1/rate seconds.
+        """
+        with self._lock:
+            now = time.time()
+            if self._tokens is None:
+                self._tokens = capacity
+            else:
+                self._tokens = min(capacity, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= take
+            return self._tokens
+
+
+class SQLiteBucket:
+    """Token-bucket state shared by every process that points at the same file.
+
+    Each update runs in an IMMEDIATE transaction, so concurrent CLI workers or
+    Streamlit processes draw from one budget for the same API key.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, name: str = "cerebras"):
+        self.path = path
+        self.name = name
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def update(self, capacity: float, rate: float, take: float) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            if row is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, row[0] + (now - row[1]) * rate)
+            tokens -= take
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return tokens
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
 
 
 class RateLimiter:
-    def __init__(self, max_requests_per_minute: int = FREE_TIER_REQUESTS_PER_MIN):
+    """Token-bucket rate limiter.
+
+    The bucket holds up to `burst` tokens (default: one minute's worth) and
+    refills continuously at max_requests_per_minute / 60 tokens per second.
+    Callers reserve a token and then sleep until it is theirs, so waiting
+    callers are served in arrival order and the budget is used exactly.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_minute: int = CEREBRAS_REQUESTS_PER_MIN,
+        burst: int | None = None,
+        backend: MemoryBucket | SQLiteBucket | None = None,
+    ):
         self.max_rpm = max_requests_per_minute
-        self.timestamps: deque[float] = deque()
+        self.rate = max_requests_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max_requests_per_minute)
+        self.backend = backend or MemoryBucket()
+
+    def reserve(self) -> float:
+        """Reserve the next token and return how long to sleep before using it."""
+        tokens = self.backend.update(self.capacity, self.rate, take=1)
+        return max(0.0, -tokens / self.rate)
 
     def wait_if_needed(self) -> float:
         """Block until it's safe to make another request.
 
+        Safe to call from multiple threads (and, with a SQLiteBucket backend,
+        from multiple processes).
+
         Returns the number of seconds waited (0 if no wait was needed).
         """
-        now = time.time()
-        # Remove timestamps older than 60 seconds
-        while self.timestamps and self.timestamps[0] < now - 60:
-            self.timestamps.popleft()
+        sleep_time = self.reserve()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        return sleep_time
+
+    async def async_wait_if_needed(self) -> float:
+        """Like wait_if_needed, but yields to the event loop instead of blocking."""
+        import asyncio  # already loaded by whoever runs the event loop
+
+        if self.backend.shared:
+            # The SQLite transaction can block on other processes; keep it off the loop
+            sleep_time = await asyncio.to_thread(self.reserve)
+        else:
+            sleep_time = self.reserve()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+        return sleep_time
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back every caller for at least `seconds`, e.g. after a 429 with Retry-After.
+
+        The bucket is drained to a debt worth `seconds` of refill, so waiting
+        and future callers (in every process sharing the backend) queue behind it.
+        """
+        tokens = self.backend.update(self.capacity, self.rate, take=0)
+        extra = tokens + seconds * self.rate
+        if extra > 0:
+            self.backend.update(self.capacity, self.rate, take=extra)
+
+    def current_wait(self) -> float:
+        """Seconds a request made right now would have to wait."""
+        tokens = self.backend.update(self.capacity, self.rate, take=0)
+        return max(0.0, (1 - tokens) / self.rate)
 
-        waited = 0.0
-        if len(self.timestamps) >= self.max_rpm:
-            sleep_time = 60 - (now - self.timestamps[0]) + 0.5
-            if sleep_time > 0:
-                waited = sleep_time
-                time.sleep(sleep_time)
+    def queue_depth(self) -> int:
+        """Number of reserved requests (in any process sharing the backend) still waiting."""
+        tokens = self.backend.update(self.capacity, self.rate, take=0)
+        return math.ceil(-tokens) if tokens < 0 else 0
 
-        self.timestamps.append(time.time())
-        return waited
 
+def make_rate_limiter(name: str, max_requests_per_minute: int = CEREBRAS_REQUESTS_PER_MIN) -> RateLimiter:
+    """A limiter for one API key.
 
-# Shared instance for all Cerebras API calls
-cerebras_rate_limiter = RateLimiter()
+    With RATE_LIMIT_DB_PATH set, every process using the same name (the key's
+    fingerprint) draws from one budget stored in that file.
+    """
+    backend = SQLiteBucket(RATE_LIMIT_DB_PATH, name=name) if RATE_LIMIT_DB_PATH else MemoryBucket()
+    return RateLimiter(max_requests_per_minute, backend=backend)
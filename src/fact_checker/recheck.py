@@ -0,0 +1,266 @@
+"""Incremental re-checking of pages that were fact-checked before.
+
+After each check of a URL, a snapshot of the page is stored: its paragraphs
+(as hashes), the claims extracted from each paragraph, and the verdicts with
+the time they were reached. A re-check fetches the page again and:
+
+- extracts claims only from runs of changed or added paragraphs, and keeps
+  the stored claims of paragraphs that are unchanged;
+- reuses a stored verdict while it is younger than the freshness TTL, and
+  judges new claims and claims with stale verdicts again.
+
+An unchanged page with fresh verdicts therefore costs a (conditional) fetch
+and no API calls, and a live page costs roughly in proportion to what changed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .checker import ClaimResult, iter_fact_check_claims
+from .claims import ClaimExtractionError, extract_claims_from_text, merge_claims, split_paragraphs
+from .config import (
+    BATCH_JUDGE_ENABLED,
+    CACHE_DIR,
+    DEFAULT_MAX_WORKERS,
+    EXTRACTION_MAX_WORKERS,
+    RECHECK_FRESHNESS_SECONDS,
+    RECHECK_MAX_SNAPSHOTS,
+    SEARCH_BATCH_ENABLED,
+    TIERED_VERIFICATION_ENABLED,
+)
+from .fetch import extract_main_text, fetch_page
+from .metrics import metrics, span
+from .scheduler import with_request_context
+from .similarity import normalize_claim
+
+
+class SnapshotStore:
+    """Latest snapshot per URL, kept in SQLite; the least recently checked URLs are evicted."""
+
+    def __init__(self, path: str, max_entries: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "url TEXT PRIMARY KEY, snapshot TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS snapshots_updated ON snapshots (updated)")
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT snapshot FROM snapshots WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, url: str, snapshot: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (url, snapshot, updated) VALUES (?, ?, ?)",
+                (url, json.dumps(snapshot, ensure_ascii=False), time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM snapshots WHERE url NOT IN "
+                "(SELECT url FROM snapshots ORDER BY updated DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM snapshots WHERE url = ?", (url,))
+
+
+_snapshot_store = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Return the shared on-disk store of page snapshots."""
+    global _snapshot_store
+    with _snapshot_store_lock:
+        if _snapshot_store is None:
+            _snapshot_store = SnapshotStore(
+                os.path.join(CACHE_DIR, "snapshots.sqlite3"), max_entries=RECHECK_MAX_SNAPSHOTS
+            )
+    return _snapshot_store
+
+
+@dataclass
+class RecheckResult:
+    url: str
+    results: list[ClaimResult] = field(default_factory=list)  # in claim order
+    paragraphs: int = 0
+    changed_paragraphs: int = 0  # changed or added since the last check
+    removed_paragraphs: int = 0
+    reused: int = 0  # claims whose stored verdict was still fresh
+    checked: int = 0  # claims judged in this run
+    elapsed: float = 0.0
+
+
+def _paragraph_hash(paragraph: str) -> str:
+    return hashlib.sha256(" ".join(paragraph.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def _changed_runs(hashes: list[str], known: dict[str, list[str]]) -> list[list[int]]:
+    """Runs of consecutive paragraph indexes that are not in the snapshot."""
+    runs: list[list[int]] = []
+    for i, h in enumerate(hashes):
+        if h in known:
+            continue
+        if runs and runs[-1][-1] == i - 1:
+            runs[-1].append(i)
+        else:
+            runs.append([i])
+    return runs
+
+
+def _attribute(claims: list[str], paragraphs: list[str]) -> list[list[str]]:
+    """Assign each claim to the paragraph sharing the most words with it."""
+    words = [set(normalize_claim(p).split()) for p in paragraphs]
+    assigned: list[list[str]] = [[] for _ in paragraphs]
+    for claim in claims:
+        claim_words = set(normalize_claim(claim).split())
+        best = max(range(len(paragraphs)), key=lambda i: len(claim_words & words[i]))
+        assigned[best].append(claim)
+    return assigned
+
+
+def _extract_run(paragraphs: list[str], max_claims: int) -> Optional[list[list[str]]]:
+    """Claims per paragraph of a run, or None if the extraction answer could not be parsed."""
+    try:
+        claims = extract_claims_from_text("\n\n".join(paragraphs), max_claims=max_claims, raise_errors=True)
+    except ClaimExtractionError:
+        return None
+    return _attribute(claims, paragraphs)
+
+
+def _stored_result(claim: str, entry: dict) -> ClaimResult:
+    data = dict(entry["result"])
+    data.update(claim=claim, cached=True)
+    return ClaimResult.from_dict(data)
+
+
+def recheck_url(
+    url: str,
+    max_claims: int = 6,
+    on_progress: Optional[Callable[[str, int, int], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_judge: bool = BATCH_JUDGE_ENABLED,
+    batch_search: bool = SEARCH_BATCH_ENABLED,
+    tiered: bool = TIERED_VERIFICATION_ENABLED,
+    freshness_seconds: float = RECHECK_FRESHNESS_SECONDS,
+    store: Optional[SnapshotStore] = None,
+) -> RecheckResult:
+    """Fact-check a URL, redoing only the work its changes since the last check call for.
+
+    Runs of changed or added paragraphs are extracted (up to max_claims per
+    run), and the claims of all paragraphs are then ranked down to max_claims
+    as in extract_claims_from_text. Stored verdicts younger than
+    freshness_seconds are reused (marked cached); every other claim is
+    checked again, bypassing the verdict cache. The first check of a URL
+    extracts and checks everything, like fact_check_url.
+
+    The snapshot is updated unless the page could not be fetched or has no
+    text. Paragraphs whose extraction answer could not be parsed, and
+    verdicts of failed checks, are not stored, so they are retried.
+    on_progress(message, done, total) is called from the calling thread as
+    claims are checked.
+    """
+    import requests
+
+    start = time.perf_counter()
+    store = store or get_snapshot_store()
+    try:
+        text = extract_main_text(fetch_page(url))
+    except requests.exceptions.RequestException:
+        return RecheckResult(url, elapsed=time.perf_counter() - start)
+    if not text or len(text.strip()) < 100:
+        return RecheckResult(url, elapsed=time.perf_counter() - start)
+
+    paragraphs = split_paragraphs(text)
+    hashes = [_paragraph_hash(p) for p in paragraphs]
+    snapshot = store.get(url) or {"paragraphs": [], "verdicts": {}}
+    known = {p["hash"]: p["claims"] for p in snapshot["paragraphs"]}
+    runs = _changed_runs(hashes, known)
+    changed = sum(len(run) for run in runs)
+    removed = len(set(known) - set(hashes))
+    metrics.incr("fact_checker_recheck_paragraphs_total", len(paragraphs) - changed, state="unchanged")
+    metrics.incr("fact_checker_recheck_paragraphs_total", changed, state="changed")
+    metrics.incr("fact_checker_recheck_paragraphs_total", removed, state="removed")
+
+    paragraph_claims = [known.get(h, []) for h in hashes]
+    failed: set[int] = set()  # paragraphs whose extraction failed; left out of the snapshot
+    if runs:
+        extract = with_request_context(_extract_run)
+        with span("recheck_extract"), ThreadPoolExecutor(
+            max_workers=max(1, min(EXTRACTION_MAX_WORKERS, len(runs)))
+        ) as pool:
+            extracted = pool.map(lambda run: extract([paragraphs[i] for i in run], max_claims), runs)
+            for run, run_claims in zip(runs, extracted):
+                if run_claims is None:
+                    failed.update(run)
+                    continue
+                for i, claims in zip(run, run_claims):
+                    paragraph_claims[i] = claims
+    metrics.incr("fact_checker_recheck_paragraphs_total", len(failed), state="failed")
+    claims = merge_claims(paragraph_claims, max_claims)
+
+    cutoff = time.time() - freshness_seconds
+    stored = snapshot["verdicts"]
+    results: list[Optional[ClaimResult]] = [None] * len(claims)
+    verdicts = {}
+    stale = []
+    for i, claim in enumerate(claims):
+        entry = stored.get(claim)
+        if entry is not None and entry["checked_at"] >= cutoff:
+            results[i] = _stored_result(claim, entry)
+            verdicts[claim] = entry
+        else:
+            stale.append(i)
+    metrics.incr("fact_checker_recheck_claims_total", len(claims) - len(stale), outcome="reused")
+    metrics.incr("fact_checker_recheck_claims_total", len(stale), outcome="checked")
+
+    updates = iter_fact_check_claims(
+        [claims[i] for i in stale],
+        max_workers=max_workers,
+        batch_judge=batch_judge,
+        batch_search=batch_search,
+        tiered=tiered,
+        use_cache=False,
+    )
+    for done, update in enumerate(updates, 1):
+        result = update.result
+        results[stale[update.index]] = result
+        if result.error is None:
+            verdicts[result.claim] = {"result": result.to_dict(timings=False), "checked_at": time.time()}
+        if on_progress:
+            on_progress(f"Checked claim {done}/{len(stale)}: {result.claim}", done, len(stale))
+
+    store.set(url, {
+        "paragraphs": [
+            {"hash": h, "claims": c}
+            for i, (h, c) in enumerate(zip(hashes, paragraph_claims))
+            if i not in failed
+        ],
+        "verdicts": verdicts,
+    })
+    return RecheckResult(
+        url,
+        results=results,
+        paragraphs=len(paragraphs),
+        changed_paragraphs=changed,
+        removed_paragraphs=removed,
+        reused=len(claims) - len(stale),
+        checked=len(stale),
+        elapsed=time.perf_counter() - start,
+    )
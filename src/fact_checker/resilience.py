@@ -0,0 +1,369 @@
+"""Timeouts, retries, circuit breaking and hedged requests for backend API calls.
+
+call_with_retries / acall_with_retries wrap one logical API call:
+
+- every attempt gets a timeout, and the whole call (retries included) a deadline;
+- transient failures (timeouts, connection errors, 408/409/429/5xx) are retried
+  with full-jitter exponential backoff, or after the server's Retry-After;
+- with a key pool, a 429 or auth error takes that key out of rotation and the
+  retry goes straight to another key when one is usable;
+- each backend has a circuit breaker that fails calls fast after repeated
+  failures and lets a trial call through once the reset time has passed;
+- optionally, a duplicate (hedged) request is sent when the first has not
+  answered after hedge_after seconds, and the first answer wins;
+- a request the key pool's scheduler sheds (RequestShedError) is not retried.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, TypeVar
+
+from .config import (
+    CALL_DEADLINE_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+from .metrics import metrics, record_duration
+from .scheduler import RequestShedError
+
+if TYPE_CHECKING:
+    from .key_pool import KeyPool
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# Exception class names (anywhere in the MRO) that mean the request never got a
+# usable answer. Matching by name covers the SDKs, httpx and requests without
+# importing any of them.
+_TRANSIENT_ERRORS = {
+    "TimeoutError",
+    "ConnectionError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "TransportError",
+    "TimeoutException",
+}
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY_SECONDS
+    max_delay: float = RETRY_MAX_DELAY_SECONDS
+    timeout: float = 60.0  # seconds per attempt
+    deadline: float = CALL_DEADLINE_SECONDS  # seconds for the whole call, retries included
+    hedge_after: Optional[float] = None  # seconds before sending a duplicate request
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After failure_threshold transient failures in a row the circuit opens and
+    calls fail immediately with CircuitOpenError. Once reset_seconds have
+    passed, one trial call is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless a call may go through right now.
+
+        Returns True if the call is the half-open trial, which must end in
+        record_success, record_failure or release_trial.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at >= self.reset_seconds and not self._trial_running:
+                self._trial_running = True
+                return True
+        metrics.incr("fact_checker_circuit_rejections_total", backend=self.name)
+        raise CircuitOpenError(f"{self.name} circuit is open after repeated failures")
+
+    def release_trial(self) -> None:
+        """End a trial call without an outcome (never sent, cancelled or interrupted)."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (self._opened_at is None and self._failures >= self.failure_threshold):
+                metrics.incr("fact_checker_circuit_opened_total", backend=self.name)
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(backend: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a backend ("cerebras", "parallel", ...)."""
+    with _breakers_lock:
+        if backend not in _breakers:
+            _breakers[backend] = CircuitBreaker(backend)
+        return _breakers[backend]
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by an SDK/HTTP exception, if any."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for failures worth retrying: timeouts, connection errors, 408/409/429/5xx."""
+    code = status_code(exc)
+    if code is not None:
+        return code in _RETRYABLE_STATUS
+    return any(cls.__name__ in _TRANSIENT_ERRORS for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After / retry-after-ms), if it did."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, policy: RetryPolicy) -> float:
+    """Full-jitter exponential backoff for the given (0-based) failed attempt."""
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** attempt))
+
+
+def _retry_delay(
+    exc: Exception,
+    attempt: int,
+    policy: RetryPolicy,
+    backend: str,
+    started: float,
+    pool: Optional["KeyPool"] = None,
+) -> Optional[float]:
+    """How long to wait before the next attempt, or None to give up and re-raise."""
+    if isinstance(exc, RequestShedError):
+        # Never sent, so it says nothing about the backend; retrying would only queue it again
+        return None
+    breaker = get_circuit_breaker(backend)
+    code = status_code(exc)
+    # A 429 or auth error is about one key, not the backend: the pool benches
+    # that key and the lease waits for (or picks) another one
+    key_error = pool is not None and code in (401, 403, 429)
+    if key_error:
+        breaker.record_success()
+        if attempt + 1 >= policy.max_attempts or not pool.has_usable_key():
+            return None
+        if time.monotonic() - started + pool.current_wait() >= policy.deadline:
+            return None
+        metrics.incr("fact_checker_retries_total", backend=backend, reason=str(code))
+        return 0.0
+    if not is_retryable(exc):
+        # The backend answered (e.g. a 400), so it is up; the caller gets the error
+        breaker.record_success()
+        return None
+    breaker.record_failure()
+    if attempt + 1 >= policy.max_attempts:
+        return None
+    delay = retry_after_seconds(exc)
+    if delay is None:
+        delay = backoff_delay(attempt, policy)
+    if time.monotonic() - started + delay >= policy.deadline:
+        return None
+    metrics.incr("fact_checker_retries_total", backend=backend, reason=str(code or type(exc).__name__))
+    return delay
+
+
+def _attempt_timeout(policy: RetryPolicy, started: float) -> float:
+    return max(0.1, min(policy.timeout, policy.deadline - (time.monotonic() - started)))
+
+
+# Threads for hedged requests; the losing request runs to completion here
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="fact-checker-hedge")
+
+
+def _hedged(
+    fn: Callable[[float], T],
+    timeout: float,
+    policy: RetryPolicy,
+    backend: str,
+    pool: Optional["KeyPool"],
+) -> T:
+    # Copy the context so spans inside fn still land in the caller's trace
+    primary = _hedge_pool.submit(contextvars.copy_context().run, fn, timeout)
+    done, _ = wait([primary], timeout=policy.hedge_after)
+    # Never hedge when it would have to queue behind the rate limit
+    if done or (pool is not None and pool.current_wait() > 0):
+        return primary.result()
+
+    metrics.incr("fact_checker_hedged_requests_total", backend=backend)
+    hedge = _hedge_pool.submit(contextvars.copy_context().run, fn, timeout)
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    metrics.incr("fact_checker_hedge_wins_total", backend=backend)
+                return future.result()
+    return primary.result()  # both failed: surface the original error
+
+
+def call_with_retries(
+    backend: str,
+    fn: Callable[[float], T],
+    policy: RetryPolicy,
+    pool: Optional["KeyPool"] = None,
+) -> T:
+    """Call fn(timeout) with retries, backoff, circuit breaking and optional hedging.
+
+    fn makes one request and must give up after `timeout` seconds; it leases
+    its key from `pool` (if any), which does the rate limiting. The pool is
+    used here to retry key-specific failures on another key without backoff
+    and to skip hedges that would queue behind the rate limit.
+    """
+    breaker = get_circuit_breaker(backend)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        trial = breaker.before_call()
+        timeout = _attempt_timeout(policy, started)
+        try:
+            if policy.hedge_after:
+                result = _hedged(fn, timeout, policy, backend, pool)
+            else:
+                result = fn(timeout)
+            breaker.record_success()
+            return result
+        except Exception as exc:
+            delay = _retry_delay(exc, attempt, policy, backend, started, pool)
+            if delay is None:
+                raise
+        finally:
+            # A trial that recorded no outcome (shed, cancelled, interrupted) must not keep the slot
+            if trial:
+                breaker.release_trial()
+        if delay > 0:
+            time.sleep(delay)
+            record_duration("retry_backoff", delay)
+        attempt += 1
+
+
+async def _ahedged(
+    fn: Callable[[float], Awaitable[T]],
+    timeout: float,
+    policy: RetryPolicy,
+    backend: str,
+    pool: Optional["KeyPool"],
+) -> T:
+    import asyncio  # already loaded by whoever runs the event loop
+
+    primary = asyncio.ensure_future(fn(timeout))
+    done, _ = await asyncio.wait({primary}, timeout=policy.hedge_after)
+    if done or (pool is not None and pool.current_wait() > 0):
+        return await primary
+
+    metrics.incr("fact_checker_hedged_requests_total", backend=backend)
+    hedge = asyncio.ensure_future(fn(timeout))
+    pending = {primary, hedge}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        metrics.incr("fact_checker_hedge_wins_total", backend=backend)
+                    return task.result()
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def acall_with_retries(
+    backend: str,
+    fn: Callable[[float], Awaitable[T]],
+    policy: RetryPolicy,
+    pool: Optional["KeyPool"] = None,
+) -> T:
+    """Async version of call_with_retries; the losing hedged request is cancelled."""
+    import asyncio  # already loaded by whoever runs the event loop
+
+    breaker = get_circuit_breaker(backend)
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        trial = breaker.before_call()
+        timeout = _attempt_timeout(policy, started)
+        try:
+            if policy.hedge_after:
+                result = await _ahedged(fn, timeout, policy, backend, pool)
+            else:
+                result = await fn(timeout)
+            breaker.record_success()
+            return result
+        except Exception as exc:
+            delay = _retry_delay(exc, attempt, policy, backend, started, pool)
+            if delay is None:
+                raise
+        finally:
+            # A trial that recorded no outcome (shed, cancelled, interrupted) must not keep the slot
+            if trial:
+                breaker.release_trial()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            record_duration("retry_backoff", delay)
+        attempt += 1
@@ -0,0 +1,271 @@
+"""Persistent store of past fact-checks and their verdicts.
+
+Runs (one checked text or URL) and their claims are kept in SQLite, indexed
+by owner and time, verdict and source URL, with a full-text index over claim
+text (FTS5, or LIKE matching where SQLite lacks it). Runs are listed a page
+at a time without their claims, which are loaded only for the runs shown.
+Only the newest max_runs runs are kept, so the store stays bounded in a
+long-running deployment.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .checker import ClaimResult
+from .config import CACHE_DIR, RESULT_STORE_MAX_RUNS
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "  id INTEGER PRIMARY KEY, job_id TEXT NOT NULL, owner TEXT NOT NULL, kind TEXT NOT NULL,"
+    "  input TEXT NOT NULL, created REAL NOT NULL, verdicts TEXT NOT NULL, UNIQUE (job_id, owner));"
+    "CREATE INDEX IF NOT EXISTS runs_owner_created ON runs (owner, created);"
+    "CREATE INDEX IF NOT EXISTS runs_created ON runs (created);"
+    "CREATE TABLE IF NOT EXISTS claims ("
+    "  id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL, position INTEGER NOT NULL, claim TEXT NOT NULL,"
+    "  verdict TEXT NOT NULL, created REAL NOT NULL, result TEXT NOT NULL, UNIQUE (run_id, position));"
+    "CREATE INDEX IF NOT EXISTS claims_claim ON claims (claim);"
+    "CREATE INDEX IF NOT EXISTS claims_verdict_created ON claims (verdict, created);"
+    "CREATE INDEX IF NOT EXISTS claims_created ON claims (created);"
+    "CREATE TABLE IF NOT EXISTS sources (claim_id INTEGER NOT NULL, url TEXT NOT NULL);"
+    "CREATE INDEX IF NOT EXISTS sources_url ON sources (url);"
+    "CREATE INDEX IF NOT EXISTS sources_claim ON sources (claim_id);"
+)
+
+# Full-text index over claim text, kept in step with the claims table
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5(claim, content='claims', content_rowid='id');"
+    "CREATE TRIGGER IF NOT EXISTS claims_fts_insert AFTER INSERT ON claims BEGIN"
+    "  INSERT INTO claims_fts (rowid, claim) VALUES (new.id, new.claim); END;"
+    "CREATE TRIGGER IF NOT EXISTS claims_fts_delete AFTER DELETE ON claims BEGIN"
+    "  INSERT INTO claims_fts (claims_fts, rowid, claim) VALUES ('delete', old.id, old.claim); END;"
+)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class StoredRun:
+    """One past fact-check, without its claims (see ResultStore.run_results)."""
+
+    id: int
+    job_id: str
+    kind: str  # "text" or "url"
+    input: str
+    created: float
+    verdicts: dict[str, int] = field(default_factory=dict)  # verdict -> number of claims
+
+    @property
+    def claims(self) -> int:
+        return sum(self.verdicts.values())
+
+
+@dataclass
+class StoredClaim:
+    """One verdict from a past run, as found by ResultStore.search_claims."""
+
+    run_id: int
+    position: int  # order of the claim within its run
+    created: float
+    result: ClaimResult
+
+
+def _fts_query(text: str) -> str:
+    """Every word of the user's text must match; the last one may be a prefix."""
+    words = [f'"{w}"' for w in _WORD_RE.findall(text)]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+class ResultStore:
+    """SQLite store of fact-check runs, shared by every session of a process (and across processes)."""
+
+    def __init__(self, path: str, max_runs: int = 10_000):
+        self.path = path
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            self.full_text = False
+
+    def add_run(
+        self,
+        job_id: str,
+        owner: str,
+        kind: str,
+        value: str,
+        results: list[ClaimResult],
+        created: Optional[float] = None,
+    ) -> int:
+        """Store a finished run and its results (in claim order); returns the run's id.
+
+        Adding the same job for the same owner again stores nothing and
+        returns the existing id.
+        """
+        created = created or time.time()
+        verdicts: dict[str, int] = {}
+        for r in results:
+            verdicts[r.verdict] = verdicts.get(r.verdict, 0) + 1
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO runs (job_id, owner, kind, input, created, verdicts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, owner, kind, value, created, json.dumps(verdicts)),
+                )
+                if cursor.rowcount == 0:
+                    (run_id,) = self._conn.execute(
+                        "SELECT id FROM runs WHERE job_id = ? AND owner = ?", (job_id, owner)
+                    ).fetchone()
+                else:
+                    run_id = cursor.lastrowid
+                    for position, r in enumerate(results):
+                        claim_id = self._conn.execute(
+                            "INSERT INTO claims (run_id, position, claim, verdict, created, result) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (run_id, position, r.claim, r.verdict, created,
+                             json.dumps(r.to_dict(timings=False), ensure_ascii=False)),
+                        ).lastrowid
+                        self._conn.executemany(
+                            "INSERT INTO sources (claim_id, url) VALUES (?, ?)",
+                            [(claim_id, url) for url in dict.fromkeys(r.sources)],
+                        )
+                    self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return run_id
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()
+        if count <= self.max_runs:
+            return
+        old = [row[0] for row in self._conn.execute(
+            "SELECT id FROM runs ORDER BY created LIMIT ?", (count - self.max_runs,)
+        )]
+        self._delete_runs(old)
+
+    def _delete_runs(self, run_ids: list[int]) -> None:
+        for start in range(0, len(run_ids), 500):
+            chunk = run_ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            self._conn.execute(
+                f"DELETE FROM sources WHERE claim_id IN (SELECT id FROM claims WHERE run_id IN ({marks}))", chunk
+            )
+            self._conn.execute(f"DELETE FROM claims WHERE run_id IN ({marks})", chunk)
+            self._conn.execute(f"DELETE FROM runs WHERE id IN ({marks})", chunk)
+
+    def list_runs(self, owner: Optional[str] = None, limit: int = 20, offset: int = 0) -> list[StoredRun]:
+        """Runs newest first, a page at a time; only owner's runs if given."""
+        where, params = ("WHERE owner = ?", [owner]) if owner is not None else ("", [])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, job_id, kind, input, created, verdicts FROM runs {where} "
+                "ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [
+            StoredRun(id, job_id, kind, value, created, json.loads(verdicts))
+            for id, job_id, kind, value, created, verdicts in rows
+        ]
+
+    def count_runs(self, owner: Optional[str] = None) -> int:
+        where, params = ("WHERE owner = ?", (owner,)) if owner is not None else ("", ())
+        with self._lock:
+            (count,) = self._conn.execute(f"SELECT COUNT(*) FROM runs {where}", params).fetchone()
+        return count
+
+    def run_results(self, run_id: int) -> list[ClaimResult]:
+        """A run's results in claim order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM claims WHERE run_id = ? ORDER BY position", (run_id,)
+            ).fetchall()
+        return [ClaimResult.from_dict(json.loads(row[0])) for row in rows]
+
+    def search_claims(
+        self,
+        text: Optional[str] = None,
+        verdict: Optional[str] = None,
+        source: Optional[str] = None,
+        owner: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[StoredClaim]:
+        """Past claims matching all the given filters, newest first.
+
+        text matches claims containing all of its words (the last word may
+        be the start of a word); source is a source URL the verdict cited.
+        """
+        joins, conditions, params = [], [], []
+        if text and _WORD_RE.search(text):
+            if self.full_text:
+                joins.append("JOIN claims_fts ON claims_fts.rowid = c.id")
+                conditions.append("claims_fts MATCH ?")
+                params.append(_fts_query(text))
+            else:
+                for word in _WORD_RE.findall(text):
+                    conditions.append("c.claim LIKE ?")
+                    params.append(f"%{word}%")
+        if verdict:
+            conditions.append("c.verdict = ?")
+            params.append(verdict)
+        if source:
+            conditions.append("c.id IN (SELECT claim_id FROM sources WHERE url = ?)")
+            params.append(source)
+        if owner is not None:
+            joins.append("JOIN runs r ON r.id = c.run_id")
+            conditions.append("r.owner = ?")
+            params.append(owner)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT c.run_id, c.position, c.created, c.result FROM claims c {' '.join(joins)} {where} "
+                "ORDER BY c.created DESC, c.id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [
+            StoredClaim(run_id, position, created, ClaimResult.from_dict(json.loads(result)))
+            for run_id, position, created, result in rows
+        ]
+
+    def delete_owner(self, owner: str) -> None:
+        """Forget all of owner's runs."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                run_ids = [row[0] for row in self._conn.execute("SELECT id FROM runs WHERE owner = ?", (owner,))]
+                self._delete_runs(run_ids)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+_result_store = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """Return the shared on-disk store of past fact-checks."""
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = ResultStore(os.path.join(CACHE_DIR, "results.sqlite3"), max_runs=RESULT_STORE_MAX_RUNS)
+    return _result_store
@@ -0,0 +1,353 @@
+"""Priority scheduling of rate-limited API requests.
+
+Every request a KeyPool sends first waits its turn here. Whenever the pool
+can send (a usable key has a rate-limit token), the turn goes to:
+
+1. the most urgent priority class with requests waiting ("interactive",
+   then "default", then "batch"), so bulk work only gets capacity that
+   interactive users leave over;
+2. within that class, the tenant served least so far, so one tenant's bulk
+   run cannot crowd out another's;
+3. within that tenant, the request with the earliest deadline, then the oldest.
+
+A request that cannot start before its deadline (given the requests ahead of
+it and the pool's rate) is shed with RequestShedError instead of queued, and
+so is a queued request whose deadline passes. The token is only reserved when
+a request's turn comes, so the per-key RPM budget is still used exactly.
+
+Priority, tenant and deadline come from request_context(), which applies to
+every request made inside the block. Worker threads only see it when the
+function they run is wrapped with with_request_context(), as the pipeline's
+thread pools do.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from .config import (
+    SCHEDULER_BATCH_MAX_WAIT_SECONDS,
+    SCHEDULER_DEFAULT_MAX_WAIT_SECONDS,
+    SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS,
+)
+from .metrics import metrics
+
+PRIORITY_CLASSES = ("interactive", "default", "batch")
+
+T = TypeVar("T")
+
+# Longest a request of each class may wait for its turn before it is shed (None = no limit)
+_MAX_WAIT = {
+    "interactive": SCHEDULER_INTERACTIVE_MAX_WAIT_SECONDS or None,
+    "default": SCHEDULER_DEFAULT_MAX_WAIT_SECONDS or None,
+    "batch": SCHEDULER_BATCH_MAX_WAIT_SECONDS or None,
+}
+
+
+class RequestShedError(RuntimeError):
+    """Raised instead of sending a request that could not start before its deadline."""
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Who an API request is for and how urgent it is."""
+
+    priority: str = "default"  # one of PRIORITY_CLASSES
+    tenant: str = "default"  # requests in one class are shared fairly between tenants
+    deadline: Optional[float] = None  # time.monotonic() after which no request may start
+
+
+_current_context: ContextVar[RequestContext] = ContextVar("fact_checker_request_context", default=RequestContext())
+
+
+def current_request_context() -> RequestContext:
+    return _current_context.get()
+
+
+@contextmanager
+def request_context(
+    priority: Optional[str] = None,
+    tenant: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[RequestContext]:
+    """Send the API requests made in this block with the given priority class and tenant.
+
+    Values not given are inherited from the enclosing block. With timeout, no
+    request starts more than that many seconds from now (an earlier enclosing
+    deadline still applies).
+    """
+    outer = _current_context.get()
+    if priority is not None and priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority {priority!r}; expected one of {PRIORITY_CLASSES}")
+    deadline = outer.deadline
+    if timeout is not None:
+        deadline = min(time.monotonic() + timeout, deadline if deadline is not None else math.inf)
+    context = RequestContext(priority or outer.priority, tenant or outer.tenant, deadline)
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def with_request_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap fn so that it runs under the caller's current request context (for worker threads)."""
+    context = _current_context.get()
+
+    def run(*args, **kwargs) -> T:
+        token = _current_context.set(context)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_context.reset(token)
+
+    return run
+
+
+class _Ticket:
+    """One request waiting for its turn."""
+
+    def __init__(self, context: RequestContext, deadline: Optional[float], seq: int, notify: Callable[[], None]):
+        self.rank = PRIORITY_CLASSES.index(context.priority)
+        self.priority = context.priority
+        self.tenant = context.tenant
+        self.deadline = deadline
+        self.seq = seq
+        self.notify = notify
+        self.enqueued = time.monotonic()
+        self.done = False
+        self.slot: Any = None
+        self.error: Optional[BaseException] = None
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        # Earliest deadline first, then oldest
+        mine = self.deadline if self.deadline is not None else math.inf
+        theirs = other.deadline if other.deadline is not None else math.inf
+        return (mine, self.seq) < (theirs, other.seq)
+
+
+class RequestScheduler:
+    """Hands out one backend's request slots in priority, fair-share and deadline order.
+
+    next_slot() is how many seconds until a request could be sent (math.inf
+    if none can be), take_slot() claims one (for a KeyPool: picks a key and
+    reserves its rate-limit token), rate() is the sustained requests per
+    second (math.inf when unlimited), and abandon(slot) gives back a slot
+    whose requester went away before using it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        next_slot: Callable[[], float],
+        take_slot: Callable[[], Any],
+        rate: Callable[[], float],
+        abandon: Optional[Callable[[Any], None]] = None,
+    ):
+        self.name = name
+        self._next_slot = next_slot
+        self._take_slot = take_slot
+        self._rate = rate
+        self._abandon = abandon
+        self._cond = threading.Condition()
+        # Per priority class: tenant -> heap of its waiting tickets
+        self._queues: list[dict[str, list[_Ticket]]] = [{} for _ in PRIORITY_CLASSES]
+        # Per priority class: tenant -> slots granted while it had requests waiting
+        self._served: list[dict[str, float]] = [{} for _ in PRIORITY_CLASSES]
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def acquire(self, context: Optional[RequestContext] = None) -> Any:
+        """Block until it is this request's turn and return take_slot()'s value.
+
+        Raises RequestShedError if the request cannot start before its deadline.
+        """
+        turn = threading.Event()
+        ticket = self._enqueue(context, turn.set)
+        if not ticket.done:
+            turn.wait()
+        return self._result(ticket)
+
+    async def aacquire(self, context: Optional[RequestContext] = None) -> Any:
+        """Async version of acquire; waits without blocking the event loop."""
+        import asyncio  # already loaded by whoever runs the event loop
+
+        loop = asyncio.get_running_loop()
+        turn = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: turn.done() or turn.set_result(None))
+
+        ticket = self._enqueue(context, wake)
+        if not ticket.done:
+            try:
+                await turn
+            except asyncio.CancelledError:
+                self._withdraw(ticket)
+                raise
+        return self._result(ticket)
+
+    def stats(self) -> dict:
+        """Requests waiting per priority class, for status displays."""
+        with self._cond:
+            return self._waiting()
+
+    # --- queueing ---
+
+    def _enqueue(self, context: Optional[RequestContext], notify: Callable[[], None]) -> _Ticket:
+        context = context or current_request_context()
+        now = time.monotonic()
+        deadline = context.deadline
+        max_wait = _MAX_WAIT.get(context.priority)
+        if max_wait is not None:
+            deadline = min(now + max_wait, deadline if deadline is not None else math.inf)
+
+        with self._cond:
+            ticket = _Ticket(context, deadline, next(self._seq), notify)
+            if deadline is not None and now >= deadline:
+                raise self._shed(ticket)
+            wait = self._next_slot()
+            # Nobody to queue behind: take the slot straight away (or get the
+            # pool's error, e.g. when every key has been rejected)
+            if not any(self._queues) and (wait <= 0 or wait == math.inf):
+                self._grant(ticket)
+                return ticket
+            if deadline is not None:
+                rate = self._rate()
+                behind = self._ahead_of(ticket) / rate if rate > 0 else math.inf
+                if now + max(0.0, wait) + behind > deadline:
+                    raise self._shed(ticket)
+            self._push(ticket)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._dispatch, name=f"fact-checker-scheduler-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+        return ticket
+
+    def _result(self, ticket: _Ticket) -> Any:
+        waited = time.monotonic() - ticket.enqueued
+        metrics.observe("fact_checker_scheduler_wait_seconds", waited, backend=self.name, priority=ticket.priority)
+        if ticket.error is not None:
+            raise ticket.error
+        return ticket.slot
+
+    def _shed(self, ticket: _Ticket) -> RequestShedError:
+        metrics.incr("fact_checker_scheduler_shed_total", backend=self.name, priority=ticket.priority)
+        return RequestShedError(
+            f"{self.name} request shed: it could not start before its deadline "
+            f"({self._waiting()[ticket.priority]} {ticket.priority} request(s) waiting)"
+        )
+
+    def _waiting(self) -> dict:
+        return {
+            priority: sum(len(q) for q in self._queues[rank].values())
+            for rank, priority in enumerate(PRIORITY_CLASSES)
+        }
+
+    def _ahead_of(self, ticket: _Ticket) -> int:
+        """Waiting requests certain to go first: more urgent classes, and the tenant's own earlier ones."""
+        ahead = sum(len(q) for tenants in self._queues[:ticket.rank] for q in tenants.values())
+        return ahead + sum(1 for other in self._queues[ticket.rank].get(ticket.tenant, ()) if other < ticket)
+
+    def _push(self, ticket: _Ticket) -> None:
+        tenants = self._queues[ticket.rank]
+        if ticket.tenant not in tenants:
+            served = self._served[ticket.rank]
+            # A tenant that (re)joins starts level with the least-served waiting tenant
+            served[ticket.tenant] = min(served.values(), default=0.0)
+            tenants[ticket.tenant] = []
+        heapq.heappush(tenants[ticket.tenant], ticket)
+
+    def _remove(self, ticket: _Ticket) -> None:
+        tenants = self._queues[ticket.rank]
+        queue = tenants[ticket.tenant]
+        queue.remove(ticket)
+        heapq.heapify(queue)
+        if not queue:
+            del tenants[ticket.tenant]
+            del self._served[ticket.rank][ticket.tenant]
+
+    def _peek(self) -> Optional[_Ticket]:
+        for rank, tenants in enumerate(self._queues):
+            if tenants:
+                served = self._served[rank]
+                tenant = min(tenants, key=lambda t: (served[t], tenants[t][0].seq))
+                return tenants[tenant][0]
+        return None
+
+    def _grant(self, ticket: _Ticket) -> None:
+        try:
+            ticket.slot = self._take_slot()
+        except Exception as e:
+            ticket.error = e
+        ticket.done = True
+
+    def _withdraw(self, ticket: _Ticket) -> None:
+        """Take a cancelled request out of the queue, or give back the slot it was granted."""
+        with self._cond:
+            if not ticket.done:
+                self._remove(ticket)
+                ticket.done = True
+                return
+        if ticket.slot is not None and self._abandon is not None:
+            self._abandon(ticket.slot)
+
+    # --- dispatcher thread ---
+
+    def _expire(self, now: float) -> list[_Ticket]:
+        expired = [
+            ticket
+            for tenants in self._queues
+            for queue in tenants.values()
+            for ticket in queue
+            if ticket.deadline is not None and ticket.deadline <= now
+        ]
+        for ticket in expired:
+            self._remove(ticket)
+            ticket.error = self._shed(ticket)
+            ticket.done = True
+        return expired
+
+    def _next_deadline(self, now: float) -> Optional[float]:
+        deadlines = [
+            ticket.deadline - now
+            for tenants in self._queues
+            for queue in tenants.values()
+            for ticket in queue
+            if ticket.deadline is not None
+        ]
+        return max(0.0, min(deadlines)) if deadlines else None
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                ready = self._expire(now)
+                ticket = None if ready else self._peek()
+                if ticket is not None:
+                    wait = self._next_slot()
+                    if 0 < wait < math.inf:
+                        timeout = self._next_deadline(now)
+                        self._cond.wait(wait if timeout is None else min(wait, timeout))
+                    else:
+                        self._served[ticket.rank][ticket.tenant] += 1
+                        self._remove(ticket)
+                        self._grant(ticket)
+                        ready.append(ticket)
+                elif not ready:
+                    self._cond.wait(self._next_deadline(now))
+            for waiter in ready:
+                try:
+                    waiter.notify()
+                except RuntimeError:
+                    # An async waiter whose event loop has closed; nobody is left to use the slot
+                    if waiter.slot is not None and self._abandon is not None:
+                        self._abandon(waiter.slot)
@@ -1,25 +1,75 @@
+import hashlib
+import json
+import os
 import textwrap
-from .clients import get_parallel_client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .cache import DiskCache
+from .clients import get_parallel_pool
+from .evidence import attribute_results, estimate_tokens, select_passages
+from .metrics import metrics, span
+from .scheduler import with_request_context
+from .config import (
+    CACHE_DIR,
+    EVIDENCE_MAX_TOKENS,
+    SEARCH_BATCH_MAX_QUERIES,
+    SEARCH_BATCH_MAX_RESULTS,
+    SEARCH_BATCH_MIN_RESULTS,
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL_SECONDS,
+    SEARCH_HEDGE_AFTER_SECONDS,
+    SEARCH_TIMEOUT_SECONDS,
+)
+from .resilience import RetryPolicy, acall_with_retries, call_with_retries
 
+# Timeouts, retries and hedging for every search request (see resilience.py)
+SEARCH_RETRY_POLICY = RetryPolicy(timeout=SEARCH_TIMEOUT_SECONDS, hedge_after=SEARCH_HEDGE_AFTER_SECONDS or None)
 
-def search_web(query: str, num: int = 5, mode: str = "one-shot") -> list[dict]:
-    """Search the web using Parallel's Search API.
+# Excerpt characters per search result unless a caller asks for fewer
+DEFAULT_EXCERPT_CHARS = 8000
 
-    Returns a list of dicts with: url, title, publish_date, excerpts.
-    """
-    objective = (
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> DiskCache:
+    """Return the shared on-disk cache of search results."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = DiskCache(
+                os.path.join(CACHE_DIR, "search.sqlite3"),
+                ttl_seconds=SEARCH_CACHE_TTL_SECONDS,
+                max_entries=SEARCH_CACHE_MAX_ENTRIES,
+            )
+    return _search_cache
+
+
+def _search_cache_key(query: str, num: int, mode: str, excerpt_chars: int, batched: bool = False) -> str:
+    normalized = " ".join(query.lower().split()).strip(" .!?")
+    # Results attributed from a batched search are kept apart from search_web's own
+    raw = json.dumps([normalized, num, mode, excerpt_chars] + (["batched"] if batched else []))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _search_objective(query: str) -> str:
+    return (
         f"Find high-quality, up-to-date sources that answer the question:\n\n{query}\n\n"
         "Prefer authoritative sites (e.g., .gov, .edu, major news, or official org websites)."
     )
 
-    search = get_parallel_client().beta.search(
-        objective=objective,
-        search_queries=[query],
-        mode=mode,
-        max_results=num,
-        excerpts={"max_chars_per_result": 8000},
+
+def _batch_search_objective(queries: list[str]) -> str:
+    questions = "\n".join(f"{n}. {q}" for n, q in enumerate(queries, 1))
+    return (
+        f"Find high-quality, up-to-date sources that answer each of these questions:\n\n{questions}\n\n"
+        "Cover every question. Prefer authoritative sites "
+        "(e.g., .gov, .edu, major news, or official org websites)."
     )
 
+
+def _parse_search_results(search) -> list[dict]:
     results = []
     for r in search.results:
         results.append({
@@ -31,23 +81,216 @@ def search_web(query: str, num: int = 5, mode: str = "one-shot") -> list[dict]:
     return results
 
 
-def build_evidence_context(results: list[dict], max_chars: int = 8000) -> str:
-    """Format search results into a readable evidence block for the LLM."""
+def _cached_search(query: str, num: int, mode: str, excerpt_chars: int, batched: bool = False) -> list[dict] | None:
+    """Cached results for query; a batched lookup also accepts search_web's results."""
+    cache = get_search_cache()
+    cached = cache.get(_search_cache_key(query, num, mode, excerpt_chars))
+    if cached is None and batched:
+        cached = cache.get(_search_cache_key(query, num, mode, excerpt_chars, batched=True))
+    metrics.incr(
+        "fact_checker_cache_lookups_total",
+        cache="search",
+        result="hit" if cached is not None else "miss",
+    )
+    return cached
+
+
+def search_web(
+    query: str,
+    num: int = 5,
+    mode: str = "one-shot",
+    use_cache: bool = SEARCH_CACHE_ENABLED,
+    excerpt_chars: int = DEFAULT_EXCERPT_CHARS,
+) -> list[dict]:
+    """Search the web using Parallel's Search API.
+
+    excerpt_chars caps the excerpt text returned per result. Results are
+    cached on disk, keyed on the normalized query, num, mode and
+    excerpt_chars; pass use_cache=False to force a fresh search.
+
+    Returns a list of dicts with: url, title, publish_date, excerpts.
+    """
+    if use_cache:
+        cached = _cached_search(query, num, mode, excerpt_chars)
+        if cached is not None:
+            return cached
+
+    pool = get_parallel_pool()
+
+    def request(timeout: float):
+        with pool.lease() as key, span("search_request"):
+            return key.client.beta.search(
+                objective=_search_objective(query),
+                search_queries=[query],
+                mode=mode,
+                max_results=num,
+                excerpts={"max_chars_per_result": excerpt_chars},
+                timeout=timeout,
+            )
+
+    search = call_with_retries("parallel", request, SEARCH_RETRY_POLICY, pool=pool)
+    metrics.incr("fact_checker_search_requests_total")
+    results = _parse_search_results(search)
+    if use_cache and results:
+        get_search_cache().set(_search_cache_key(query, num, mode, excerpt_chars), results)
+    return results
+
+
+async def asearch_web(
+    query: str,
+    num: int = 5,
+    mode: str = "one-shot",
+    use_cache: bool = SEARCH_CACHE_ENABLED,
+    excerpt_chars: int = DEFAULT_EXCERPT_CHARS,
+) -> list[dict]:
+    """Async version of search_web using the async Parallel client."""
+    import asyncio  # already loaded by whoever runs the event loop
+
+    # The search cache is SQLite; keep its reads and writes off the event loop
+    if use_cache:
+        cached = await asyncio.to_thread(_cached_search, query, num, mode, excerpt_chars)
+        if cached is not None:
+            return cached
+
+    pool = get_parallel_pool()
+
+    async def request(timeout: float):
+        async with pool.alease() as key:
+            with span("search_request"):
+                return await key.async_client.beta.search(
+                    objective=_search_objective(query),
+                    search_queries=[query],
+                    mode=mode,
+                    max_results=num,
+                    excerpts={"max_chars_per_result": excerpt_chars},
+                    timeout=timeout,
+                )
+
+    search = await acall_with_retries("parallel", request, SEARCH_RETRY_POLICY, pool=pool)
+    metrics.incr("fact_checker_search_requests_total")
+    results = _parse_search_results(search)
+    if use_cache and results:
+        await asyncio.to_thread(get_search_cache().set, _search_cache_key(query, num, mode, excerpt_chars), results)
+    return results
+
+
+def _search_group(
+    queries: list[str], num: int, mode: str, min_results: int, excerpt_chars: int
+) -> dict[int, list[dict]]:
+    """One search request for several queries; returns results for the well-covered ones."""
+    pool = get_parallel_pool()
+
+    def request(timeout: float):
+        with pool.lease() as key, span("search_request"):
+            return key.client.beta.search(
+                objective=_batch_search_objective(queries),
+                search_queries=queries,
+                mode=mode,
+                max_results=min(num * len(queries), SEARCH_BATCH_MAX_RESULTS),
+                excerpts={"max_chars_per_result": excerpt_chars},
+                timeout=timeout,
+            )
+
+    search = call_with_retries("parallel", request, SEARCH_RETRY_POLICY, pool=pool)
+    metrics.incr("fact_checker_search_requests_total")
+    attributed = attribute_results(queries, _parse_search_results(search), per_query=num)
+    return {n: results for n, results in enumerate(attributed) if len(results) >= min_results}
+
+
+def search_web_batched(
+    queries: list[str],
+    num: int = 5,
+    mode: str = "one-shot",
+    use_cache: bool = SEARCH_CACHE_ENABLED,
+    max_queries: int = SEARCH_BATCH_MAX_QUERIES,
+    min_results: int = SEARCH_BATCH_MIN_RESULTS,
+    excerpt_chars: int = DEFAULT_EXCERPT_CHARS,
+) -> dict[int, list[dict]]:
+    """Search for several queries with as few Parallel requests as possible.
+
+    Queries are sent max_queries at a time as the search_queries of one
+    request (groups run concurrently), and each returned result is attributed
+    to the queries it is relevant to. Returns query index -> results for every
+    query answered from the cache or with at least min_results attributed
+    results. Queries missing from the dict were not covered well (or their
+    request failed) and should be searched individually with search_web.
+
+    Covered queries are cached under their own keys: search_web never reads
+    them, but batched searches reuse search_web's cached results.
+    """
+    found: dict[int, list[dict]] = {}
+    missing = []
+    for i, query in enumerate(queries):
+        cached = _cached_search(query, num, mode, excerpt_chars, batched=True) if use_cache else None
+        if cached is not None:
+            found[i] = cached
+        else:
+            missing.append(i)
+
+    if not missing:
+        return found
+    # Spread queries evenly over the fewest requests, e.g. 6 queries -> 3 + 3
+    n_groups = -(-len(missing) // max(1, max_queries))
+    size = -(-len(missing) // n_groups)
+    groups = [missing[k:k + size] for k in range(0, len(missing), size)]
+    search_group = with_request_context(_search_group)
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        futures = [
+            (group, pool.submit(search_group, [queries[i] for i in group], num, mode, min_results, excerpt_chars))
+            for group in groups
+        ]
+        for group, future in futures:
+            try:
+                covered = future.result()
+            except Exception:
+                covered = {}
+            for n, i in enumerate(group):
+                if n not in covered:
+                    metrics.incr("fact_checker_search_batch_queries_total", outcome="fallback")
+                    continue
+                metrics.incr("fact_checker_search_batch_queries_total", outcome="covered")
+                found[i] = covered[n]
+                if use_cache:
+                    get_search_cache().set(
+                        _search_cache_key(queries[i], num, mode, excerpt_chars, batched=True), covered[n]
+                    )
+    return found
+
+
+def _source_header(idx: int, r: dict) -> str:
+    return textwrap.dedent(f"""
+    [Source {idx + 1}]
+    Title: {r['title'] or r['url']}
+    URL: {r['url']}
+    Publish date: {r['publish_date']}
+
+    Excerpts:
+    """).strip()
+
+
+def build_evidence_context(results: list[dict], claim: str = "", max_tokens: int = EVIDENCE_MAX_TOKENS) -> str:
+    """Format the search passages most relevant to the claim into an evidence block for the LLM.
+
+    Passages are ranked against the claim, near-duplicates across sources are
+    shown once (noting the other sources), and the best ones are packed into
+    roughly max_tokens tokens.
+    Sources keep their search-rank numbering; sources with nothing relevant
+    are left out.
+    """
+    header_tokens = max(estimate_tokens(_source_header(idx, r)) for idx, r in enumerate(results)) if results else 0
+    passages = select_passages(claim, results, max_tokens=max_tokens, header_tokens=header_tokens)
+
     blocks = []
     for idx, r in enumerate(results):
-        excerpts_text = "\n\n".join(r["excerpts"][:2])
-        block = textwrap.dedent(f"""
-        [Source {idx + 1}]
-        Title: {r['title'] or r['url']}
-        URL: {r['url']}
-        Publish date: {r['publish_date']}
-
-        Excerpts:
-        {excerpts_text}
-        """).strip()
-        blocks.append(block)
-
-    context = "\n\n".join(blocks)
-    if len(context) > max_chars:
-        context = context[:max_chars] + "\n\n[Context truncated for length]"
-    return context
+        texts = []
+        for p in passages:
+            if p.source != idx:
+                continue
+            if p.also_in:
+                also = "; ".join(f"Source {i + 1}: {results[i]['url']}" for i in sorted(p.also_in))
+                texts.append(f"{p.text}\n(Also reported by {also})")
+            else:
+                texts.append(p.text)
+        if texts:
+            blocks.append(_source_header(idx, r) + "\n" + "\n\n".join(texts))
+    return "\n\n".join(blocks)
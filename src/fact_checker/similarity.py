@@ -0,0 +1,191 @@
+"""Claim normalization and MinHash near-duplicate detection."""
+
+import hashlib
+import re
+import struct
+import unicodedata
+from typing import Optional
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+# "t" is what remains of "n't" once punctuation is stripped
+_NEGATIONS = {"not", "no", "never", "none", "nor", "neither", "without", "t"}
+# Words that turn a claim into its opposite, or change its scale, when swapped
+_DIRECTIONS = {
+    "rose", "rise", "rises", "risen", "rising", "fell", "fall", "falls", "fallen", "falling",
+    "increase", "increased", "increases", "increasing", "decrease", "decreased", "decreases", "decreasing",
+    "grew", "grow", "grows", "grown", "shrank", "shrink", "shrinks", "shrunk",
+    "gain", "gained", "gains", "lose", "lost", "loses", "loss", "losses", "declined", "decline", "declines",
+    "up", "down", "higher", "lower", "more", "less", "fewer", "most", "least", "above", "below",
+    "over", "under", "before", "after", "larger", "smaller", "largest", "smallest", "first", "last",
+}
+_MAGNITUDES = {
+    "hundred", "hundreds", "thousand", "thousands", "million", "millions", "billion", "billions",
+    "trillion", "trillions", "percent", "percentage", "dozen", "half", "double", "doubled",
+    "twice", "triple", "tripled", "k", "m", "bn", "tn",
+}
+_KEY_WORDS = _NEGATIONS | _DIRECTIONS | _MAGNITUDES
+# Capitalized words and acronyms: names of people, places, organizations
+_NAME_RE = re.compile(r"\b[A-Z][\w'-]*")
+
+# Parameters for the (a * x + b) mod p permutations used by MinHash
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+NUM_PERM = 64
+LSH_BANDS = 16
+
+
+def _permutations(num_perm: int) -> list[tuple[int, int]]:
+    perms = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack("<QQ", digest)
+        perms.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+    return perms
+
+
+_PERMUTATIONS = _permutations(NUM_PERM)
+
+
+def normalize_claim(text: str) -> str:
+    """Normalize a claim for comparison: case, unicode, punctuation and whitespace.
+
+    Numbers keep their internal separators ("3.5", "1,000") so they are not
+    merged into different values.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    numbers = {}
+
+    def protect(match: re.Match) -> str:
+        token = f"num{len(numbers)}x"
+        numbers[token] = match.group(0).replace(",", "")
+        return f" {token} "
+
+    text = _NUMBER_RE.sub(protect, text)
+    text = _PUNCT_RE.sub(" ", text)
+    words = [numbers.get(w, w) for w in text.split()]
+    return " ".join(words)
+
+
+def key_terms(claim: str, normalized: Optional[str] = None) -> frozenset[str]:
+    """Numbers, negations, direction and magnitude words, and capitalized names in a claim.
+
+    Two claims that differ in any of these ("rose" / "fell", "million" /
+    "billion", "Apple" / "Microsoft") can have opposite verdicts no matter how
+    similar the rest of the text is. normalized is normalize_claim(claim), if
+    already at hand.
+    """
+    if normalized is None:
+        normalized = normalize_claim(claim)
+    names = {w.lower() for w in _NAME_RE.findall(unicodedata.normalize("NFKC", claim))}
+    words = {w for w in normalized.split() if w in _KEY_WORDS or _NUMBER_RE.fullmatch(w)}
+    return frozenset(names | words)
+
+
+def shingles(normalized: str, k: int = 4) -> set[str]:
+    """Character k-shingles of normalized text."""
+    if len(normalized) <= k:
+        return {normalized}
+    return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+
+def word_shingles(normalized: str, k: int = 2) -> set[str]:
+    """Word k-shingles of normalized text.
+
+    Unlike character shingles, swapping one word for a similarly spelled one
+    ("million" / "billion") costs k whole shingles, so short claims that
+    differ in a word are far apart.
+    """
+    words = normalized.split()
+    if len(words) <= k:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash_signature(items: set[str]) -> list[int]:
+    """MinHash signature of a shingle set (NUM_PERM values)."""
+    hashes = [
+        struct.unpack("<I", hashlib.blake2b(s.encode(), digest_size=4).digest())[0]
+        for s in items
+    ]
+    signature = []
+    for a, b in _PERMUTATIONS:
+        signature.append(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes))
+    return signature
+
+
+def signature_similarity(sig1: list[int], sig2: list[int]) -> float:
+    """Estimated Jaccard similarity between the sets behind two signatures."""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+def lsh_keys(signature: list[int], bands: int = LSH_BANDS) -> list[str]:
+    """Locality-sensitive hashing bucket keys; similar signatures share at least one."""
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows]
+        digest = hashlib.blake2b(repr(chunk).encode(), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def claim_signature(claim: str) -> tuple[str, list[int], frozenset[str]]:
+    """Normalize a claim and return (normalized_text, minhash_signature, key_terms)."""
+    normalized = normalize_claim(claim)
+    return normalized, minhash_signature(word_shingles(normalized)), key_terms(claim, normalized)
+
+
+def is_near_duplicate(
+    normalized1: str,
+    sig1: list[int],
+    terms1: frozenset[str],
+    normalized2: str,
+    sig2: list[int],
+    terms2: frozenset[str],
+    threshold: float,
+) -> bool:
+    """True if two claims are near-identical and share the same key terms.
+
+    The key-terms check keeps "born in 1879" from matching "born in 1897",
+    "is not" from matching "is", and "rose to 3.5 percent" from matching
+    "fell to 3.5 percent".
+    """
+    if normalized1 == normalized2:
+        return True
+    if terms1 != terms2:
+        return False
+    return signature_similarity(sig1, sig2) >= threshold
+
+
+def cluster_claims(claims: list[str], threshold: float) -> list[list[int]]:
+    """Group near-duplicate claims; returns lists of indices into claims.
+
+    Each cluster is led by its first claim, and a claim joins a cluster only
+    if it is a near-duplicate (see is_near_duplicate) of that leader, so
+    similarity never chains across a cluster. LSH buckets over the leaders'
+    signatures keep this close to linear in the number of claims.
+    """
+    clusters: list[list[int]] = []
+    leaders: list[tuple[str, list[int], frozenset[str]]] = []
+    exact: dict[str, int] = {}
+    buckets: dict[str, list[int]] = {}
+    for index, claim in enumerate(claims):
+        normalized, signature, terms = claim_signature(claim)
+        found = exact.get(normalized)
+        if found is None:
+            bands = lsh_keys(signature)
+            candidates = dict.fromkeys(c for band in bands for c in buckets.get(band, ()))
+            found = next(
+                (c for c in candidates if is_near_duplicate(normalized, signature, terms, *leaders[c], threshold)),
+                None,
+            )
+        if found is not None:
+            clusters[found].append(index)
+            continue
+        exact[normalized] = len(clusters)
+        for band in bands:
+            buckets.setdefault(band, []).append(len(clusters))
+        leaders.append((normalized, signature, terms))
+        clusters.append([index])
+    return clusters
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .similarity import claim_signature, is_near_duplicate, lsh_keys
+
+
+class VerdictCache:
+    """Persistent store of recent verdicts, looked up by exact or near-identical claim.
+
+    Claims are normalized (case, punctuation, whitespace) for the exact lookup.
+    With near_duplicates, a miss there falls back to MinHash LSH buckets,
+    which give a handful of candidates; one counts as a match when its
+    estimated similarity is at least `threshold` and it has the same key terms
+    (numbers, negations, directions, magnitudes and names, see
+    similarity.key_terms).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        threshold: float = 0.9,
+        near_duplicates: bool = False,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.near_duplicates = near_duplicates
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "  key TEXT PRIMARY KEY, normalized TEXT NOT NULL, signature TEXT NOT NULL,"
+            "  result TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL, terms TEXT);"
+            "CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts (accessed);"
+            "CREATE TABLE IF NOT EXISTS bands (band TEXT NOT NULL, key TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS bands_band ON bands (band);"
+            "CREATE INDEX IF NOT EXISTS bands_key ON bands (key);"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(verdicts)")}
+        if "terms" not in columns:
+            # Entries written before key terms were stored (with an older kind
+            # of signature) still serve exact lookups, but never near-duplicates
+            self._conn.execute("ALTER TABLE verdicts ADD COLUMN terms TEXT")
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, claim: str) -> Optional[dict]:
+        """Return the stored result dict for claim (or a near-duplicate), else None."""
+        normalized, signature, terms = claim_signature(claim)
+        key = self._key(normalized)
+        cutoff = time.time() - self.ttl_seconds
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM verdicts WHERE key = ? AND created >= ?", (key, cutoff)
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._touch(key)
+                return json.loads(row[0])
+
+            if not self.near_duplicates:
+                self.misses += 1
+                return None
+            bands = lsh_keys(signature)
+            candidates = self._conn.execute(
+                "SELECT DISTINCT v.key, v.normalized, v.signature, v.terms, v.result FROM bands b "
+                "JOIN verdicts v ON v.key = b.key "
+                f"WHERE b.band IN ({','.join('?' * len(bands))}) AND v.created >= ? AND v.terms IS NOT NULL",
+                (*bands, cutoff),
+            ).fetchall()
+            for cand_key, cand_normalized, cand_signature, cand_terms, result in candidates:
+                if is_near_duplicate(
+                    normalized, signature, terms,
+                    cand_normalized, json.loads(cand_signature), frozenset(json.loads(cand_terms)),
+                    self.threshold,
+                ):
+                    self.near_hits += 1
+                    self._touch(cand_key)
+                    return json.loads(result)
+
+            self.misses += 1
+            return None
+
+    def _touch(self, key: str) -> None:
+        self._conn.execute("UPDATE verdicts SET accessed = ? WHERE key = ?", (time.time(), key))
+
+    def set(self, claim: str, result: dict) -> None:
+        """Store the result dict for claim, evicting expired and least recently used entries."""
+        normalized, signature, terms = claim_signature(claim)
+        key = self._key(normalized)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM bands WHERE key = ?", (key,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO verdicts "
+                    "(key, normalized, signature, terms, result, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, normalized, json.dumps(signature), json.dumps(sorted(terms)), json.dumps(result), now, now),
+                )
+                self._conn.executemany(
+                    "INSERT INTO bands (band, key) VALUES (?, ?)",
+                    [(band, key) for band in lsh_keys(signature)],
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, now: float) -> None:
+        deleted = self._conn.execute(
+            "DELETE FROM verdicts WHERE created < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+        if count > self.max_entries:
+            deleted += self._conn.execute(
+                "DELETE FROM verdicts WHERE key IN "
+                "(SELECT key FROM verdicts ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        if deleted:
+            self._conn.execute("DELETE FROM bands WHERE key NOT IN (SELECT key FROM verdicts)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM verdicts")
+            self._conn.execute("DELETE FROM bands")
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            "entries": count,
+        }
@@ -2,12 +2,18 @@
 
 import sys
 import os
+import hashlib
+import re
+import uuid
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 import streamlit as st
-from fact_checker import fact_check_text, fact_check_url, ClaimResult
+from fact_checker import ClaimResult
+from fact_checker.config import HISTORY_SEARCH_ALL_SESSIONS
+from fact_checker.jobs import Job, QueueFullError, get_job_manager
+from fact_checker.result_store import get_result_store
 
 
 st.set_page_config(page_title="Content Fact-Checker", page_icon="🔍", layout="wide")
@@ -37,8 +43,46 @@ def _check_password() -> bool:
 if not _check_password():
     st.stop()
 
-if "history" not in st.session_state:
-    st.session_state["history"] = []
+# Cookie holding this browser's random history token; only its hash is stored
+HISTORY_COOKIE = "fact_checker_history"
+HISTORY_COOKIE_DAYS = 365
+
+
+def _browser_tenant() -> str:
+    """Tenant for this browser: a hash of an unguessable token kept in a cookie.
+
+    A new token is set when the browser has none. Streamlit sees the cookie only
+    from the next page load, so the token is also kept in the session state.
+    """
+    token = st.context.cookies.get(HISTORY_COOKIE, "")
+    if not (isinstance(token, str) and re.fullmatch(r"[0-9a-f]{32}", token)):
+        token = uuid.uuid4().hex
+        st.html(
+            "<script>"
+            f"document.cookie = '{HISTORY_COOKIE}={token}; path=/; "
+            f"max-age={HISTORY_COOKIE_DAYS * 86400}; SameSite=Strict'"
+            " + (location.protocol === 'https:' ? '; Secure' : '');"
+            "</script>",
+            unsafe_allow_javascript=True,
+        )
+    return "browser:" + hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+if "tenant" not in st.session_state:
+    # Each signed-in user (with Streamlit authentication configured), or else each
+    # browser, is its own tenant: tenants share API capacity fairly and each has its
+    # own history. The ID is never put in the URL, so sharing a link does not share
+    # the history.
+    signed_in = st.user.get("is_logged_in") and (st.user.get("email") or st.user.get("sub"))
+    st.session_state["tenant"] = f"user:{signed_in}" if signed_in else _browser_tenant()
+
+# Fact-checks run on a worker pool shared by every session of this process;
+# finished ones are kept on disk for the history sidebar
+jobs = get_job_manager()
+store = get_result_store()
+
+# Runs or claims shown per page in the history sidebar
+HISTORY_PAGE_SIZE = 10
 
 st.title("Content Fact-Checker")
 st.markdown(
@@ -77,110 +121,171 @@ _GREEN_BAR_HTML = (
 )
 
 
-def display_results(results: list[ClaimResult]):
-    st.markdown("---")
-    st.subheader(f"Results: {len(results)} claims checked")
-
-    for i, r in enumerate(results, 1):
-        style = VERDICT_STYLES.get(r.verdict, VERDICT_STYLES["uncertain"])
-        verdict_display = f"{style['emoji']} **{r.verdict.upper()}**"
+def display_claim(number: int, r: ClaimResult):
+    style = VERDICT_STYLES.get(r.verdict, VERDICT_STYLES["uncertain"])
+    verdict_display = f"{style['emoji']} **{r.verdict.upper()}**"
+    if r.cached:
+        verdict_display += " *(cached)*"
+
+    with st.container():
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"**Claim {number}:** {r.claim}")
+        with col2:
+            st.markdown(verdict_display)
+
+        st.markdown(f"*{r.reason}*")
+        if r.cached_claim:
+            st.caption(f"Verdict reused from a similar claim: {r.cached_claim}")
+        if r.error:
+            st.caption(f"Error: {r.error}")
+
+        if r.sources:
+            with st.expander("View sources"):
+                for s in r.sources:
+                    st.markdown(f"- {s}")
+        st.markdown("---")
+
+
+def show_job(job: Job) -> list[ClaimResult]:
+    """Render each verdict as soon as it arrives; return all results in claim order.
+
+    Verdicts the job already has are shown at once, so a reloaded page
+    catches up before streaming the rest.
+    """
+    status_label = "Fetching URL and fact-checking..." if job.kind == "url" else "Fact-checking text..."
+    results_area = st.container()
+    with results_area:
+        header = st.empty()
+
+    finished = []
+    with st.status(status_label, expanded=True) as status:
+        progress_bar = st.progress(0)
+        progress_text = st.empty()
+        if job.status == "queued":
+            progress_text.text(f"Waiting for a free worker ({jobs.queue_position(job)} ahead in the queue)...")
+        else:
+            progress_text.text("Extracting claims...")
+
+        for update in job.iter_updates():
+            finished.append(update)
+            progress_bar.progress(len(finished) / update.total)
+            progress_text.text(
+                f"Checked claim {len(finished)}/{update.total} "
+                f"({update.elapsed:.1f}s): {update.result.claim}"
+            )
+            with header.container():
+                st.markdown("---")
+                st.subheader(f"Results: {len(finished)} of {update.total} claims checked")
+            with results_area:
+                display_claim(update.index + 1, update.result)
+
+        if job.status == "failed":
+            status.update(label="Fact-check failed", state="error")
+        else:
+            progress_bar.markdown(_GREEN_BAR_HTML, unsafe_allow_html=True)
+            status.update(label="Fact-check complete!", state="complete")
 
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**Claim {i}:** {r.claim}")
-            with col2:
-                st.markdown(verdict_display)
+    return [u.result for u in sorted(finished, key=lambda u: u.index)]
 
-            st.markdown(f"*{r.reason}*")
 
-            if r.sources:
-                with st.expander("View sources"):
-                    for s in r.sources:
-                        st.markdown(f"- {s}")
-            st.markdown("---")
+def start_job(kind: str, value: str) -> None:
+    """Submit a fact-check and remember it in the session and the page URL."""
+    try:
+        job = jobs.submit(kind, value, priority="interactive", tenant=st.session_state["tenant"])
+    except QueueFullError as e:
+        st.warning(f"The fact-checker is busy. {e}")
+        return
+    st.session_state["job_id"] = job.id
+    st.query_params["job"] = job.id
 
 
 if text_submit and text_input.strip():
-    with st.status("Fact-checking text...", expanded=True) as status:
-        progress_bar = st.progress(0)
-        progress_text = st.empty()
-
-        def on_text_progress(message: str, current: int, total: int):
-            progress_bar.progress((current + 1) / total)
-            progress_text.text(message)
-
-        results = fact_check_text(text_input, on_progress=on_text_progress)
-        progress_bar.markdown(_GREEN_BAR_HTML, unsafe_allow_html=True)
-        status.update(label="Fact-check complete!", state="complete")
-
-    if results:
-        st.session_state["history"].append({
-            "timestamp": datetime.now().strftime("%I:%M %p"),
-            "input_type": "text",
-            "input_preview": text_input[:80],
-            "results": results,
-        })
-        display_results(results)
-    else:
-        st.warning("No factual claims could be extracted from this text.")
-
+    start_job("text", text_input)
 elif text_submit:
     st.warning("Please enter some text to fact-check.")
 
 if url_submit and url_input.strip():
-    with st.status("Fetching URL and fact-checking...", expanded=True) as status:
-        progress_bar = st.progress(0)
-        progress_text = st.empty()
+    start_job("url", url_input.strip())
+elif url_submit:
+    st.warning("Please enter a URL to fact-check.")
 
-        def on_url_progress(message: str, current: int, total: int):
-            progress_bar.progress((current + 1) / total)
-            progress_text.text(message)
-
-        results = fact_check_url(url_input, on_progress=on_url_progress)
-        progress_bar.markdown(_GREEN_BAR_HTML, unsafe_allow_html=True)
-        status.update(label="Fact-check complete!", state="complete")
-
-    if results:
-        st.session_state["history"].append({
-            "timestamp": datetime.now().strftime("%I:%M %p"),
-            "input_type": "url",
-            "input_preview": url_input,
-            "results": results,
-        })
-        display_results(results)
+# The current job survives reruns (session state) and page reloads (?job=<id>)
+job_id = st.session_state.get("job_id") or st.query_params.get("job")
+current_job = jobs.get(job_id) if job_id else None
+if job_id and current_job is None:
+    st.info("That fact-check is no longer available. Please run it again.")
+    st.session_state.pop("job_id", None)
+    st.query_params.pop("job", None)
+elif current_job is not None:
+    st.session_state["job_id"] = current_job.id
+    results = show_job(current_job)
+
+    if current_job.status == "failed":
+        st.error(f"Fact-check failed: {current_job.error}")
+    elif not results:
+        source = "URL" if current_job.kind == "url" else "text"
+        st.warning(f"No factual claims could be extracted from this {source}.")
     else:
-        st.warning("No factual claims could be extracted from this URL.")
+        # Stored once per session; reruns and reloads of the same job are ignored
+        store.add_run(
+            current_job.id,
+            st.session_state["tenant"],
+            current_job.kind,
+            current_job.value,
+            results,
+            created=current_job.created_at,
+        )
 
-elif url_submit:
-    st.warning("Please enter a URL to fact-check.")
 
-# --- Sidebar: Session History ---
-with st.sidebar:
-    st.header("Session History")
-    history = st.session_state["history"]
+def _timestamp(created: float) -> str:
+    return datetime.fromtimestamp(created).strftime("%b %d, %I:%M %p")
+
+
+def show_more(key: str, shown: int, has_more: bool, label: str) -> None:
+    """A button that shows another page of a sidebar list."""
+    if has_more and st.button(label, key=f"{key}_more"):
+        st.session_state[key] = shown + HISTORY_PAGE_SIZE
+        st.rerun()
 
-    if not history:
-        st.caption("No fact-checks yet this session.")
+
+# --- Sidebar: History ---
+with st.sidebar:
+    st.header("History")
+    owner = st.session_state["tenant"]
+    query = st.text_input("Search past claims", key="history_query", placeholder="e.g. Einstein 1879")
+
+    if query.strip():
+        everyone = HISTORY_SEARCH_ALL_SESSIONS and st.checkbox("Include other browsers", key="history_everyone")
+        shown = st.session_state.get("search_shown", HISTORY_PAGE_SIZE)
+        found = store.search_claims(query, owner=None if everyone else owner, limit=shown + 1)
+        if not found:
+            st.caption("No matching claims.")
+        for c in found[:shown]:
+            style = VERDICT_STYLES.get(c.result.verdict, VERDICT_STYLES["uncertain"])
+            st.markdown(f"{style['emoji']} **{c.result.verdict.upper()}** — {c.result.claim}")
+            st.caption(f"{_timestamp(c.created)} · {c.result.reason}")
+        show_more("search_shown", shown, len(found) > shown, "Show more claims")
     else:
-        for entry in reversed(history):
-            verdicts = [r.verdict for r in entry["results"]]
-            counts = {v: verdicts.count(v) for v in set(verdicts)}
-            summary_parts = [f"{n} {v.capitalize()}" for v, n in counts.items()]
-            summary = ", ".join(summary_parts)
-
-            label = f"{entry['timestamp']} — {summary}"
-            with st.expander(label):
-                kind = "Text" if entry["input_type"] == "text" else "URL"
-                preview = entry["input_preview"]
+        shown = st.session_state.get("history_shown", HISTORY_PAGE_SIZE)
+        runs = store.list_runs(owner=owner, limit=shown + 1)
+        if not runs:
+            st.caption("No fact-checks yet in this browser.")
+        for run in runs[:shown]:
+            summary = ", ".join(f"{n} {v.capitalize()}" for v, n in run.verdicts.items())
+            with st.expander(f"{_timestamp(run.created)} — {summary}"):
+                kind = "Text" if run.kind == "text" else "URL"
+                preview = run.input[:80] if run.kind == "text" else run.input
                 st.caption(f"**{kind}:** {preview}")
-                for i, r in enumerate(entry["results"], 1):
+                for r in store.run_results(run.id):
                     style = VERDICT_STYLES.get(r.verdict, VERDICT_STYLES["uncertain"])
                     st.markdown(
                         f"{style['emoji']} **{r.verdict.upper()}** — {r.claim}"
                     )
                     st.markdown(f"*{r.reason}*")
+        show_more("history_shown", shown, len(runs) > shown, "Load older fact-checks")
 
-        if st.button("Clear History"):
-            st.session_state["history"] = []
+        if runs and st.button("Clear History"):
+            store.delete_owner(owner)
+            st.session_state.pop("history_shown", None)
             st.rerun()